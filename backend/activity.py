@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Dict
+import logging
+from pymongo import UpdateOne
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+class ActivityTracker:
+    """Write-behind buffer for users' lastActive timestamps.
+
+    Requests only record the time in memory; `flush` writes the latest time
+    per user in one unordered bulk_write. `$max` keeps the stored value from
+    moving backwards when several workers flush out of order.
+    """
+
+    def __init__(self):
+        self.pending: Dict[str, datetime] = {}
+        self.recorded = 0
+        self.flushes = 0
+        self.written = 0
+        self.errors = 0
+
+    def record(self, user_id: str, moment: datetime = None):
+        self.pending[user_id] = moment or datetime.utcnow()
+        self.recorded += 1
+
+    async def flush(self):
+        if not self.pending:
+            return
+        # Swap the buffer first so requests keep recording during the write
+        batch, self.pending = self.pending, {}
+        operations = [
+            UpdateOne({"id": user_id}, {"$max": {"lastActive": moment}})
+            for user_id, moment in batch.items()
+        ]
+        try:
+            db = await get_database()
+            await db.users.bulk_write(operations, ordered=False)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Flushing user activity failed: {e}")
+            # Keep the newer of the failed and freshly recorded times for the next flush
+            for user_id, moment in batch.items():
+                if self.pending.get(user_id, moment) <= moment:
+                    self.pending[user_id] = moment
+            return
+        self.flushes += 1
+        self.written += len(operations)
+
+    def stats(self) -> dict:
+        return {
+            "recorded": self.recorded,
+            "pending": len(self.pending),
+            "flushes": self.flushes,
+            "written": self.written,
+            "errors": self.errors,
+        }
+
+activity_tracker = ActivityTracker()
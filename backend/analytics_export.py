@@ -0,0 +1,259 @@
+from fastapi import HTTPException, status
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from models import User, Job, Testimonial, Favorite, MultilingualText, Language
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = Path(os.getenv("ANALYTICS_EXPORT_DIR", Path(__file__).parent / "exports"))
+CHUNK_SIZE = int(os.getenv("ANALYTICS_EXPORT_CHUNK_SIZE", "5000"))
+WORKERS = int(os.getenv("ANALYTICS_EXPORT_WORKERS", "2"))
+KEEP_EXPORTS = int(os.getenv("ANALYTICS_EXPORT_KEEP", "3"))
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+LANGUAGES = [lang.value for lang in Language]
+
+# Collection -> (model describing its documents, fields left out of the export)
+EXPORTED_COLLECTIONS = {
+    "users": (User, {"password_hash"}),
+    "jobs": (Job, set()),
+    "testimonials": (Testimonial, set()),
+    "favorites": (Favorite, set()),
+}
+
+Column = Tuple[str, Tuple[str, ...], Any]
+
+def unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+def flat_columns(model, exclude=(), prefix: Tuple[str, ...] = ()) -> List[Column]:
+    """Column name, document path and scalar type for every field of `model`.
+
+    MultilingualText becomes one column per language (title_fr, title_en, ...)
+    and other nested models one column per field (progress_profileComplete).
+    """
+    columns = []
+    for name, field in model.model_fields.items():
+        if name in exclude:
+            continue
+        path = prefix + (name,)
+        annotation = unwrap_optional(field.annotation)
+        if annotation is MultilingualText:
+            columns += [("_".join(path + (lang,)), path + (lang,), str) for lang in LANGUAGES]
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            columns += flat_columns(annotation, prefix=path)
+        else:
+            columns.append(("_".join(path), path, annotation))
+    return columns
+
+def arrow_type(annotation):
+    import pyarrow as pa
+    if get_origin(annotation) in (list, List):
+        return pa.list_(arrow_type(get_args(annotation)[0]))
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is int:
+        return pa.int64()
+    if annotation is float:
+        return pa.float64()
+    if annotation is datetime:
+        return pa.timestamp("ms")
+    return pa.string()
+
+def coerce(value, annotation):
+    """Cast stored values to the column type; legacy documents are not always typed"""
+    if value is None:
+        return None
+    if get_origin(annotation) in (list, List):
+        item_type = get_args(annotation)[0]
+        return [coerce(item, item_type) for item in value] if isinstance(value, list) else None
+    if annotation in (bool, int, float):
+        try:
+            return annotation(value)
+        except (TypeError, ValueError):
+            return None
+    if annotation is datetime:
+        return value if isinstance(value, datetime) else None
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+def read_path(doc: dict, path: Tuple[str, ...]):
+    for key in path:
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(key)
+    return doc
+
+def open_writer(path: Path, columns: List[Column]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([(name, arrow_type(annotation)) for name, _, annotation in columns])
+    return pq.ParquetWriter(str(path), schema, compression="zstd")
+
+def write_chunk(writer, columns: List[Column], docs: List[dict]):
+    """Flatten a batch of documents into columns and append it as a row group"""
+    import pyarrow as pa
+    data = {
+        name: [coerce(read_path(doc, path), annotation) for doc in docs]
+        for name, path, annotation in columns
+    }
+    writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+
+class AnalyticsExporter:
+    """Admin-triggered Parquet snapshots of the analytics collections.
+
+    Documents are read in CHUNK_SIZE batches; flattening and Parquet encoding
+    run on a thread pool while the next batch is fetched. Progress is kept in
+    the analytics_exports collection so any worker can report it.
+    """
+
+    def __init__(self):
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def running(self) -> bool:
+        return any(not task.done() for task in self.tasks.values())
+
+    async def start(self, db, requested_by: str) -> dict:
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Parquet export requires the pyarrow package"
+            )
+        if self.running():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="An analytics export is already running"
+            )
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="analytics-export")
+
+        export_doc = {
+            "id": str(uuid.uuid4()),
+            "status": "running",
+            "requestedBy": requested_by,
+            "createdAt": datetime.utcnow(),
+            "finishedAt": None,
+            "error": None,
+            "collections": {
+                name: {"rows": 0, "total": await db[name].estimated_document_count(), "status": "pending", "bytes": None}
+                for name in EXPORTED_COLLECTIONS
+            },
+        }
+        await db.analytics_exports.insert_one(dict(export_doc))
+        self.tasks = {
+            export_id: task for export_id, task in self.tasks.items() if not task.done()
+        }
+        self.tasks[export_doc["id"]] = asyncio.create_task(self._run(db, export_doc["id"]))
+        return export_doc
+
+    async def _run(self, db, export_id: str):
+        directory = EXPORT_DIR / export_id
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            await asyncio.gather(*[self._export_collection(db, export_id, directory, name) for name in EXPORTED_COLLECTIONS])
+            await self._finish(db, export_id, "completed")
+            await self._cleanup(db)
+        except asyncio.CancelledError:
+            await self._finish(db, export_id, "cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Analytics export {export_id} failed: {e}")
+            await self._finish(db, export_id, "failed", str(e))
+
+    async def _export_collection(self, db, export_id: str, directory: Path, name: str):
+        loop = asyncio.get_running_loop()
+        model, exclude = EXPORTED_COLLECTIONS[name]
+        columns = flat_columns(model, exclude)
+        projection = {"_id": 0, **{field: 0 for field in exclude}}
+        final_path = directory / f"{name}.parquet"
+        tmp_path = directory / f"{name}.parquet.tmp"
+        progress = f"collections.{name}"
+
+        await db.analytics_exports.update_one({"id": export_id}, {"$set": {f"{progress}.status": "running"}})
+        writer = await loop.run_in_executor(self.pool, open_writer, tmp_path, columns)
+        rows = 0
+        pending = None
+        try:
+            batch = []
+            async for doc in db[name].find({}, projection).batch_size(CHUNK_SIZE):
+                batch.append(doc)
+                if len(batch) < CHUNK_SIZE:
+                    continue
+                # Encode this chunk while the next one is fetched
+                if pending:
+                    await pending
+                    await db.analytics_exports.update_one({"id": export_id}, {"$set": {f"{progress}.rows": rows}})
+                pending = loop.run_in_executor(self.pool, write_chunk, writer, columns, batch)
+                rows += len(batch)
+                batch = []
+            if pending:
+                await pending
+            if batch:
+                await loop.run_in_executor(self.pool, write_chunk, writer, columns, batch)
+                rows += len(batch)
+        finally:
+            if pending and not pending.done():
+                await asyncio.wait([pending])
+            await loop.run_in_executor(self.pool, writer.close)
+
+        os.replace(tmp_path, final_path)
+        await db.analytics_exports.update_one({"id": export_id}, {"$set": {
+            f"{progress}.rows": rows,
+            f"{progress}.status": "completed",
+            f"{progress}.bytes": final_path.stat().st_size,
+        }})
+        logger.info(f"Analytics export {export_id}: wrote {rows} {name}")
+
+    async def _finish(self, db, export_id: str, state: str, error: Optional[str] = None):
+        await db.analytics_exports.update_one(
+            {"id": export_id},
+            {"$set": {"status": state, "finishedAt": datetime.utcnow(), "error": error}}
+        )
+
+    async def _cleanup(self, db):
+        """Delete the files of all but the KEEP_EXPORTS most recent completed exports"""
+        old = await db.analytics_exports.find(
+            {"status": "completed"}, {"_id": 0, "id": 1}
+        ).sort("createdAt", -1).skip(KEEP_EXPORTS).to_list(None)
+        for export_doc in old:
+            shutil.rmtree(EXPORT_DIR / export_doc["id"], ignore_errors=True)
+        if old:
+            await db.analytics_exports.update_many(
+                {"id": {"$in": [export_doc["id"] for export_doc in old]}},
+                {"$set": {"status": "expired"}}
+            )
+
+    def file_path(self, export_id: str, collection: str) -> Path:
+        return EXPORT_DIR / export_id / f"{collection}.parquet"
+
+    async def stop(self):
+        for task in self.tasks.values():
+            task.cancel()
+        for task in self.tasks.values():
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.tasks = {}
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+analytics_exporter = AnalyticsExporter()
@@ -2,27 +2,162 @@ from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import asyncio
+import logging
 import os
-from models import User, UserRole
+import time
+from models import User, UserRole, Principal
 from database import get_database
+from cache import MemoryCacheBackend
+from activity import activity_tracker
 
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "kongenga-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Changing the cost rehashes existing passwords on their next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
 security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+    """Verify a password against its hash (blocking, use password_hasher in handlers)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash"""
+    """Generate password hash (blocking, use password_hasher in handlers)"""
     return pwd_context.hash(password)
 
+class PasswordHasher:
+    """Run bcrypt on a bounded thread pool so it never blocks the event loop.
+
+    At most `workers` hashes run at once; calls beyond `max_pending` waiting
+    or running are rejected with 503 rather than queued without limit.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.busy_seconds = 0.0
+
+    def _timed(self, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry",
+                headers={"Retry-After": "1"}
+            )
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._timed, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; the second value is a new hash when the stored one uses another cost"""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "rounds": BCRYPT_ROUNDS,
+            "workers": self.workers,
+            "pending": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            "peakPending": self.peak_pending,
+            "maxPending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "averageMs": round(self.busy_seconds * 1000 / self.completed, 1) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+password_hasher = PasswordHasher(BCRYPT_WORKERS, BCRYPT_MAX_PENDING)
+
+class UserCache:
+    """Validated users by ID, so authenticated requests skip the users lookup.
+
+    Per worker: writes through this worker invalidate immediately, changes
+    made through another worker are picked up within `ttl` seconds.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.backend = MemoryCacheBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, user_id: str, db) -> Optional[User]:
+        user = await self.backend.get(user_id)
+        if user is not None:
+            self.hits += 1
+            return user
+        self.misses += 1
+        user_doc = await db.users.find_one({"id": user_id})
+        if user_doc is None:
+            return None
+        user = User(**user_doc)
+        await self.backend.set(user_id, user, self.ttl)
+        return user
+
+    async def invalidate(self, user_id: str):
+        await self.backend.delete(user_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": self.backend.size(),
+            "ttl": self.ttl,
+        }
+
+user_cache = UserCache(
+    ttl=int(os.getenv("PRINCIPAL_CACHE_SECONDS", "30")),
+    max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -54,11 +189,12 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = await db.users.find_one({"id": user_id})
+    user = await user_cache.get(user_id, db)
     if user is None:
         raise credentials_exception
     
-    return User(**user)
+    activity_tracker.record(user.id)
+    return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
@@ -73,6 +209,14 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
         )
     return current_user
 
+async def get_current_principal(current_user: User = Depends(get_current_user)) -> Principal:
+    """Get the ID and role of the current user"""
+    return Principal(id=current_user.id, role=current_user.role)
+
+async def get_current_admin_principal(current_user: User = Depends(get_current_admin_user)) -> Principal:
+    """Get the ID and role of the current admin user"""
+    return Principal(id=current_user.id, role=current_user.role)
+
 async def authenticate_user(email: str, password: str, db) -> User:
     """Authenticate user with email and password"""
     user_doc = await db.users.find_one({"email": email})
@@ -80,7 +224,14 @@ async def authenticate_user(email: str, password: str, db) -> User:
         return False
     
     user = User(**user_doc)
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
         return False
     
+    if new_hash:
+        await db.users.update_one({"id": user.id}, {"$set": {"password_hash": new_hash}})
+        await user_cache.invalidate(user.id)
+        password_hasher.rehashed += 1
+        logger.info(f"Password rehashed with cost {BCRYPT_ROUNDS}: {user.email}")
+    
     return user
\ No newline at end of file
@@ -0,0 +1,62 @@
+from typing import Awaitable, Callable, List
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PeriodicTask:
+    """Run a coroutine function every `interval` seconds until stopped"""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable[None]], run_at_start: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_at_start = run_at_start
+        self.task: asyncio.Task = None
+
+    async def _run(self):
+        if not self.run_at_start:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background task {self.name} failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+class BackgroundTasks:
+    """Background jobs started and stopped by the application lifespan"""
+
+    def __init__(self):
+        self.tasks: List[PeriodicTask] = []
+
+    def add(self, task: PeriodicTask) -> PeriodicTask:
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        for task in self.tasks:
+            task.start()
+            logger.info(f"Started background task {task.name} (every {task.interval}s)")
+
+    async def stop(self):
+        for task in reversed(self.tasks):
+            await task.stop()
+
+background_tasks = BackgroundTasks()
@@ -0,0 +1,243 @@
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from pagination import cursor_headers
+
+logger = logging.getLogger(__name__)
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.generations: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self.entries.pop(key, None)
+
+    async def get_generations(self, namespaces: List[str]) -> List[int]:
+        return [self.generations.get(namespace, 0) for namespace in namespaces]
+
+    async def bump_generation(self, namespace: str):
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+
+    def size(self) -> int:
+        return len(self.entries)
+
+class RedisCacheBackend:
+    """Cache shared between workers, stored in Redis"""
+
+    def __init__(self, url: str, prefix: str = "kongenga:cache:"):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        await self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+    async def get_generations(self, namespaces: List[str]) -> List[int]:
+        values = await self.client.mget([f"{self.prefix}gen:{namespace}" for namespace in namespaces])
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def bump_generation(self, namespace: str):
+        await self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    def size(self) -> Optional[int]:
+        return None
+
+class ResponseCache:
+    """Read-through cache for GET responses with namespace invalidation.
+
+    Every cached entry depends on one or more namespaces (e.g. "companies",
+    "jobs:<id>"). Invalidating a namespace bumps its generation, which is
+    part of the key of every entry depending on it, so stale entries are
+    never served again and simply age out.
+    """
+
+    def __init__(self, backend, ttl: int = 300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def key(self, request: Request, namespaces: List[str]) -> str:
+        generations = await self.backend.get_generations(namespaces)
+        versions = ",".join(f"{namespace}@{generation}" for namespace, generation in zip(namespaces, generations))
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}|{versions}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache read failed: {e}")
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self.backend.set(key, value, ttl or self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache write failed: {e}")
+
+    async def invalidate(self, *namespaces: str):
+        """Drop every cached response depending on any of `namespaces`"""
+        for namespace in namespaces:
+            try:
+                await self.backend.bump_generation(namespace)
+                self.invalidations += 1
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache invalidation failed for {namespace}: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "entries": self.backend.size(),
+        }
+
+class SnapshotCache:
+    """Short-lived in-process copy of an expensive value, rebuilt by one caller at a time.
+
+    Callers arriving while a rebuild is running await that rebuild instead of
+    starting their own, so N concurrent requests cost one build.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.value: Any = None
+        self.expires_at = 0.0
+        self.building: Optional[asyncio.Future] = None
+        self.hits = 0
+        self.builds = 0
+        self.joined = 0
+
+    async def get(self, build: Callable[[], Awaitable[Any]]) -> Any:
+        if self.value is not None and self.expires_at > time.monotonic():
+            self.hits += 1
+            return self.value
+        if self.building is None:
+            self.building = asyncio.ensure_future(self._build(build))
+        else:
+            self.joined += 1
+        # Shielded so a disconnecting caller does not cancel the build for everyone
+        return await asyncio.shield(self.building)
+
+    async def _build(self, build: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await build()
+            self.value = value
+            self.expires_at = time.monotonic() + self.ttl
+            self.builds += 1
+            return value
+        finally:
+            self.building = None
+
+    def invalidate(self):
+        self.expires_at = 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "builds": self.builds, "joined": self.joined, "ttl": self.ttl}
+
+def create_response_cache() -> ResponseCache:
+    """Build the cache from CACHE_URL / CACHE_TTL_SECONDS / CACHE_MAX_ENTRIES"""
+    ttl = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+    url = os.getenv("CACHE_URL")
+    if url:
+        try:
+            return ResponseCache(RedisCacheBackend(url), ttl=ttl)
+        except ImportError:
+            logger.warning("CACHE_URL is set but the redis package is not installed, using in-process cache")
+    return ResponseCache(MemoryCacheBackend(int(os.getenv("CACHE_MAX_ENTRIES", "1024"))), ttl=ttl)
+
+response_cache = create_response_cache()
+
+def cached(*namespaces: str, ttl: Optional[int] = None):
+    """Cache a GET endpoint's JSON response.
+
+    `namespaces` may reference path parameters, e.g. "jobs:{job_id}". The
+    cache key covers the path and every query parameter (including the
+    language), so different views of a resource are cached separately.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+        inject_request = "request" not in signature.parameters
+        if inject_request:
+            parameters = list(signature.parameters.values())
+            parameters.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            signature = signature.replace(parameters=parameters)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop("request") if inject_request else kwargs["request"]
+            resolved = [namespace.format(**kwargs) for namespace in namespaces]
+            key = await response_cache.key(request, resolved)
+
+            entry = await response_cache.get(key)
+            if entry is not None:
+                return JSONResponse(entry["body"], headers=entry["headers"])
+
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                if result.status_code != 200 or not isinstance(result, JSONResponse):
+                    return result
+                body = json.loads(result.body)
+                headers = {name: value for name, value in result.headers.items() if name.lower().startswith("x-")}
+            else:
+                body = jsonable_encoder(result)
+                headers = cursor_headers(kwargs["response"]) if "response" in kwargs else {}
+
+            await response_cache.set(key, {"body": body, "headers": headers}, ttl)
+            return JSONResponse(body, headers=headers)
+
+        wrapper.__signature__ = signature
+        return wrapper
+    return decorator
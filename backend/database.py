@@ -1,8 +1,13 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT, UpdateOne
 import os
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
 import logging
+from typing import List
+from models import Language
+from job_metrics import METRICS_VERSION, normalize_job_metrics
+from cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +17,14 @@ class Database:
 
 database = Database()
 
+# MongoDB allows a single text index per collection, so every language is
+# covered by one index. Lingala, Swahili and Kikongo have no MongoDB stemmer:
+# the index uses the "none" language so all five are tokenised the same way.
+JOB_TEXT_INDEX = "job_text_search"
+JOB_TEXT_LANGUAGE = "none"
+LEGACY_JOB_TEXT_INDEXES = ["title.fr_text_description.fr_text"]
+LANGUAGES = [lang.value for lang in Language]
+
 async def get_database():
     return database.database
 
@@ -38,6 +51,16 @@ async def close_mongo_connection():
         database.client.close()
         logger.info("Disconnected from MongoDB")
 
+def job_list_indexes() -> List[IndexModel]:
+    """Keyset pagination indexes, one per sort option in pagination.JOB_SORTS"""
+    return [
+        IndexModel([("isActive", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("isActive", ASCENDING), ("sector", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("isActive", ASCENDING), ("salaryMin", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("isActive", ASCENDING), ("growthRate", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("isActive", ASCENDING), ("favoriteCount", DESCENDING), ("id", DESCENDING)]),
+    ]
+
 async def create_indexes():
     """Create database indexes for better performance"""
     try:
@@ -48,18 +71,52 @@ async def create_indexes():
             IndexModel([("email", ASCENDING)], unique=True),
             IndexModel([("role", ASCENDING)]),
             IndexModel([("createdAt", DESCENDING)]),
-            IndexModel([("lastActive", DESCENDING)])
+            IndexModel([("lastActive", DESCENDING)]),
+            IndexModel([("createdAt", DESCENDING), ("id", DESCENDING)])
+        ])
+        
+        # Favorites collection indexes
+        await db.favorites.create_indexes([
+            IndexModel([("userId", ASCENDING), ("jobId", ASCENDING)], unique=True),
+            # Keyset pagination of a user's favorites, newest first
+            IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING), ("jobId", DESCENDING)]),
+            IndexModel([("jobId", ASCENDING)])
         ])
         
         # Jobs collection indexes
+        existing_indexes = await db.jobs.index_information()
+        for name in LEGACY_JOB_TEXT_INDEXES:
+            if name in existing_indexes:
+                await db.jobs.drop_index(name)
+        
+        text_fields = [(f"title.{lang}", TEXT) for lang in LANGUAGES]
+        text_fields += [(f"description.{lang}", TEXT) for lang in LANGUAGES]
+        text_fields.append(("skills", TEXT))
+        text_weights = {f"title.{lang}": 10 for lang in LANGUAGES}
+        text_weights.update({f"description.{lang}": 2 for lang in LANGUAGES})
+        text_weights["skills"] = 5
+        
         await db.jobs.create_indexes([
             IndexModel([("sector", ASCENDING)]),
             IndexModel([("isActive", ASCENDING)]),
             IndexModel([("skills", ASCENDING)]),
+            IndexModel([("isActive", ASCENDING), ("skillIds", ASCENDING)]),
             IndexModel([("createdAt", DESCENDING)]),
-            IndexModel([("title.fr", "text"), ("description.fr", "text")]),
+            IndexModel(
+                text_fields,
+                name=JOB_TEXT_INDEX,
+                weights=text_weights,
+                default_language=JOB_TEXT_LANGUAGE,
+                language_override="textLanguage"
+            ),
             IndexModel([("companies", ASCENDING)]),
-            IndexModel([("salaryRange", ASCENDING)])
+            IndexModel([("training", ASCENDING)]),
+            IndexModel([("testimonials", ASCENDING)]),
+            IndexModel([("salaryRange", ASCENDING)]),
+            *job_list_indexes(),
+            # Salary range filters
+            IndexModel([("isActive", ASCENDING), ("salaryMin", ASCENDING), ("salaryMax", ASCENDING)]),
+            IndexModel([("metricsVersion", ASCENDING), ("id", ASCENDING)])
         ])
         
         # Companies collection indexes
@@ -67,7 +124,8 @@ async def create_indexes():
             IndexModel([("name", ASCENDING)]),
             IndexModel([("sector", ASCENDING)]),
             IndexModel([("location", ASCENDING)]),
-            IndexModel([("isActive", ASCENDING)])
+            IndexModel([("isActive", ASCENDING)]),
+            IndexModel([("isActive", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)])
         ])
         
         # Training collection indexes
@@ -76,7 +134,9 @@ async def create_indexes():
             IndexModel([("level", ASCENDING)]),
             IndexModel([("cost", ASCENDING)]),
             IndexModel([("skills", ASCENDING)]),
-            IndexModel([("isActive", ASCENDING)])
+            IndexModel([("skillIds", ASCENDING), ("isActive", ASCENDING)]),
+            IndexModel([("isActive", ASCENDING)]),
+            IndexModel([("isActive", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)])
         ])
         
         # Testimonials collection indexes
@@ -84,7 +144,8 @@ async def create_indexes():
             IndexModel([("jobId", ASCENDING)]),
             IndexModel([("isApproved", ASCENDING)]),
             IndexModel([("isVerified", ASCENDING)]),
-            IndexModel([("createdAt", DESCENDING)])
+            IndexModel([("createdAt", DESCENDING)]),
+            IndexModel([("isApproved", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)])
         ])
         
         # Sectors collection indexes
@@ -93,6 +154,35 @@ async def create_indexes():
             IndexModel([("name.fr", ASCENDING)])
         ])
         
+        # Statistics history: one bucket per granularity and period start
+        await db.statistics_history.create_indexes([
+            IndexModel([("granularity", ASCENDING), ("bucket", ASCENDING)], unique=True),
+            # Hourly buckets carry expireAt and age out once rolled up into days
+            IndexModel([("expireAt", ASCENDING)], expireAfterSeconds=0)
+        ])
+        
+        await db.analytics_exports.create_indexes([
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel([("createdAt", DESCENDING)])
+        ])
+        
+        # Job cards: jobs with their relations embedded, read by job ID
+        # Job list pages are read from the cards
+        await db.job_cards.create_indexes([
+            IndexModel([("id", ASCENDING)], unique=True),
+            IndexModel([("isActive", ASCENDING), ("skillIds", ASCENDING)]),
+            *job_list_indexes()
+        ])
+        
+        await db.skills.create_indexes([
+            IndexModel([("id", ASCENDING)], unique=True)
+        ])
+        
+        await db.recommendations.create_indexes([
+            IndexModel([("userId", ASCENDING)], unique=True),
+            IndexModel([("expireAt", ASCENDING)], expireAfterSeconds=0)
+        ])
+        
         logger.info("Database indexes created successfully")
         
     except Exception as e:
@@ -140,7 +230,10 @@ async def init_sample_data():
         # Insert sample jobs
         jobs = get_sample_jobs()
         if jobs:
-            await db.jobs.insert_many([job.dict() for job in jobs])
+            job_docs = [job.dict() for job in jobs]
+            for job_doc in job_docs:
+                job_doc.update(normalize_job_metrics(job_doc))
+            await db.jobs.insert_many(job_docs)
             logger.info(f"Inserted {len(jobs)} sample jobs")
         
         # Update statistics
@@ -151,33 +244,185 @@ async def init_sample_data():
     except Exception as e:
         logger.error(f"Error initializing sample data: {e}")
 
-async def update_platform_statistics():
-    """Update platform statistics"""
+async def backfill_job_metrics(batch_size: int = 500):
+    """Parse numeric salary, hiring-rate and growth fields for existing jobs.
+
+    Only jobs not yet normalized with the current METRICS_VERSION are
+    selected, so an interrupted run simply resumes where it stopped.
+    """
     try:
         db = database.database
+        projection = {"_id": 0, "id": 1, "salaryRange": 1, "hiringRate": 1, "growthProjection": 1}
+        total = 0
         
-        stats = {
-            "totalJobs": await db.jobs.count_documents({"isActive": True}),
-            "totalStudents": await db.users.count_documents({"role": "student"}),
-            "totalCompanies": await db.companies.count_documents({"isActive": True}),
-            "successStories": await db.testimonials.count_documents({"isApproved": True}),
-            "activeUsers": await db.users.count_documents({
-                "lastActive": {"$gte": datetime.utcnow().replace(day=1)}
-            }),
-            "lastUpdated": datetime.utcnow()
-        }
+        while True:
+            jobs = await db.jobs.find(
+                {"metricsVersion": {"$ne": METRICS_VERSION}}, projection
+            ).sort("id", ASCENDING).limit(batch_size).to_list(None)
+            if not jobs:
+                break
+            
+            operations = []
+            for job in jobs:
+                metrics = normalize_job_metrics(job)
+                metrics["metricsVersion"] = METRICS_VERSION
+                operations.append(UpdateOne({"id": job["id"]}, {"$set": metrics}))
+            await db.jobs.bulk_write(operations, ordered=False)
+            # Job cards carry the same top-level fields
+            await db.job_cards.bulk_write(operations, ordered=False)
+            total += len(operations)
         
-        # Update sectors job count
-        sectors = await db.sectors.find({"isActive": True}).to_list(None)
-        for sector in sectors:
-            job_count = await db.jobs.count_documents({
-                "sector": sector["name"]["fr"],
-                "isActive": True
-            })
-            await db.sectors.update_one(
-                {"_id": sector["_id"]},
-                {"$set": {"jobCount": job_count}}
+        if total:
+            await response_cache.invalidate("jobs")
+            logger.info(f"Backfilled metrics for {total} jobs")
+        
+    except Exception as e:
+        logger.error(f"Error backfilling job metrics: {e}")
+
+async def adjust_sector_job_count(sector_name: str, delta: int):
+    """Increment or decrement the stored job count of a sector"""
+    if not sector_name or not delta:
+        return
+    await database.database.sectors.update_one(
+        {"name.fr": sector_name},
+        {"$inc": {"jobCount": delta}}
+    )
+
+async def count_active_jobs(sector_name: str) -> int:
+    """Count active jobs in a sector"""
+    return await database.database.jobs.count_documents({"sector": sector_name, "isActive": True})
+
+async def reconcile_sector_job_counts() -> int:
+    """Fix drift in stored sector job counts with a single grouped aggregation.
+
+    Returns the number of sectors whose count was corrected.
+    """
+    db = database.database
+    counts = {}
+    async for group in db.jobs.aggregate([
+        {"$match": {"isActive": True}},
+        {"$group": {"_id": "$sector", "count": {"$sum": 1}}}
+    ]):
+        counts[group["_id"]] = group["count"]
+    
+    operations = []
+    async for sector in db.sectors.find({}, {"_id": 1, "name.fr": 1, "jobCount": 1}):
+        job_count = counts.get(sector["name"]["fr"], 0)
+        if sector.get("jobCount") != job_count:
+            operations.append(UpdateOne({"_id": sector["_id"]}, {"$set": {"jobCount": job_count}}))
+    
+    if operations:
+        await db.sectors.bulk_write(operations, ordered=False)
+        await response_cache.invalidate("sectors")
+        logger.info(f"Reconciled job counts for {len(operations)} sectors")
+    return len(operations)
+
+async def reconcile_job_favorite_counts() -> int:
+    """Fix drift in stored job favorite counts from the favorites collection.
+
+    Returns the number of jobs whose count was corrected.
+    """
+    db = database.database
+    counts = {}
+    async for group in db.favorites.aggregate([
+        {"$group": {"_id": "$jobId", "count": {"$sum": 1}}}
+    ]):
+        counts[group["_id"]] = group["count"]
+    
+    operations = []
+    card_operations = []
+    async for job in db.jobs.find({}, {"_id": 1, "id": 1, "favoriteCount": 1}):
+        favorite_count = counts.get(job["id"], 0)
+        if job.get("favoriteCount") != favorite_count:
+            operations.append(UpdateOne({"_id": job["_id"]}, {"$set": {"favoriteCount": favorite_count}}))
+            card_operations.append(UpdateOne({"id": job["id"]}, {"$set": {"favoriteCount": favorite_count}}))
+    
+    if operations:
+        await db.jobs.bulk_write(operations, ordered=False)
+        await db.job_cards.bulk_write(card_operations, ordered=False)
+        await response_cache.invalidate("jobs")
+        logger.info(f"Reconciled favorite counts for {len(operations)} jobs")
+    return len(operations)
+
+async def get_favorite_job_ids(db, user_id: str) -> List[str]:
+    """IDs of a user's favorite jobs, most recently saved first (covered by an index)"""
+    cursor = db.favorites.find({"userId": user_id}, {"_id": 0, "jobId": 1}).sort([("createdAt", -1), ("jobId", -1)])
+    return [favorite["jobId"] async for favorite in cursor]
+
+async def migrate_user_favorites(batch_size: int = 500):
+    """Move favoriteJobs arrays out of user documents into the favorites collection.
+
+    Resumable: users are only unset once their favorites are stored, and
+    re-inserting an existing favorite is a no-op.
+    """
+    db = database.database
+    migrated = 0
+    try:
+        while True:
+            users = await db.users.find(
+                {"favoriteJobs": {"$exists": True}}, {"_id": 0, "id": 1, "favoriteJobs": 1}
+            ).limit(batch_size).to_list(None)
+            if not users:
+                break
+            
+            now = datetime.utcnow()
+            operations = []
+            for user in users:
+                job_ids = user.get("favoriteJobs") or []
+                for position, job_id in enumerate(job_ids):
+                    # Keep the array order: earlier entries get earlier timestamps
+                    saved_at = now - timedelta(milliseconds=len(job_ids) - position)
+                    operations.append(UpdateOne(
+                        {"userId": user["id"], "jobId": job_id},
+                        {"$setOnInsert": {"createdAt": saved_at}},
+                        upsert=True
+                    ))
+            if operations:
+                await db.favorites.bulk_write(operations, ordered=False)
+            await db.users.update_many(
+                {"id": {"$in": [user["id"] for user in users]}},
+                {"$unset": {"favoriteJobs": ""}}
             )
+            migrated += len(users)
+        
+        if migrated:
+            await reconcile_job_favorite_counts()
+            logger.info(f"Moved favorites of {migrated} users to the favorites collection")
+    
+    except Exception as e:
+        logger.error(f"Error migrating favorites: {e}")
+
+async def count_platform_users(db, active_since: datetime) -> dict:
+    """Students and recently active users, each counted from its own index"""
+    students, active = await asyncio.gather(
+        db.users.count_documents({"role": "student"}),
+        db.users.count_documents({"lastActive": {"$gte": active_since}})
+    )
+    return {"students": students, "active": active}
+
+async def update_platform_statistics() -> dict:
+    """Recompute and store the platform statistics snapshot"""
+    try:
+        db = database.database
+        now = datetime.utcnow()
+        
+        # Independent counts run concurrently
+        total_jobs, total_companies, success_stories, users, _ = await asyncio.gather(
+            db.jobs.count_documents({"isActive": True}),
+            db.companies.count_documents({"isActive": True}),
+            db.testimonials.count_documents({"isApproved": True}),
+            count_platform_users(db, now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)),
+            reconcile_sector_job_counts()
+        )
+        
+        stats = {
+            "totalJobs": total_jobs,
+            "totalStudents": users["students"],
+            "totalCompanies": total_companies,
+            "successStories": success_stories,
+            "activeUsers": users["active"],
+            "lastUpdated": now
+        }
         
         # Store statistics
         await db.statistics.replace_one(
@@ -187,6 +432,7 @@ async def update_platform_statistics():
         )
         
         logger.info("Platform statistics updated")
+        return stats
         
     except Exception as e:
-        logger.error(f"Error updating statistics: {e}")
\ No newline at end of file
+        logger.error(f"Error updating statistics: {e}")
@@ -0,0 +1,109 @@
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import AsyncIterator, List
+import csv
+import io
+import json
+import logging
+from models import ExportFormat
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+# Rows are shaped by the server so only exported values cross the wire
+USER_EXPORT_FIELDS = [
+    "id", "name", "email", "university", "year", "field",
+    "createdAt", "favoriteJobsCount", "profileComplete"
+]
+USER_EXPORT_PIPELINE = [
+    {"$match": {"role": "student"}},
+    {"$lookup": {
+        "from": "favorites",
+        "let": {"userId": "$id"},
+        "pipeline": [{"$match": {"$expr": {"$eq": ["$userId", "$$userId"]}}}, {"$count": "n"}],
+        "as": "favoriteCounts",
+    }},
+    {"$project": {
+        "_id": 0,
+        "id": 1,
+        "name": 1,
+        "email": 1,
+        "university": {"$ifNull": ["$university", ""]},
+        "year": {"$ifNull": ["$year", ""]},
+        "field": {"$ifNull": ["$field", ""]},
+        "createdAt": 1,
+        "favoriteJobsCount": {"$ifNull": [{"$first": "$favoriteCounts.n"}, 0]},
+        "profileComplete": {"$ifNull": ["$progress.profileComplete", 0]},
+    }},
+]
+
+JOB_EXPORT_FIELDS = [
+    "id", "title", "sector", "salaryRange", "hiringRate",
+    "skillsCount", "companiesCount", "createdAt"
+]
+JOB_EXPORT_PIPELINE = [
+    {"$match": {"isActive": True}},
+    {"$project": {
+        "_id": 0,
+        "id": 1,
+        "title": "$title.fr",
+        "sector": 1,
+        "salaryRange": 1,
+        "hiringRate": 1,
+        "skillsCount": {"$size": {"$ifNull": ["$skills", []]}},
+        "companiesCount": {"$size": {"$ifNull": ["$companies", []]}},
+        "createdAt": 1,
+    }},
+]
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def stream_rows(cursor, fields: List[str], format: ExportFormat) -> AsyncIterator[str]:
+    """Encode cursor rows as CSV or NDJSON, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if format == ExportFormat.CSV else None
+    if writer:
+        # Sent before the first batch is fetched
+        writer.writerow(fields)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    rows = 0
+    try:
+        async for doc in cursor:
+            values = [export_value(doc.get(field)) for field in fields]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(fields, values)), ensure_ascii=False) + "\n")
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    except Exception as e:
+        # Headers are already sent; the truncated body is all we can signal
+        logger.error(f"Export failed after {rows} rows: {e}")
+        raise
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_response(collection, pipeline: List[dict], fields: List[str], format: ExportFormat, name: str) -> StreamingResponse:
+    """Stream the result of `pipeline` as a downloadable file"""
+    cursor = collection.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE)
+    filename = f"{name}-{datetime.utcnow():%Y%m%d}.{format.value}"
+    return StreamingResponse(
+        stream_rows(cursor, fields, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,81 @@
+from typing import Awaitable, Callable, Dict, List, Tuple
+import logging
+import os
+from pymongo import ReturnDocument
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+INDEX_SYNC_INTERVAL = float(os.getenv("INDEX_SYNC_INTERVAL_SECONDS", "15"))
+
+class IndexSync:
+    """Keeps the in-memory indexes of every worker in step with the database.
+
+    Each worker patches its own indexes for the writes it handles, which
+    leaves the other workers behind. Every such write also bumps a version
+    counter per collection in the index_versions collection; each worker
+    polls the counters and reloads the indexes built from a collection whose
+    counter moved since its last load.
+    """
+
+    def __init__(self):
+        self.indexes: List[Tuple[str, Tuple[str, ...], Callable[[object], Awaitable[None]]]] = []
+        self.versions: Dict[str, int] = {}
+        self.reloads = 0
+        self.errors = 0
+
+    def register(self, name: str, collections: List[str], load: Callable[[object], Awaitable[None]]):
+        """Reload an index with `load(db)` whenever one of `collections` changes"""
+        self.indexes.append((name, tuple(collections), load))
+
+    async def _read_versions(self, db) -> Dict[str, int]:
+        return {doc["_id"]: doc["version"] async for doc in db.index_versions.find({})}
+
+    async def changed(self, db, *collections: str):
+        """Record a write to `collections` so the other workers reload their indexes"""
+        for collection in collections:
+            try:
+                doc = await db.index_versions.find_one_and_update(
+                    {"_id": collection},
+                    {"$inc": {"version": 1}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Index version bump failed for {collection}: {e}")
+                continue
+            # This worker already applied its own write; only an interleaved
+            # write from another worker leaves a gap that needs a reload
+            if self.versions.get(collection, 0) == doc["version"] - 1:
+                self.versions[collection] = doc["version"]
+
+    async def load(self, db, names: List[str] = None):
+        """Build the registered indexes, remembering the versions they reflect"""
+        # Read before loading: a write landing during the load moves the
+        # counter past what is recorded and is picked up by the next sync
+        versions = await self._read_versions(db)
+        for name, collections, load in self.indexes:
+            if names is None or name in names:
+                await load(db)
+        self.versions = versions
+
+    async def sync(self):
+        """Reload the indexes whose collections another worker wrote to"""
+        db = await get_database()
+        versions = await self._read_versions(db)
+        changed = {
+            collection for collection in set(versions) | set(self.versions)
+            if versions.get(collection, 0) != self.versions.get(collection, 0)
+        }
+        if not changed:
+            return
+        stale = [name for name, collections, _ in self.indexes if changed.intersection(collections)]
+        logger.info(f"Reloading {', '.join(stale) or 'no'} indexes after writes to {', '.join(sorted(changed))}")
+        await self.load(db, stale)
+        self.reloads += 1
+
+    def stats(self) -> dict:
+        return {"versions": dict(self.versions), "reloads": self.reloads, "errors": self.errors}
+
+index_sync = IndexSync()
@@ -0,0 +1,159 @@
+from typing import Dict, Iterable, List, Optional
+import logging
+from pymongo import ReplaceOne
+from database import get_database
+from projections import RELATION_FIELDS
+
+logger = logging.getLogger(__name__)
+
+CARD_BATCH_SIZE = 200
+
+# Each job card is the job document with its companies, training and approved
+# testimonials embedded, so reads need no join. Cards are rewritten whenever
+# the job or one of the documents it embeds changes.
+
+async def join_job_relations(
+    job_docs: List[dict],
+    db,
+    relations: Iterable[str] = RELATION_FIELDS,
+    projection: Optional[dict] = None
+):
+    """Replace related IDs with documents, using one query per related collection"""
+    company_ids = set()
+    training_ids = set()
+    testimonial_ids = set()
+    for job_doc in job_docs:
+        if "companies" in relations:
+            company_ids.update(job_doc.get("companies") or [])
+        if "training" in relations:
+            training_ids.update(job_doc.get("training") or [])
+        if "testimonials" in relations:
+            testimonial_ids.update(job_doc.get("testimonials") or [])
+
+    # Get companies
+    companies = {}
+    if company_ids:
+        async for company in db.companies.find({"id": {"$in": list(company_ids)}}, projection):
+            companies[company["id"]] = company
+
+    # Get training
+    training = {}
+    if training_ids:
+        async for t in db.training.find({"id": {"$in": list(training_ids)}}, projection):
+            training[t["id"]] = t
+
+    # Get testimonials
+    testimonials = {}
+    if testimonial_ids:
+        async for testimonial in db.testimonials.find({
+            "id": {"$in": list(testimonial_ids)},
+            "isApproved": True
+        }, projection):
+            testimonials[testimonial["id"]] = testimonial
+
+    for job_doc in job_docs:
+        if "companies" in relations:
+            job_doc["companies"] = [companies[i] for i in job_doc.get("companies") or [] if i in companies]
+        if "training" in relations:
+            job_doc["training"] = [training[i] for i in job_doc.get("training") or [] if i in training]
+        if "testimonials" in relations:
+            job_doc["testimonials"] = [testimonials[i] for i in job_doc.get("testimonials") or [] if i in testimonials]
+
+def relation_projection(relations: Iterable[str], projection: Optional[dict]) -> dict:
+    """Projection reading only `relations` from job cards, narrowed like `projection`"""
+    fields = [field for field, include in (projection or {}).items() if include and field != "_id"]
+    card_projection = {"_id": 0, "id": 1}
+    for relation in relations:
+        if fields:
+            card_projection.update({f"{relation}.{field}": 1 for field in fields})
+        else:
+            card_projection[relation] = 1
+    return card_projection
+
+async def hydrate_job_relations(
+    job_docs: List[dict],
+    db,
+    relations: Iterable[str] = RELATION_FIELDS,
+    projection: Optional[dict] = None
+):
+    """Replace related IDs with documents from the job cards, joining live for jobs without one"""
+    relations = [relation for relation in RELATION_FIELDS if relation in relations]
+    if not job_docs or not relations:
+        return
+
+    cards: Dict[str, dict] = {}
+    job_ids = [job_doc["id"] for job_doc in job_docs]
+    async for card in db.job_cards.find({"id": {"$in": job_ids}}, relation_projection(relations, projection)):
+        cards[card["id"]] = card
+
+    missing = []
+    for job_doc in job_docs:
+        card = cards.get(job_doc["id"])
+        if card is None:
+            missing.append(job_doc)
+            continue
+        for relation in relations:
+            job_doc[relation] = card.get(relation, [])
+
+    if missing:
+        await join_job_relations(missing, db, relations, projection)
+
+async def find_job_card(db, job_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """An active job with its relations embedded, in a single read"""
+    return await db.job_cards.find_one({"id": job_id, "isActive": True}, projection or {"_id": 0})
+
+async def find_job_cards(db, job_ids: List[str], projection: Optional[dict] = None) -> List[dict]:
+    """Cards of the active jobs among `job_ids`, in the order of `job_ids`"""
+    cards = {}
+    async for card in db.job_cards.find({"id": {"$in": job_ids}, "isActive": True}, projection or {"_id": 0}):
+        cards[card["id"]] = card
+    return [cards[job_id] for job_id in job_ids if job_id in cards]
+
+async def write_job_cards(db, job_cursor) -> int:
+    """Rebuild the cards of the jobs produced by `job_cursor`, in batches"""
+    written = 0
+    batch = []
+    async for job_doc in job_cursor:
+        batch.append(job_doc)
+        if len(batch) >= CARD_BATCH_SIZE:
+            written += await _write_batch(db, batch)
+            batch = []
+    if batch:
+        written += await _write_batch(db, batch)
+    return written
+
+async def _write_batch(db, job_docs: List[dict]) -> int:
+    await join_job_relations(job_docs, db, projection={"_id": 0})
+    await db.job_cards.bulk_write(
+        [ReplaceOne({"id": job_doc["id"]}, job_doc, upsert=True) for job_doc in job_docs],
+        ordered=False
+    )
+    return len(job_docs)
+
+async def refresh_job_cards(db, query: dict) -> int:
+    """Rewrite the cards of every job matching `query`.
+
+    Called from write paths, e.g. {"id": job_id} after a job update or
+    {"companies": company_id} after a company update.
+    """
+    return await write_job_cards(db, db.jobs.find(query, {"_id": 0}))
+
+class JobCardStatus:
+    """Whether this worker has seen every job card written.
+
+    Until the first full rebuild, jobs written before the cards existed may
+    have none, so job lists are read from the jobs collection instead.
+    """
+
+    def __init__(self):
+        self.ready = False
+
+job_card_status = JobCardStatus()
+
+async def rebuild_job_cards() -> int:
+    """Rewrite every job card, repairing cards missed by concurrent writes"""
+    db = await get_database()
+    written = await write_job_cards(db, db.jobs.find({}, {"_id": 0}))
+    job_card_status.ready = True
+    logger.info(f"Rebuilt {written} job cards")
+    return written
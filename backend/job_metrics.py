@@ -0,0 +1,136 @@
+from typing import List, Optional, Tuple
+import os
+import re
+
+# Bump when parsing rules change so the backfill re-normalizes existing jobs
+METRICS_VERSION = 3
+
+CURRENCIES = [
+    ("USD", re.compile(r"\$|usd|dollars?", re.I)),
+    ("EUR", re.compile(r"€|eur|euros?", re.I)),
+    ("CDF", re.compile(r"\bfc\b|cdf|francs?", re.I)),
+]
+
+# salaryMin/salaryMax are stored in USD so filters, sorting and facets compare
+# like with like; the amounts in the job's own currency are kept alongside.
+# Salaries without a recognizable currency are taken to be in USD.
+REFERENCE_CURRENCY = "USD"
+USD_RATES = {
+    "USD": 1.0,
+    "EUR": float(os.getenv("SALARY_EUR_TO_USD", "1.08")),
+    "CDF": float(os.getenv("SALARY_CDF_TO_USD", "0.00036")),
+}
+
+# Salaries are stored per month; yearly or weekly figures are converted
+PERIODS = [
+    (1 / 12, re.compile(r"/\s*(an|année|annee|year|yr)\b|par an|per year|annuel", re.I)),
+    (52 / 12, re.compile(r"/\s*(semaine|week|wk)\b|par semaine|per week", re.I)),
+    (1.0, re.compile(r"/\s*(mois|month)\b|par mois|per month|mensuel", re.I)),
+]
+
+_NUMBER_RE = re.compile(r"\d+(?:[ ,. ]\d{3})*(?:[.,]\d+)?\s*[kK]?")
+_PERCENT_RE = re.compile(r"([+-]?\d+(?:[.,]\d+)?)\s*%")
+_YEARS_RE = re.compile(r"(\d+)\s*(ans|années|annees|years?|yrs?)\b", re.I)
+
+def _parse_number(token: str) -> float:
+    token = token.strip()
+    multiplier = 1000 if token[-1] in "kK" else 1
+    token = token.rstrip("kK").strip()
+    # Separators followed by exactly three digits are thousands separators
+    token = re.sub(r"[ ,. ](?=\d{3}\b)", "", token)
+    return float(token.replace(",", ".")) * multiplier
+
+def parse_numbers(text: str) -> List[float]:
+    return [_parse_number(match) for match in _NUMBER_RE.findall(text or "")]
+
+_AMOUNT = r"\d+(?:[ ,.]\d{3})*(?:[.,]\d+)?(?:\s?[kK](?![a-zA-Z]))?"
+_CURRENCY = r"(?:\$|€|\b(?:usd|eur|euros?|dollars?|fc|cdf|francs?)\b)"
+_PERIOD = r"/\s*(?:mois|month|an|année|annee|year|yr|semaine|week|wk)\b"
+# Only amounts tied to a currency, a period or a range count as salary, so
+# head-counts ("(2 postes)") and other numbers in the text are ignored
+_RANGE_RE = re.compile(
+    rf"(?P<low>{_AMOUNT})\s*{_CURRENCY}?\s*(?:-|–|—|\bà\b|\ba\b|\bto\b|\bet\b|\band\b)\s*{_CURRENCY}?\s*(?P<high>{_AMOUNT})",
+    re.I
+)
+_AMOUNT_RE = re.compile(
+    rf"{_CURRENCY}\s*(?P<before>{_AMOUNT})|(?P<after>{_AMOUNT})\s*(?:{_CURRENCY}|(?={_PERIOD}))",
+    re.I
+)
+# One-sided ranges: "jusqu'à 3000€" has no minimum, "à partir de 800$" no maximum
+_UP_TO_RE = re.compile(r"jusqu['’]?\s*(?:à|a)\b|\bup to\b|\bmax(?:imum)?\b", re.I)
+_FROM_RE = re.compile(r"\b(?:à|a) partir d[e']|\bfrom\b|\bdès\b|\bstarting at\b|\bmin(?:imum)?\b", re.I)
+
+def salary_bounds(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """(low, high) salary amounts in a salary text; an open bound is None"""
+    text = text or ""
+    match = _RANGE_RE.search(text)
+    if match:
+        low, high = sorted([_parse_number(match.group("low")), _parse_number(match.group("high"))])
+        return low, high
+    amounts = [
+        _parse_number(match.group("before") or match.group("after"))
+        for match in _AMOUNT_RE.finditer(text)
+    ]
+    if not amounts:
+        return None, None
+    if _UP_TO_RE.search(text):
+        return None, max(amounts)
+    if _FROM_RE.search(text):
+        return min(amounts), None
+    return min(amounts), max(amounts)
+
+def parse_salary_range(text: Optional[str]) -> dict:
+    """Parse "800$ - 2,500$/mois" into monthly salaryMin/salaryMax in USD.
+
+    The monthly amounts in the stated currency are kept in
+    salaryMinOriginal/salaryMaxOriginal, with that currency in salaryCurrency.
+    "Jusqu'à 3000€" only sets the maximum and "à partir de 800$" the minimum.
+    """
+    low, high = salary_bounds(text)
+    if low is None and high is None:
+        return {
+            "salaryMin": None, "salaryMax": None, "salaryCurrency": None,
+            "salaryMinOriginal": None, "salaryMaxOriginal": None,
+        }
+
+    factor = next((factor for factor, pattern in PERIODS if pattern.search(text)), 1.0)
+    currency = next((code for code, pattern in CURRENCIES if pattern.search(text)), None)
+    rate = USD_RATES[currency or REFERENCE_CURRENCY]
+    monthly = [None if amount is None else amount * factor for amount in (low, high)]
+    return {
+        "salaryMin": None if monthly[0] is None else round(monthly[0] * rate),
+        "salaryMax": None if monthly[1] is None else round(monthly[1] * rate),
+        "salaryCurrency": currency,
+        "salaryMinOriginal": None if monthly[0] is None else round(monthly[0]),
+        "salaryMaxOriginal": None if monthly[1] is None else round(monthly[1]),
+    }
+
+def parse_hiring_rate(text: Optional[str]) -> dict:
+    """Parse "85%" into hiringRateValue"""
+    match = _PERCENT_RE.search(text or "")
+    return {"hiringRateValue": float(match.group(1).replace(",", ".")) if match else None}
+
+def parse_growth_projection(text: Optional[str]) -> dict:
+    """Parse "+25% sur 5 ans" into growthRate and growthYears"""
+    match = _PERCENT_RE.search(text or "")
+    years = _YEARS_RE.search(text or "")
+    return {
+        "growthRate": float(match.group(1).replace(",", ".")) if match else None,
+        "growthYears": int(years.group(1)) if years else None,
+    }
+
+PARSERS = {
+    "salaryRange": parse_salary_range,
+    "hiringRate": parse_hiring_rate,
+    "growthProjection": parse_growth_projection,
+}
+
+def normalize_job_metrics(job_data: dict) -> dict:
+    """Numeric fields derived from whichever free-form metric strings are present"""
+    normalized = {}
+    for field, parser in PARSERS.items():
+        if job_data.get(field) is not None:
+            normalized.update(parser(job_data[field]))
+    if all(job_data.get(field) is not None for field in PARSERS):
+        normalized["metricsVersion"] = METRICS_VERSION
+    return normalized
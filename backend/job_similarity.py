@@ -0,0 +1,230 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import numpy as np
+from search_index import fold
+
+logger = logging.getLogger(__name__)
+
+NEIGHBOURS = int(os.getenv("SIMILAR_JOBS_NEIGHBOURS", "20"))
+REBUILD_DELAY = float(os.getenv("SIMILAR_JOBS_REBUILD_DELAY_SECONDS", "5"))
+WORKERS = int(os.getenv("SIMILAR_JOBS_WORKERS", "1"))
+
+# Weight of each feature kind, before IDF weighting
+FEATURE_WEIGHTS = {"skill": 1.0, "education": 0.5, "sector": 0.75}
+BLOCK_ROWS = 512
+
+def job_features(job_doc: dict) -> Set[str]:
+    """Skill, education and sector features of a job, e.g. skill:python"""
+    features = {f"skill:{skill_id}" for skill_id in job_doc.get("skillIds") or []}
+    features.update(f"education:{fold(level).strip()}" for level in job_doc.get("education") or [] if level)
+    if job_doc.get("sector"):
+        features.add(f"sector:{fold(job_doc['sector']).strip()}")
+    return features
+
+def dense_rows(
+    indptr: np.ndarray,
+    columns: np.ndarray,
+    values: np.ndarray,
+    start: int,
+    stop: int,
+    dimensions: int
+) -> np.ndarray:
+    """Rows [start, stop) of a CSR matrix as a dense (stop - start) x dimensions array"""
+    block = np.zeros((stop - start, dimensions), dtype=np.float32)
+    first, last = indptr[start], indptr[stop]
+    block_rows = np.repeat(np.arange(stop - start), np.diff(indptr[start:stop + 1]))
+    block[block_rows, columns[first:last]] = values[first:last]
+    return block
+
+def top_k_neighbours(
+    indptr: np.ndarray,
+    columns: np.ndarray,
+    values: np.ndarray,
+    dimensions: int,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Row indices and cosine similarities of each row's k nearest rows, most similar first.
+
+    Rows come in CSR form (indptr, columns, values) and stay sparse; runs in
+    a worker process. Only BLOCK_ROWS rows at a time are expanded into dense
+    blocks, and similarities are computed one BLOCK_ROWS x rows strip at a
+    time, so memory grows with the job count but not with jobs x features.
+    """
+    rows = len(indptr) - 1
+    k = min(k, rows - 1)
+    if k <= 0:
+        return np.zeros((rows, 0), dtype=np.int32), np.zeros((rows, 0), dtype=np.float32)
+
+    entry_rows = np.repeat(np.arange(rows), np.diff(indptr))
+    norms = np.sqrt(np.bincount(entry_rows, weights=values.astype(np.float64) ** 2, minlength=rows))
+    norms[norms == 0] = 1
+    values = (values / norms[entry_rows]).astype(np.float32)
+
+    neighbours = np.empty((rows, k), dtype=np.int32)
+    scores = np.empty((rows, k), dtype=np.float32)
+    for start in range(0, rows, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, rows)
+        block = dense_rows(indptr, columns, values, start, stop, dimensions)
+        similarities = np.empty((stop - start, rows), dtype=np.float32)
+        for other in range(0, rows, BLOCK_ROWS):
+            other_stop = min(other + BLOCK_ROWS, rows)
+            other_block = block if other == start else dense_rows(indptr, columns, values, other, other_stop, dimensions)
+            similarities[:, other:other_stop] = block @ other_block.T
+        diagonal = np.arange(stop - start)
+        similarities[diagonal, start + diagonal] = -1
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbours, scores
+
+class JobSimilarityIndex:
+    """Precomputed nearest neighbours of every active job by skills, education and sector.
+
+    Jobs are encoded as IDF-weighted feature vectors; the top NEIGHBOURS
+    cosine neighbours of each job are computed in a worker process and kept
+    as two compact (jobs x NEIGHBOURS) arrays. Job writes update the features
+    immediately and trigger a debounced rebuild; reads never touch MongoDB.
+    """
+
+    def __init__(self, k: int = NEIGHBOURS):
+        self.k = k
+        self.ready = False
+        self.features: Dict[str, Set[str]] = {}
+        self.job_ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.neighbours = np.zeros((0, 0), dtype=np.int32)
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+        self.version = 0
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.rebuild_task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.features
+
+    def add(self, job_doc: dict):
+        """Index or re-index a job; inactive jobs are removed"""
+        if not job_doc.get("isActive", True):
+            self.remove(job_doc["id"])
+            return
+        features = job_features(job_doc)
+        if self.features.get(job_doc["id"]) != features:
+            self.features[job_doc["id"]] = features
+            self._changed()
+
+    def remove(self, job_id: str):
+        """Drop a job from the index"""
+        if self.features.pop(job_id, None) is not None:
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        if self.rebuild_task is None or self.rebuild_task.done():
+            self.rebuild_task = asyncio.create_task(self._rebuild_later())
+
+    async def _rebuild_later(self):
+        # Let a burst of job writes settle into one rebuild; jobs written
+        # while computing are picked up by another pass
+        while True:
+            await asyncio.sleep(REBUILD_DELAY)
+            try:
+                if await self.rebuild() == self.version:
+                    return
+            except Exception as e:
+                logger.error(f"Similar jobs rebuild failed: {e}")
+                return
+
+    def _encode(self, job_ids: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """CSR rows of IDF-weighted features, one row per job"""
+        document_frequency: Dict[str, int] = {}
+        for job_id in job_ids:
+            for feature in self.features[job_id]:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        columns = {feature: i for i, feature in enumerate(sorted(document_frequency))}
+
+        indptr = [0]
+        indices = []
+        values = []
+        for job_id in job_ids:
+            for feature in self.features[job_id]:
+                kind = feature.split(":", 1)[0]
+                indices.append(columns[feature])
+                values.append(FEATURE_WEIGHTS[kind] * math.log(1 + len(job_ids) / document_frequency[feature]))
+            indptr.append(len(indices))
+        return (
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(values, dtype=np.float32),
+            len(columns),
+        )
+
+    async def rebuild(self) -> int:
+        """Recompute every job's neighbours off the event loop, returning the version built"""
+        async with self.lock:
+            version = self.version
+            job_ids = sorted(self.features)
+            indptr, columns, values, dimensions = self._encode(job_ids)
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            loop = asyncio.get_running_loop()
+            neighbours, scores = await loop.run_in_executor(
+                self.pool, top_k_neighbours, indptr, columns, values, dimensions, self.k
+            )
+            self.job_ids = job_ids
+            self.positions = {job_id: i for i, job_id in enumerate(job_ids)}
+            self.neighbours = neighbours
+            self.scores = scores
+            self.ready = True
+            logger.info(f"Similar jobs computed for {len(job_ids)} jobs")
+            return version
+
+    def similar(self, job_id: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """(job_id, similarity) of the jobs most similar to `job_id`, most similar first"""
+        position = self.positions.get(job_id)
+        if position is None or job_id not in self.features:
+            return []
+        similar = []
+        for neighbour, score in zip(self.neighbours[position], self.scores[position]):
+            if score <= 0 or len(similar) >= limit:
+                break
+            neighbour_id = self.job_ids[neighbour]
+            if neighbour_id in self.features:
+                similar.append((neighbour_id, float(score)))
+        return similar
+
+    async def load(self, db):
+        """Index every active job in the database and compute the neighbours"""
+        projection = {"_id": 0, "id": 1, "skillIds": 1, "education": 1, "sector": 1}
+        self.features = {
+            job_doc["id"]: job_features(job_doc)
+            async for job_doc in db.jobs.find({"isActive": True}, projection)
+        }
+        self.version += 1
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.error(f"Similar jobs computation failed: {e}")
+
+    async def stop(self):
+        if self.rebuild_task is not None:
+            self.rebuild_task.cancel()
+            try:
+                await self.rebuild_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self.rebuild_task = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+job_similarity_index = JobSimilarityIndex()
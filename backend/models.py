@@ -15,6 +15,26 @@ class Language(str, Enum):
     ENGLISH = "en"
     KIKONGO = "kg"
 
+class JobSortOption(str, Enum):
+    NEWEST = "newest"
+    OLDEST = "oldest"
+    SALARY = "salary"
+    GROWTH = "growth"
+    POPULAR = "popular"
+
+class JobView(str, Enum):
+    FULL = "full"
+    CARD = "card"
+
+class StatisticsGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
 # Base Models
 class MultilingualText(BaseModel):
     fr: str  # French (default)
@@ -44,13 +64,22 @@ class User(BaseModel):
     university: Optional[str] = None
     year: Optional[str] = None
     field: Optional[str] = None
-    favoriteJobs: List[str] = []
     progress: UserProgress = Field(default_factory=UserProgress)
     preferredLanguage: Language = Language.FRENCH
     avatar: Optional[str] = None
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     lastActive: Optional[datetime] = None
 
+class Favorite(BaseModel):
+    userId: str
+    jobId: str
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+
+class Principal(BaseModel):
+    """Authenticated caller, for handlers that only need to know who and what role"""
+    id: str
+    role: UserRole
+
 class UserCreate(BaseModel):
     name: str
     email: EmailStr
@@ -110,6 +139,7 @@ class Training(BaseModel):
     format: str  # "Online", "In-person", "Hybrid"
     externalLink: ExternalLink
     skills: List[str] = []
+    skillIds: List[str] = []  # Canonical skill IDs, derived from skills
     prerequisites: List[str] = []
     certificate: bool = False
     isActive: bool = True
@@ -164,12 +194,23 @@ class Job(BaseModel):
     growthProjection: str
     companies: List[str] = []  # Company IDs
     skills: List[str] = []
+    skillIds: List[str] = []  # Canonical skill IDs, derived from skills
     training: List[str] = []  # Training IDs
     testimonials: List[str] = []  # Testimonial IDs
     requirements: MultilingualText
     benefits: MultilingualText
     workEnvironment: MultilingualText
     careerPath: MultilingualText
+    # Numeric values parsed from salaryRange, hiringRate and growthProjection
+    salaryMin: Optional[int] = None  # Monthly, converted to USD
+    salaryMax: Optional[int] = None  # Monthly, converted to USD
+    salaryCurrency: Optional[str] = None  # Currency of salaryRange: "USD", "EUR", "CDF"
+    salaryMinOriginal: Optional[int] = None  # Monthly, in salaryCurrency
+    salaryMaxOriginal: Optional[int] = None  # Monthly, in salaryCurrency
+    hiringRateValue: Optional[float] = None  # Percentage
+    growthRate: Optional[float] = None  # Percentage
+    growthYears: Optional[int] = None
+    favoriteCount: int = 0  # Users with this job in their favorites
     isActive: bool = True
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
@@ -192,6 +233,7 @@ class JobCreate(BaseModel):
 
 class JobUpdate(BaseModel):
     title: Optional[MultilingualText] = None
+    sector: Optional[str] = None
     description: Optional[MultilingualText] = None
     education: Optional[List[str]] = None
     salaryRange: Optional[str] = None
@@ -206,6 +248,13 @@ class JobUpdate(BaseModel):
     careerPath: Optional[MultilingualText] = None
     isActive: Optional[bool] = None
 
+# Skill Models
+class Skill(BaseModel):
+    id: str  # Canonical ID, e.g. "public-health"
+    name: MultilingualText
+    synonyms: List[str] = []
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+
 # Sector Models
 class Sector(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -239,6 +288,19 @@ class PlatformStatistics(BaseModel):
     sectorsGrowth: Dict[str, str] = {}
     lastUpdated: datetime = Field(default_factory=datetime.utcnow)
 
+class StatisticsBucket(BaseModel):
+    granularity: StatisticsGranularity
+    bucket: datetime
+    registrations: int = 0
+    activeUsers: int = 0
+    totalJobs: int = 0
+    totalStudents: int = 0
+    totalCompanies: int = 0
+    successStories: int = 0
+    jobsBySector: Dict[str, int] = {}
+    samples: int = 0
+    updatedAt: datetime
+
 # Response Models
 class JobResponse(BaseModel):
     id: str
@@ -251,15 +313,50 @@ class JobResponse(BaseModel):
     growthProjection: str
     companies: List[Company] = []
     skills: List[str]
+    skillIds: List[str] = []
     training: List[Training] = []
     testimonials: List[Testimonial] = []
     requirements: MultilingualText
     benefits: MultilingualText
     workEnvironment: MultilingualText
     careerPath: MultilingualText
+    salaryMin: Optional[int] = None  # USD
+    salaryMax: Optional[int] = None  # USD
+    salaryCurrency: Optional[str] = None
+    salaryMinOriginal: Optional[int] = None
+    salaryMaxOriginal: Optional[int] = None
+    hiringRateValue: Optional[float] = None
+    growthRate: Optional[float] = None
+    growthYears: Optional[int] = None
+    favoriteCount: int = 0
     isActive: bool
     createdAt: datetime
 
+class CompanySummary(BaseModel):
+    id: str
+    name: str
+    logo: Optional[str] = None
+
+class JobCard(BaseModel):
+    id: str
+    title: str  # Resolved in the requested language
+    sector: str
+    salaryRange: str
+    salaryMin: Optional[int] = None
+    salaryMax: Optional[int] = None
+    salaryCurrency: Optional[str] = None
+    hiringRate: str
+    growthProjection: str
+    skills: List[str] = []
+    companies: List[CompanySummary] = []
+    createdAt: datetime
+
+class SimilarJob(JobCard):
+    similarity: float  # Cosine similarity of skills, education and sector
+
+class RecommendedJob(JobCard):
+    score: float  # Similarity to the user's favorites plus field match
+
 class UserResponse(BaseModel):
     id: str
     name: str
@@ -268,7 +365,7 @@ class UserResponse(BaseModel):
     university: Optional[str]
     year: Optional[str]
     field: Optional[str]
-    favoriteJobs: List[str]
+    favoriteJobs: List[str] = []  # Filled from the favorites collection
     progress: UserProgress
     preferredLanguage: Language
     avatar: Optional[str]
@@ -277,18 +374,30 @@ class UserResponse(BaseModel):
 # Search and Filter Models
 class JobSearchFilters(BaseModel):
     sector: Optional[str] = None
-    salaryMin: Optional[int] = None
-    salaryMax: Optional[int] = None
+    salaryMin: Optional[int] = None  # Monthly, USD
+    salaryMax: Optional[int] = None  # Monthly, USD
     skills: Optional[List[str]] = None
     education: Optional[str] = None
     company: Optional[str] = None
     location: Optional[str] = None
     language: Optional[Language] = Language.FRENCH
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+    label: Optional[str] = None  # Display name, for values that are IDs
+
+class JobSearchFacets(BaseModel):
+    sectors: List[FacetCount] = []
+    skills: List[FacetCount] = []
+    education: List[FacetCount] = []
+    salary: List[FacetCount] = []
+
 class JobSearchResponse(BaseModel):
     jobs: List[JobResponse]
     total: int
     page: int
     pageSize: int
     totalPages: int
-    filters: JobSearchFilters
\ No newline at end of file
+    filters: JobSearchFilters
+    facets: JobSearchFacets = Field(default_factory=JobSearchFacets)
\ No newline at end of file
@@ -0,0 +1,123 @@
+from fastapi import HTTPException, status
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+from models import JobSortOption
+
+# Sort keys exposed on list endpoints. Each entry is a list of (field, direction)
+# pairs ending with the unique "id" field so the ordering is total and stable.
+# Every sort here has a matching compound index in database.create_indexes.
+JOB_SORTS = {
+    JobSortOption.NEWEST: [("createdAt", -1), ("id", -1)],
+    JobSortOption.OLDEST: [("createdAt", 1), ("id", 1)],
+    JobSortOption.SALARY: [("salaryMin", -1), ("id", -1)],
+    JobSortOption.GROWTH: [("growthRate", -1), ("id", -1)],
+    JobSortOption.POPULAR: [("favoriteCount", -1), ("id", -1)],
+}
+
+DEFAULT_SORT = [("createdAt", -1), ("id", -1)]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    """Cursor values come from the client: only scalars and dates are accepted,
+    so a tampered cursor cannot smuggle query operators into the filter"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict) and list(value) == ["$date"] and isinstance(value["$date"], str):
+        return datetime.fromisoformat(value["$date"])
+    raise ValueError("invalid cursor value")
+
+def encode_cursor(doc: dict, sort: List[Tuple[str, int]]) -> str:
+    """Build an opaque cursor token pointing just after the given document"""
+    values = [_encode_value(doc.get(field)) for field, _ in sort]
+    payload = json.dumps({"k": [field for field, _ in sort], "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: List[Tuple[str, int]]) -> List[Any]:
+    """Decode a cursor token, checking it was issued for the requested sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] != [field for field, _ in sort]:
+            raise ValueError("cursor does not match sort order")
+        if not isinstance(payload["v"], list) or len(payload["v"]) != len(sort):
+            raise ValueError("cursor does not match sort order")
+        return [_decode_value(value) for value in payload["v"]]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _after(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """Condition matching values strictly after `value` in the given direction.
+
+    MongoDB sorts null/missing values first ascending and last descending,
+    so nulls have to be handled explicitly to keep pages contiguous.
+    """
+    if value is None:
+        return {field: {"$ne": None}} if direction == 1 else None
+    if direction == 1:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+def keyset_filter(sort: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    """Build the query continuing a keyset-paginated listing after `values`"""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        after = _after(field, direction, values[i])
+        if after is None:
+            continue
+        clauses.append({"$and": [clause, after]} if clause else after)
+    return {"$or": clauses}
+
+def apply_cursor(query: dict, cursor: Optional[str], sort: List[Tuple[str, int]]) -> dict:
+    """Combine a base query with the keyset condition for `cursor`"""
+    if not cursor:
+        return query
+    return {"$and": [query, keyset_filter(sort, decode_cursor(cursor, sort))]}
+
+def next_cursor(docs: List[dict], limit: int, sort: List[Tuple[str, int]]) -> Optional[str]:
+    """Cursor for the page following `docs`, or None when this was the last page"""
+    if limit <= 0 or len(docs) < limit:
+        return None
+    return encode_cursor(docs[-1], sort)
+
+async def find_page(
+    collection,
+    query: dict,
+    sort: List[Tuple[str, int]],
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    response=None,
+    projection: Optional[dict] = None
+) -> List[dict]:
+    """Fetch one keyset-paginated page and advertise the next cursor.
+
+    `skip` is only honoured on the first page (when no cursor is given).
+    When a `response` is passed, the next cursor is exposed in the
+    X-Next-Cursor header.
+    """
+    find = collection.find(apply_cursor(query, cursor, sort), projection).sort(sort)
+    if not cursor:
+        find = find.skip(skip)
+    docs = await find.limit(limit).to_list(None)
+    
+    token = next_cursor(docs, limit, sort)
+    if token and response is not None:
+        response.headers[NEXT_CURSOR_HEADER] = token
+    return docs
+
+def cursor_headers(response) -> Dict[str, str]:
+    """The next-cursor header set on `response`, for responses built by hand"""
+    token = response.headers.get(NEXT_CURSOR_HEADER)
+    return {NEXT_CURSOR_HEADER: token} if token else {}
@@ -0,0 +1,64 @@
+from fastapi import HTTPException, status
+from typing import Any, Iterable, List, Optional
+from models import JobResponse, JobCard, Language
+
+LANGUAGE_CODES = {lang.value for lang in Language}
+
+MULTILINGUAL_JOB_FIELDS = {"title", "description", "requirements", "benefits", "workEnvironment", "careerPath"}
+RELATION_FIELDS = {"companies", "training", "testimonials"}
+JOB_RESPONSE_FIELDS = list(JobResponse.model_fields)
+
+CARD_FIELDS = list(JobCard.model_fields)
+CARD_COMPANY_PROJECTION = {"_id": 0, "id": 1, "name": 1, "logo": 1}
+RELATION_PROJECTION = {"_id": 0}
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated `fields=` parameter into JobResponse field names"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in JOB_RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+def job_projection(
+    fields: Iterable[str],
+    lang: Optional[Language] = None,
+    extra: Iterable[str] = ()
+) -> dict:
+    """MongoDB projection reading only `fields` (and only `lang` plus the French fallback)"""
+    projection = {"_id": 0}
+    for field in list(fields) + list(extra):
+        if lang and field in MULTILINGUAL_JOB_FIELDS:
+            projection[f"{field}.{lang.value}"] = 1
+            projection[f"{field}.fr"] = 1
+        else:
+            projection[field] = 1
+    return projection
+
+def resolve_language(value: Any, lang: Language) -> Any:
+    """Replace multilingual text objects with their `lang` string, falling back to French"""
+    if isinstance(value, dict):
+        if "fr" in value and set(value) <= LANGUAGE_CODES:
+            return value.get(lang.value) or value.get("fr")
+        return {key: resolve_language(item, lang) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_language(item, lang) for item in value]
+    return value
+
+def sparse_job(job_doc: dict, fields: List[str], lang: Optional[Language]) -> dict:
+    """Keep only the requested fields of a hydrated job document"""
+    job = {field: job_doc.get(field) for field in fields}
+    return resolve_language(job, lang) if lang else job
+
+def job_card(job_doc: dict, lang: Language) -> JobCard:
+    """Slim list representation of a hydrated job document"""
+    card = {field: job_doc.get(field) for field in CARD_FIELDS}
+    card["title"] = resolve_language(job_doc.get("title") or {}, lang)
+    return JobCard(**card)
@@ -0,0 +1,171 @@
+from fastapi import HTTPException, Request, status
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+import ipaddress
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def parse_trusted_proxies(value: str) -> List[Network]:
+    """Networks from a comma-separated list of proxy addresses or CIDR ranges"""
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+# Reverse proxies whose X-Forwarded-For is believed, e.g. "10.0.0.0/8,127.0.0.1"
+TRUSTED_PROXIES = parse_trusted_proxies(os.getenv("TRUSTED_PROXIES", ""))
+
+def _is_trusted(address: str, trusted: List[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+def client_address(request: Request, trusted: List[Network] = TRUSTED_PROXIES) -> str:
+    """Address of the client that sent the request, as seen past trusted proxies.
+
+    The TCP peer is used unless it is one of TRUSTED_PROXIES; then
+    X-Forwarded-For is read right to left, skipping hops that are trusted
+    proxies themselves, and the first other hop is the client. Hops left of
+    it were written by the client and are ignored, so they cannot be spoofed.
+    """
+    address = request.client.host if request.client else "unknown"
+    if not _is_trusted(address, trusted):
+        return address
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        address = hop
+        if not _is_trusted(hop, trusted):
+            break
+    return address
+
+class MemoryBucketBackend:
+    """Token buckets held in this worker, oldest idle buckets evicted first"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def size(self) -> int:
+        return len(self.buckets)
+
+# Refill, take and store atomically so every worker sees one bucket
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+class RedisBucketBackend:
+    """Token buckets shared between workers, stored in Redis"""
+
+    def __init__(self, url: str, prefix: str = "kongenga:ratelimit:"):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(TAKE_SCRIPT)
+        self.prefix = prefix
+
+    async def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        allowed, tokens = await self.script(keys=[self.prefix + key], args=[capacity, rate, time.time()])
+        allowed = bool(int(allowed))
+        return allowed, 0.0 if allowed else (1 - float(tokens)) / rate
+
+    def size(self) -> Optional[int]:
+        return None
+
+class LoginLimiter:
+    """Admission control for login attempts, checked before any password hashing.
+
+    Each attempt takes a token from the caller's IP bucket (see
+    client_address for how it is found behind a proxy) and from the
+    target email's bucket; an empty bucket rejects with 429. Backend errors
+    let the attempt through rather than locking everyone out.
+    """
+
+    def __init__(self, backend, ip_burst: int, ip_per_minute: float, email_burst: int, email_per_minute: float):
+        self.backend = backend
+        self.policies = {
+            "ip": (ip_burst, ip_per_minute / 60),
+            "email": (email_burst, email_per_minute / 60),
+        }
+        self.allowed = 0
+        self.rejected = {name: 0 for name in self.policies}
+        self.errors = 0
+
+    async def check(self, request: Request, email: str):
+        client_ip = client_address(request)
+        keys = {"ip": f"ip:{client_ip}", "email": f"email:{email.strip().lower()}"}
+        for name, key in keys.items():
+            capacity, rate = self.policies[name]
+            try:
+                allowed, retry_after = await self.backend.take(key, capacity, rate)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Login rate limit check failed: {e}")
+                continue
+            if not allowed:
+                self.rejected[name] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please retry later",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                )
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "allowed": self.allowed,
+            "rejectedByIp": self.rejected["ip"],
+            "rejectedByEmail": self.rejected["email"],
+            "errors": self.errors,
+            "buckets": self.backend.size(),
+        }
+
+def create_login_limiter() -> LoginLimiter:
+    """Build the limiter from RATE_LIMIT_URL (or CACHE_URL) and the LOGIN_* limits"""
+    url = os.getenv("RATE_LIMIT_URL") or os.getenv("CACHE_URL")
+    backend = None
+    if url:
+        try:
+            backend = RedisBucketBackend(url)
+        except ImportError:
+            logger.warning("RATE_LIMIT_URL is set but the redis package is not installed, using in-process buckets")
+    return LoginLimiter(
+        backend or MemoryBucketBackend(),
+        ip_burst=int(os.getenv("LOGIN_IP_BURST", "30")),
+        ip_per_minute=float(os.getenv("LOGIN_IP_PER_MINUTE", "30")),
+        email_burst=int(os.getenv("LOGIN_EMAIL_BURST", "10")),
+        email_per_minute=float(os.getenv("LOGIN_EMAIL_PER_MINUTE", "5")),
+    )
+
+login_limiter = create_login_limiter()
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
+import logging
+import os
+from pymongo import ReplaceOne
+from database import get_database, get_favorite_job_ids
+from job_similarity import job_similarity_index, NEIGHBOURS
+from search_index import tokenize
+from skill_taxonomy import skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_LIMIT = int(os.getenv("RECOMMENDATIONS_LIMIT", "20"))
+RECOMMENDATIONS_TTL = timedelta(seconds=int(os.getenv("RECOMMENDATIONS_TTL_SECONDS", "21600")))
+ACTIVE_WINDOW = timedelta(days=int(os.getenv("RECOMMENDATIONS_ACTIVE_DAYS", "7")))
+PRECOMPUTE_BATCH_SIZE = 500
+
+# Only the most recent favorites steer recommendations
+MAX_SEED_FAVORITES = 50
+# Bonus for a job whose sector, skills or education mention the user's field
+FIELD_WEIGHT = 0.5
+
+class JobRecommender:
+    """Per-user job recommendations stored in the recommendations collection.
+
+    A user's score for a job is the sum of its similarity to each of their
+    favorites, taken from the precomputed job similarity index, plus a bonus
+    when it matches their field of study. Results are kept per user until
+    they expire, the user's favorites or field change, or the periodic batch
+    for active users replaces them; a dashboard load is then a single read.
+    """
+
+    def __init__(self):
+        self.field_index: Dict[str, Set[str]] = {}
+        self.field_index_version = -1
+        self.hits = 0
+        self.computed = 0
+        self.invalidated = 0
+        self.precomputed = 0
+
+    def jobs_matching(self, tokens: Set[str]) -> Set[str]:
+        """Jobs whose sector, skills or education contain one of `tokens`"""
+        if self.field_index_version != job_similarity_index.version:
+            self.field_index = {}
+            for job_id, features in job_similarity_index.features.items():
+                for feature in features:
+                    kind, value = feature.split(":", 1)
+                    names = skill_taxonomy.names(value) if kind == "skill" else [value]
+                    for token in tokenize(" ".join(names)):
+                        self.field_index.setdefault(token, set()).add(job_id)
+            self.field_index_version = job_similarity_index.version
+        return set().union(*(self.field_index.get(token, ()) for token in tokens))
+
+    def score(self, favorite_ids: List[str], field: Optional[str], limit: int) -> List[Tuple[str, float]]:
+        """(job_id, score) of the best jobs for these favorites and field, best first"""
+        scores: Dict[str, float] = {}
+        for job_id in favorite_ids[:MAX_SEED_FAVORITES]:
+            for neighbour, similarity in job_similarity_index.similar(job_id, NEIGHBOURS):
+                scores[neighbour] = scores.get(neighbour, 0.0) + similarity
+
+        for job_id in self.jobs_matching(set(tokenize(field))):
+            scores[job_id] = scores.get(job_id, 0.0) + FIELD_WEIGHT
+
+        for job_id in favorite_ids:
+            scores.pop(job_id, None)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+    async def popular(self, db, exclude: List[str], limit: int) -> List[Tuple[str, float]]:
+        """Most favorited jobs, for users with nothing to go on yet"""
+        cursor = db.jobs.find(
+            {"isActive": True, "id": {"$nin": exclude}}, {"_id": 0, "id": 1}
+        ).sort([("favoriteCount", -1), ("id", -1)]).limit(limit)
+        return [(job["id"], 0.0) async for job in cursor]
+
+    async def recommend(
+        self,
+        db,
+        user_id: str,
+        field: Optional[str],
+        favorite_ids: List[str],
+        popular: Optional[List[Tuple[str, float]]] = None
+    ) -> dict:
+        """Recommendations document for one user.
+
+        `popular` is a most favorited list shared by a batch, long enough to
+        fill RECOMMENDATIONS_LIMIT after dropping the user's favorites; without
+        it a cold-start user gets their own popularity query.
+        """
+        ranked = self.score(favorite_ids, field, RECOMMENDATIONS_LIMIT)
+        if not ranked and popular is not None:
+            favorites = set(favorite_ids)
+            ranked = [item for item in popular if item[0] not in favorites][:RECOMMENDATIONS_LIMIT]
+        elif not ranked:
+            ranked = await self.popular(db, favorite_ids, RECOMMENDATIONS_LIMIT)
+        now = datetime.utcnow()
+        return {
+            "userId": user_id,
+            "jobs": [{"jobId": job_id, "score": round(score, 4)} for job_id, score in ranked],
+            "computedAt": now,
+            "expireAt": now + RECOMMENDATIONS_TTL,
+        }
+
+    async def compute(self, db, user_id: str, field: Optional[str], favorite_ids: List[str]) -> dict:
+        """Score jobs for one user and store the result"""
+        recommendation_doc = await self.recommend(db, user_id, field, favorite_ids)
+        # Results computed before the similarity index is ready are not kept
+        if job_similarity_index.ready:
+            await db.recommendations.replace_one({"userId": user_id}, recommendation_doc, upsert=True)
+        self.computed += 1
+        return recommendation_doc
+
+    async def get(self, db, user_id: str, field: Optional[str]) -> dict:
+        """A user's stored recommendations, computing them on a miss"""
+        recommendation_doc = await db.recommendations.find_one(
+            {"userId": user_id, "expireAt": {"$gt": datetime.utcnow()}}, {"_id": 0}
+        )
+        if recommendation_doc:
+            self.hits += 1
+            return recommendation_doc
+        favorite_ids = await get_favorite_job_ids(db, user_id)
+        return await self.compute(db, user_id, field, favorite_ids)
+
+    async def invalidate(self, db, user_id: str):
+        """Drop a user's recommendations after their favorites or field change"""
+        await db.recommendations.delete_one({"userId": user_id})
+        self.invalidated += 1
+
+    async def precompute_active_users(self) -> int:
+        """Recompute the recommendations of students active within ACTIVE_WINDOW"""
+        if not job_similarity_index.ready:
+            return 0
+        db = await get_database()
+        since = datetime.utcnow() - ACTIVE_WINDOW
+        users = db.users.find(
+            {"role": "student", "lastActive": {"$gte": since}}, {"_id": 0, "id": 1, "field": 1}
+        )
+        written = 0
+        batch = []
+        async for user in users:
+            batch.append(user)
+            if len(batch) >= PRECOMPUTE_BATCH_SIZE:
+                written += await self._precompute_batch(db, batch)
+                batch = []
+        if batch:
+            written += await self._precompute_batch(db, batch)
+        self.precomputed += written
+        logger.info(f"Precomputed recommendations for {written} active users")
+        return written
+
+    async def _precompute_batch(self, db, users: List[dict]) -> int:
+        favorites: Dict[str, List[str]] = {user["id"]: [] for user in users}
+        async for favorite in db.favorites.find(
+            {"userId": {"$in": list(favorites)}}, {"_id": 0, "userId": 1, "jobId": 1}
+        ).sort([("userId", 1), ("createdAt", -1), ("jobId", -1)]):
+            favorites[favorite["userId"]].append(favorite["jobId"])
+
+        # One popularity query for the whole batch, with room for any user's favorites
+        longest = max(len(favorite_ids) for favorite_ids in favorites.values())
+        popular = await self.popular(db, [], RECOMMENDATIONS_LIMIT + longest)
+
+        operations = []
+        for user in users:
+            recommendation_doc = await self.recommend(
+                db, user["id"], user.get("field"), favorites[user["id"]], popular
+            )
+            operations.append(ReplaceOne({"userId": user["id"]}, recommendation_doc, upsert=True))
+        await db.recommendations.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "computed": self.computed,
+            "invalidated": self.invalidated,
+            "precomputed": self.precomputed,
+        }
+
+job_recommender = JobRecommender()
@@ -1,36 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from models import PlatformStatistics
-from auth import get_current_admin_user
-from database import get_database, update_platform_statistics
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse
+from typing import List, Optional
+from models import PlatformStatistics, StatisticsBucket, StatisticsGranularity, ExportFormat
+from auth import get_current_admin_principal, password_hasher, user_cache
+from database import get_database
+from cache import response_cache, SnapshotCache
+from stats_engine import statistics_engine
+from rate_limit import login_limiter
+from activity import activity_tracker
+from recommendations import job_recommender
+from index_sync import index_sync
+from stats_history import get_statistics_history, naive_utc
+from exports import (
+    export_response, USER_EXPORT_PIPELINE, USER_EXPORT_FIELDS,
+    JOB_EXPORT_PIPELINE, JOB_EXPORT_FIELDS
+)
+from analytics_export import analytics_exporter, EXPORTED_COLLECTIONS, PARQUET_MEDIA_TYPE
+import asyncio
 import logging
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Shared by every admin polling the dashboard on this worker
+dashboard_snapshot = SnapshotCache(ttl=float(os.getenv("DASHBOARD_CACHE_SECONDS", "10")))
+
 @router.get("/statistics")
 async def get_platform_statistics(
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Get platform statistics (admin only)"""
     try:
-        # Update statistics first
-        await update_platform_statistics()
-        
-        # Get statistics
-        stats_doc = await db.statistics.find_one({"_id": "platform_stats"})
+        # Served from the stored snapshot, refreshed in the background
+        stats_doc = await statistics_engine.read()
         if not stats_doc:
-            # If no stats exist, create them
-            await update_platform_statistics()
-            stats_doc = await db.statistics.find_one({"_id": "platform_stats"})
-        
-        # Remove MongoDB _id field
-        if "_id" in stats_doc:
-            del stats_doc["_id"]
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Statistics are not available yet"
+            )
         
+        stats_doc["ageSeconds"] = round((datetime.utcnow() - stats_doc["lastUpdated"]).total_seconds(), 1)
+        stats_doc["refreshPending"] = statistics_engine.pending.is_set()
         return stats_doc
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get statistics error: {e}")
         raise HTTPException(
@@ -38,65 +55,44 @@ async def get_platform_statistics(
             detail="Failed to get statistics"
         )
 
+@router.get("/statistics/history", response_model=List[StatisticsBucket])
+async def get_platform_statistics_history(
+    granularity: StatisticsGranularity = StatisticsGranularity.DAY,
+    start: Optional[datetime] = Query(None, description="Defaults to 30 days before end"),
+    end: Optional[datetime] = Query(None, description="Defaults to now"),
+    admin_user = Depends(get_current_admin_principal),
+    db = Depends(get_database)
+):
+    """Get pre-aggregated statistics buckets over a time range (admin only)"""
+    try:
+        # Buckets are naive UTC; a "Z" or offset suffix makes the query params aware
+        end = naive_utc(end) if end else datetime.utcnow()
+        start = naive_utc(start) if start else end - timedelta(days=30)
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start must be before end"
+            )
+        
+        return await get_statistics_history(db, granularity, start, end)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get statistics history error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get statistics history"
+        )
+
 @router.get("/dashboard")
 async def get_admin_dashboard(
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Get admin dashboard data"""
     try:
-        # Get basic counts
-        total_jobs = await db.jobs.count_documents({"isActive": True})
-        total_users = await db.users.count_documents({"role": "student"})
-        total_companies = await db.companies.count_documents({"isActive": True})
-        pending_testimonials = await db.testimonials.count_documents({"isApproved": False})
-        
-        # Get recent activity
-        recent_users = []
-        async for user in db.users.find({"role": "student"}).sort("createdAt", -1).limit(5):
-            recent_users.append({
-                "id": user["id"],
-                "name": user["name"],
-                "email": user["email"],
-                "createdAt": user["createdAt"],
-                "university": user.get("university", "N/A")
-            })
-        
-        # Get recent jobs
-        recent_jobs = []
-        async for job in db.jobs.find({"isActive": True}).sort("createdAt", -1).limit(5):
-            recent_jobs.append({
-                "id": job["id"],
-                "title": job["title"]["fr"],
-                "sector": job["sector"],
-                "createdAt": job["createdAt"]
-            })
-        
-        # Get sector stats
-        sector_stats = []
-        async for sector in db.sectors.find({"isActive": True}):
-            job_count = await db.jobs.count_documents({
-                "sector": sector["name"]["fr"],
-                "isActive": True
-            })
-            sector_stats.append({
-                "name": sector["name"]["fr"],
-                "jobCount": job_count,
-                "growth": sector["growth"]
-            })
-        
-        return {
-            "totals": {
-                "jobs": total_jobs,
-                "users": total_users,
-                "companies": total_companies,
-                "pendingTestimonials": pending_testimonials
-            },
-            "recentUsers": recent_users,
-            "recentJobs": recent_jobs,
-            "sectorStats": sector_stats,
-            "lastUpdated": datetime.utcnow()
-        }
+        return await dashboard_snapshot.get(lambda: build_admin_dashboard(db))
         
     except Exception as e:
         logger.error(f"Get dashboard error: {e}")
@@ -105,15 +101,86 @@ async def get_admin_dashboard(
             detail="Failed to get dashboard data"
         )
 
+async def build_admin_dashboard(db) -> dict:
+    """Assemble the dashboard, issuing the independent queries concurrently"""
+    user_projection = {"_id": 0, "id": 1, "name": 1, "email": 1, "createdAt": 1, "university": 1}
+    job_projection = {"_id": 0, "id": 1, "title.fr": 1, "sector": 1, "createdAt": 1}
+    # Job counts are maintained on the sector documents, no per-sector counting needed
+    sector_projection = {"_id": 0, "name.fr": 1, "jobCount": 1, "growth": 1}
+    
+    (
+        total_jobs, total_users, total_companies, pending_testimonials,
+        users, jobs, sectors
+    ) = await asyncio.gather(
+        db.jobs.count_documents({"isActive": True}),
+        db.users.count_documents({"role": "student"}),
+        db.companies.count_documents({"isActive": True}),
+        db.testimonials.count_documents({"isApproved": False}),
+        db.users.find({"role": "student"}, user_projection).sort("createdAt", -1).limit(5).to_list(None),
+        db.jobs.find({"isActive": True}, job_projection).sort("createdAt", -1).limit(5).to_list(None),
+        db.sectors.find({"isActive": True}, sector_projection).to_list(None)
+    )
+    
+    recent_users = [
+        {
+            "id": user["id"],
+            "name": user["name"],
+            "email": user["email"],
+            "createdAt": user["createdAt"],
+            "university": user.get("university", "N/A")
+        }
+        for user in users
+    ]
+    
+    recent_jobs = [
+        {
+            "id": job["id"],
+            "title": job["title"]["fr"],
+            "sector": job["sector"],
+            "createdAt": job["createdAt"]
+        }
+        for job in jobs
+    ]
+    
+    sector_stats = [
+        {
+            "name": sector["name"]["fr"],
+            "jobCount": sector.get("jobCount", 0),
+            "growth": sector["growth"]
+        }
+        for sector in sectors
+    ]
+    
+    return {
+        "totals": {
+            "jobs": total_jobs,
+            "users": total_users,
+            "companies": total_companies,
+            "pendingTestimonials": pending_testimonials
+        },
+        "recentUsers": recent_users,
+        "recentJobs": recent_jobs,
+        "sectorStats": sector_stats,
+        "lastUpdated": datetime.utcnow()
+    }
+
 @router.post("/import-sample-data")
 async def import_sample_data(
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Import sample data (admin only)"""
     try:
         from database import init_sample_data
+        from job_cards import rebuild_job_cards
+        from skill_taxonomy import backfill_skill_ids
         await init_sample_data()
+        await backfill_skill_ids()
+        await index_sync.changed(db, "jobs", "companies", "training")
+        await index_sync.load(db)
+        await rebuild_job_cards()
+        await response_cache.invalidate("sectors", "companies", "training", "testimonials", "jobs")
+        dashboard_snapshot.invalidate()
         
         return {"status": "success", "message": "Sample data imported successfully"}
         
@@ -126,14 +193,20 @@ async def import_sample_data(
 
 @router.post("/update-statistics")
 async def update_statistics(
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Update platform statistics (admin only)"""
     try:
-        await update_platform_statistics()
+        if await statistics_engine.refresh() is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to update statistics"
+            )
         return {"status": "success", "message": "Statistics updated"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update statistics error: {e}")
         raise HTTPException(
@@ -141,61 +214,103 @@ async def update_statistics(
             detail="Failed to update statistics"
         )
 
+@router.get("/metrics")
+async def get_metrics(admin_user = Depends(get_current_admin_principal)):
+    """Get runtime counters for this worker (admin only)"""
+    return {
+        "cache": response_cache.stats(),
+        "statistics": statistics_engine.stats(),
+        "dashboard": dashboard_snapshot.stats(),
+        "passwordHashing": password_hasher.stats(),
+        "principals": user_cache.stats(),
+        "loginAdmission": login_limiter.stats(),
+        "activity": activity_tracker.stats(),
+        "recommendations": job_recommender.stats(),
+        "indexSync": index_sync.stats()
+    }
+
 @router.get("/export/users")
 async def export_users(
-    admin_user = Depends(get_current_admin_user),
+    format: ExportFormat = ExportFormat.CSV,
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
-    """Export users data as CSV (admin only)"""
-    try:
-        users = []
-        async for user in db.users.find({"role": "student"}):
-            users.append({
-                "id": user["id"],
-                "name": user["name"],
-                "email": user["email"],
-                "university": user.get("university", ""),
-                "year": user.get("year", ""),
-                "field": user.get("field", ""),
-                "createdAt": user["createdAt"],
-                "favoriteJobsCount": len(user.get("favoriteJobs", [])),
-                "profileComplete": user.get("progress", {}).get("profileComplete", 0)
-            })
-        
-        return {"users": users, "count": len(users)}
-        
-    except Exception as e:
-        logger.error(f"Export users error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export users"
-        )
+    """Export users data as CSV or NDJSON (admin only)"""
+    return export_response(db.users, USER_EXPORT_PIPELINE, USER_EXPORT_FIELDS, format, "users")
 
 @router.get("/export/jobs")
 async def export_jobs(
-    admin_user = Depends(get_current_admin_user),
+    format: ExportFormat = ExportFormat.CSV,
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
-    """Export jobs data (admin only)"""
+    """Export jobs data as CSV or NDJSON (admin only)"""
+    return export_response(db.jobs, JOB_EXPORT_PIPELINE, JOB_EXPORT_FIELDS, format, "jobs")
+
+@router.post("/analytics-exports", status_code=status.HTTP_202_ACCEPTED)
+async def start_analytics_export(
+    admin_user = Depends(get_current_admin_principal),
+    db = Depends(get_database)
+):
+    """Start a Parquet export of users, jobs, testimonials and favorites (admin only)"""
     try:
-        jobs = []
-        async for job in db.jobs.find({"isActive": True}):
-            jobs.append({
-                "id": job["id"],
-                "title": job["title"]["fr"],
-                "sector": job["sector"],
-                "salaryRange": job["salaryRange"],
-                "hiringRate": job["hiringRate"],
-                "skillsCount": len(job.get("skills", [])),
-                "companiesCount": len(job.get("companies", [])),
-                "createdAt": job["createdAt"]
-            })
-        
-        return {"jobs": jobs, "count": len(jobs)}
+        export_doc = await analytics_exporter.start(db, admin_user.id)
+        logger.info(f"Analytics export started: {export_doc['id']}")
+        return export_doc
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Export jobs error: {e}")
+        logger.error(f"Start analytics export error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export jobs"
-        )
\ No newline at end of file
+            detail="Failed to start analytics export"
+        )
+
+@router.get("/analytics-exports")
+async def list_analytics_exports(
+    limit: int = Query(10, ge=1, le=100),
+    admin_user = Depends(get_current_admin_principal),
+    db = Depends(get_database)
+):
+    """List recent analytics exports with their progress (admin only)"""
+    return await db.analytics_exports.find({}, {"_id": 0}).sort("createdAt", -1).to_list(limit)
+
+@router.get("/analytics-exports/{export_id}")
+async def get_analytics_export(
+    export_id: str,
+    admin_user = Depends(get_current_admin_principal),
+    db = Depends(get_database)
+):
+    """Get the progress of an analytics export (admin only)"""
+    export_doc = await db.analytics_exports.find_one({"id": export_id}, {"_id": 0})
+    if not export_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+    return export_doc
+
+@router.get("/analytics-exports/{export_id}/{collection}.parquet")
+async def download_analytics_export(
+    export_id: str,
+    collection: str,
+    admin_user = Depends(get_current_admin_principal),
+    db = Depends(get_database)
+):
+    """Download one collection of a completed analytics export (admin only)"""
+    export_doc = await db.analytics_exports.find_one({"id": export_id}, {"_id": 0})
+    if not export_doc or collection not in EXPORTED_COLLECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+    
+    path = analytics_exporter.file_path(export_id, collection)
+    if export_doc["collections"][collection]["status"] != "completed" or not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Export file is not available"
+        )
+    
+    return FileResponse(path, media_type=PARQUET_MEDIA_TYPE, filename=f"{collection}-{export_id}.parquet")
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from models import User, UserCreate, UserLogin, UserResponse
-from auth import authenticate_user, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
-from database import get_database
+from auth import authenticate_user, create_access_token, password_hasher, ACCESS_TOKEN_EXPIRE_MINUTES
+from database import get_database, get_favorite_job_ids
+from stats_engine import statistics_engine
+from rate_limit import login_limiter
+from activity import activity_tracker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,7 +25,7 @@ async def register_user(user_data: UserCreate, db = Depends(get_database)):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         user = User(
             name=user_data.name,
             email=user_data.email,
@@ -34,6 +37,7 @@ async def register_user(user_data: UserCreate, db = Depends(get_database)):
         
         # Insert user to database
         await db.users.insert_one(user.dict())
+        statistics_engine.request_refresh()
         
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -59,9 +63,12 @@ async def register_user(user_data: UserCreate, db = Depends(get_database)):
         )
 
 @router.post("/login", response_model=dict)
-async def login_user(user_data: UserLogin, db = Depends(get_database)):
+async def login_user(user_data: UserLogin, request: Request, db = Depends(get_database)):
     """Login user"""
     try:
+        # Rejected before any password hashing
+        await login_limiter.check(request, user_data.email)
+        
         # Handle admin login
         if user_data.userType == "manager":
             if user_data.email == "admin@careerplatform.cd" and user_data.password == "admin123":
@@ -71,12 +78,14 @@ async def login_user(user_data: UserLogin, db = Depends(get_database)):
                     admin = User(
                         name="Administrateur KONGENGA",
                         email=user_data.email,
-                        password_hash=get_password_hash(user_data.password),
+                        password_hash=await password_hasher.hash(user_data.password),
                         role="site_manager"
                     )
                     await db.users.insert_one(admin.dict())
                     admin_user = admin.dict()
                 
+                activity_tracker.record(admin_user["id"])
+                
                 access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
                 access_token = create_access_token(
                     data={"sub": admin_user["id"]}, expires_delta=access_token_expires
@@ -97,11 +106,7 @@ async def login_user(user_data: UserLogin, db = Depends(get_database)):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Update last active
-        await db.users.update_one(
-            {"id": user.id},
-            {"$set": {"lastActive": user.createdAt}}
-        )
+        activity_tracker.record(user.id)
         
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -110,10 +115,11 @@ async def login_user(user_data: UserLogin, db = Depends(get_database)):
         
         logger.info(f"User logged in: {user.email}")
         
+        favorite_jobs = await get_favorite_job_ids(db, user.id)
         return {
             "access_token": access_token,
             "token_type": "bearer",
-            "user": UserResponse(**user.dict())
+            "user": UserResponse(**{**user.dict(), "favoriteJobs": favorite_jobs})
         }
         
     except HTTPException:
@@ -127,10 +133,12 @@ async def login_user(user_data: UserLogin, db = Depends(get_database)):
 
 @router.post("/token")
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db = Depends(get_database)
 ):
     """OAuth2 compatible token endpoint"""
+    await login_limiter.check(request, form_data.username)
     user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise HTTPException(
@@ -138,6 +146,7 @@ async def login_for_access_token(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    activity_tracker.record(user.id)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.id}, expires_delta=access_token_expires
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from typing import List, Optional
 from models import Company, CompanyCreate
-from auth import get_current_admin_user
+from auth import get_current_admin_principal
 from database import get_database
+from cache import cached, response_cache
+from stats_engine import statistics_engine
+from suggest_index import suggestion_index
+from index_sync import index_sync
+from pagination import DEFAULT_SORT, find_page
+from job_cards import refresh_job_cards
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 @router.get("/", response_model=List[Company])
+@cached("companies")
 async def get_all_companies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     sector: Optional[str] = None,
     db = Depends(get_database)
 ):
@@ -22,11 +31,17 @@ async def get_all_companies(
             query["sector"] = sector
         
         companies = []
-        async for company_doc in db.companies.find(query).skip(skip).limit(limit):
+        docs = await find_page(
+            db.companies, query, DEFAULT_SORT, limit,
+            skip=skip, cursor=cursor, response=response
+        )
+        for company_doc in docs:
             companies.append(Company(**company_doc))
         
         return companies
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get companies error: {e}")
         raise HTTPException(
@@ -35,6 +50,7 @@ async def get_all_companies(
         )
 
 @router.get("/{company_id}", response_model=Company)
+@cached("companies:{company_id}")
 async def get_company_by_id(company_id: str, db = Depends(get_database)):
     """Get company by ID"""
     try:
@@ -60,17 +76,19 @@ async def get_company_by_id(company_id: str, db = Depends(get_database)):
 @router.post("/", response_model=Company)
 async def create_company(
     company_data: CompanyCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Create new company (admin only)"""
     try:
         company = Company(**company_data.dict())
         await db.companies.insert_one(company.dict())
+        suggestion_index.add_company(company.dict())
+        await index_sync.changed(db, "companies")
+        await response_cache.invalidate("companies")
         
         # Update statistics
-        from database import update_platform_statistics
-        await update_platform_statistics()
+        statistics_engine.request_refresh()
         
         logger.info(f"Company created: {company.id}")
         return company
@@ -86,7 +104,7 @@ async def create_company(
 async def update_company(
     company_id: str,
     company_update: CompanyCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Update company (admin only)"""
@@ -106,6 +124,11 @@ async def update_company(
         
         # Get updated company
         company_doc = await db.companies.find_one({"id": company_id})
+        suggestion_index.add_company(company_doc)
+        await index_sync.changed(db, "companies")
+        await refresh_job_cards(db, {"companies": company_id})
+        await response_cache.invalidate("companies", f"companies:{company_id}")
+        statistics_engine.request_refresh()
         
         logger.info(f"Company updated: {company_id}")
         return Company(**company_doc)
@@ -122,7 +145,7 @@ async def update_company(
 @router.delete("/{company_id}")
 async def delete_company(
     company_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Delete company (admin only)"""
@@ -138,6 +161,11 @@ async def delete_company(
                 detail="Company not found"
             )
         
+        suggestion_index.remove_company(company_id)
+        await index_sync.changed(db, "companies")
+        await refresh_job_cards(db, {"companies": company_id})
+        await response_cache.invalidate("companies", f"companies:{company_id}")
+        statistics_engine.request_refresh()
         logger.info(f"Company deleted: {company_id}")
         return {"status": "success", "message": "Company deleted successfully"}
         
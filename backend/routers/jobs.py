@@ -1,46 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 from datetime import datetime
-from models import Job, JobCreate, JobUpdate, JobResponse, JobSearchFilters, Language
-from auth import get_current_admin_user, get_current_active_user
-from database import get_database
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import OperationFailure
+from models import (
+    Job, JobCreate, JobUpdate, JobResponse, JobSearchFilters, JobSearchResponse, JobSearchFacets,
+    JobSortOption, JobView, Language, SimilarJob
+)
+from auth import get_current_admin_principal
+from database import get_database, adjust_sector_job_count, JOB_TEXT_LANGUAGE
+from cache import cached, response_cache
+from stats_engine import statistics_engine
+from pagination import JOB_SORTS, DEFAULT_SORT, find_page, next_cursor, cursor_headers
+from projections import (
+    RELATION_FIELDS, JOB_RESPONSE_FIELDS, CARD_FIELDS, CARD_COMPANY_PROJECTION, RELATION_PROJECTION,
+    parse_fields, job_projection, sparse_job, job_card
+)
+from search_index import job_search_index
+from job_metrics import normalize_job_metrics
+from suggest_index import suggestion_index
+from job_cards import hydrate_job_relations, find_job_card, refresh_job_cards, job_card_status
+from job_similarity import job_similarity_index, NEIGHBOURS
+from skill_taxonomy import skill_taxonomy
+from index_sync import index_sync
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 @router.get("/", response_model=List[JobResponse])
+@cached("jobs", "companies", "training", "testimonials")
 async def get_all_jobs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: JobSortOption = JobSortOption.NEWEST,
     sector: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None),
     search: Optional[str] = None,
+    fuzzy: bool = False,
     language: Language = Language.FRENCH,
+    view: JobView = JobView.FULL,
+    fields: Optional[str] = None,
+    lang: Optional[Language] = None,
     db = Depends(get_database)
 ):
-    """Get all active jobs with filtering"""
+    """Get all active jobs with filtering.
+
+    `view=card`, `fields=` (comma-separated) and `lang=` return slimmer
+    payloads; only the fields they need are read from the database.
+    """
     try:
+        field_list = parse_fields(fields)
+        projection = sparse_projection(view, field_list, lang, extra=[key for key, _ in JOB_SORTS[sort]])
+        
         # Build query
         query = {"isActive": True}
         if sector:
             query["sector"] = sector
+        skill_ids = skill_taxonomy.resolve_all(skills) if skills else None
+        if skill_ids:
+            query["skillIds"] = {"$all": skill_ids}
         
-        # Text search
-        if search:
-            query["$or"] = [
-                {f"title.{language}": {"$regex": search, "$options": "i"}},
-                {f"description.{language}": {"$regex": search, "$options": "i"}},
-                {"skills": {"$regex": search, "$options": "i"}}
-            ]
-        
-        jobs = []
-        async for job_doc in db.jobs.find(query).skip(skip).limit(limit):
-            # Get associated data
-            job_response = await build_job_response(job_doc, db)
-            jobs.append(job_response)
+        # Search results are ranked by relevance and paged with skip
+        if search and job_search_index.ready:
+            ranked = job_search_index.search(
+                search, sector=sector, skills=skill_ids, skip=skip, limit=limit, fuzzy=fuzzy
+            )
+            job_docs = await find_jobs_by_ids(db, [job_id for job_id, _ in ranked], projection)
+        elif search:
+            job_docs = await search_jobs_by_text(db, query, search, language, skip, limit, projection)
+        elif job_card_status.ready:
+            # Cards embed the relations: the page is a single read
+            cards = await find_page(
+                db.job_cards, query, JOB_SORTS[sort], limit,
+                skip=skip, cursor=cursor, response=response, projection=projection or {"_id": 0}
+            )
+            return card_page_response(cards, response, view, field_list, lang)
+        else:
+            job_docs = await find_page(
+                db.jobs, query, JOB_SORTS[sort], limit,
+                skip=skip, cursor=cursor, response=response, projection=projection
+            )
         
-        return jobs
+        # Get associated data for the whole page at once
+        sparse_jobs = await build_sparse_jobs(job_docs, db, view, field_list, lang)
+        if sparse_jobs is not None:
+            return JSONResponse(jsonable_encoder(sparse_jobs), headers=cursor_headers(response))
+        return await build_job_responses(job_docs, db)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get jobs error: {e}")
         raise HTTPException(
@@ -48,17 +102,144 @@ async def get_all_jobs(
             detail="Failed to get jobs"
         )
 
+# Monthly salary bucket boundaries for the salary facet, in USD like salaryMin
+SALARY_BUCKETS = [0, 500, 1000, 2000, 5000]
+FACET_LIMIT = 20
+
+@router.get("/search", response_model=JobSearchResponse)
+@cached("jobs", "companies", "training", "testimonials")
+async def search_jobs(
+    sector: Optional[str] = None,
+    salaryMin: Optional[int] = None,
+    salaryMax: Optional[int] = None,
+    skills: Optional[List[str]] = Query(None),
+    education: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    language: Language = Language.FRENCH,
+    page: int = Query(1, ge=1),
+    pageSize: int = Query(20, ge=1, le=100),
+    db = Depends(get_database)
+):
+    """Search jobs with filters, returning the page, total and facet counts.
+
+    `salaryMin`/`salaryMax` are monthly amounts in USD; every job's salary is
+    converted to USD when parsed, whatever currency its range is quoted in.
+    """
+    try:
+        filters = JobSearchFilters(
+            sector=sector,
+            salaryMin=salaryMin,
+            salaryMax=salaryMax,
+            skills=skills,
+            education=education,
+            company=company,
+            location=location,
+            language=language
+        )
+        query = await build_search_query(filters, db)
+        
+        # Page, total and every facet are computed in a single aggregation
+        pipeline = [
+            {"$match": query},
+            {"$facet": {
+                "jobs": [
+                    {"$sort": dict(DEFAULT_SORT)},
+                    {"$skip": (page - 1) * pageSize},
+                    {"$limit": pageSize}
+                ],
+                "total": [{"$count": "count"}],
+                "sectors": [
+                    {"$group": {"_id": "$sector", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}}
+                ],
+                # Canonical IDs, so a bucket's value can be passed back as a skills filter
+                "skills": [
+                    {"$unwind": "$skillIds"},
+                    {"$group": {"_id": "$skillIds", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": FACET_LIMIT}
+                ],
+                "education": [
+                    {"$unwind": "$education"},
+                    {"$group": {"_id": "$education", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": FACET_LIMIT}
+                ],
+                "salary": [
+                    {"$bucket": {
+                        "groupBy": "$salaryMin",
+                        "boundaries": SALARY_BUCKETS + [float("inf")],
+                        "default": "unknown",
+                        "output": {"count": {"$sum": 1}}
+                    }}
+                ]
+            }}
+        ]
+        result = (await db.jobs.aggregate(pipeline).to_list(1))[0]
+        
+        total = result["total"][0]["count"] if result["total"] else 0
+        jobs = await build_job_responses(result["jobs"], db)
+        facets = JobSearchFacets(
+            sectors=facet_counts(result["sectors"]),
+            skills=[
+                {**facet, "label": skill_taxonomy.label(facet["value"], language)}
+                for facet in facet_counts(result["skills"])
+            ],
+            education=facet_counts(result["education"]),
+            salary=[
+                {"value": salary_bucket_label(bucket["_id"]), "count": bucket["count"]}
+                for bucket in result["salary"]
+            ]
+        )
+        
+        return JobSearchResponse(
+            jobs=jobs,
+            total=total,
+            page=page,
+            pageSize=pageSize,
+            totalPages=(total + pageSize - 1) // pageSize,
+            filters=filters,
+            facets=facets
+        )
+        
+    except Exception as e:
+        logger.error(f"Search jobs error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search jobs"
+        )
+
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job_by_id(job_id: str, db = Depends(get_database)):
+@cached("jobs:{job_id}", "companies", "training", "testimonials")
+async def get_job_by_id(
+    job_id: str,
+    view: JobView = JobView.FULL,
+    fields: Optional[str] = None,
+    lang: Optional[Language] = None,
+    db = Depends(get_database)
+):
     """Get job by ID"""
     try:
-        job_doc = await db.jobs.find_one({"id": job_id, "isActive": True})
+        field_list = parse_fields(fields)
+        projection = sparse_projection(view, field_list, lang)
+        
+        # The job card already embeds the relations: a single document read
+        card = await find_job_card(db, job_id, projection)
+        if card:
+            return card_response(card, view, field_list, lang)
+        
+        job_doc = await db.jobs.find_one({"id": job_id, "isActive": True}, projection)
         if not job_doc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
             )
         
+        sparse_jobs = await build_sparse_jobs([job_doc], db, view, field_list, lang)
+        if sparse_jobs is not None:
+            return JSONResponse(jsonable_encoder(sparse_jobs[0]))
+        
         job_response = await build_job_response(job_doc, db)
         return job_response
         
@@ -71,25 +252,66 @@ async def get_job_by_id(job_id: str, db = Depends(get_database)):
             detail="Failed to get job"
         )
 
+@router.get("/{job_id}/similar", response_model=List[SimilarJob])
+async def get_similar_jobs(
+    job_id: str,
+    limit: int = Query(10, ge=1, le=NEIGHBOURS),
+    lang: Optional[Language] = None,
+    db = Depends(get_database)
+):
+    """Get the jobs most similar to a job by skills, education and sector"""
+    try:
+        if not job_similarity_index.ready:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Similar jobs are still being computed"
+            )
+        if job_id not in job_similarity_index:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        
+        # Neighbours come from memory; only the cards are read from the database
+        similar = dict(job_similarity_index.similar(job_id, limit))
+        projection = sparse_projection(JobView.CARD, None, lang)
+        job_docs = await find_jobs_by_ids(db, list(similar), projection)
+        cards = await build_sparse_jobs(job_docs, db, JobView.CARD, None, lang)
+        return [SimilarJob(**card.dict(), similarity=round(similar[card.id], 4)) for card in cards]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get similar jobs error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get similar jobs"
+        )
+
 @router.get("/sector/{sector_name}")
+@cached("jobs", "companies", "training", "testimonials")
 async def get_jobs_by_sector(
     sector_name: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     db = Depends(get_database)
 ):
     """Get jobs by sector"""
     try:
-        jobs = []
-        async for job_doc in db.jobs.find({
-            "sector": sector_name,
-            "isActive": True
-        }).skip(skip).limit(limit):
-            job_response = await build_job_response(job_doc, db)
-            jobs.append(job_response)
+        query = {"sector": sector_name, "isActive": True}
+        job_docs = await find_page(db.jobs, query, DEFAULT_SORT, limit, skip=skip, cursor=cursor)
+        jobs = await build_job_responses(job_docs, db)
         
-        return {"jobs": jobs, "sector": sector_name, "total": len(jobs)}
+        return {
+            "jobs": jobs,
+            "sector": sector_name,
+            "total": len(jobs),
+            "nextCursor": next_cursor(job_docs, limit, DEFAULT_SORT)
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get jobs by sector error: {e}")
         raise HTTPException(
@@ -101,19 +323,28 @@ async def get_jobs_by_sector(
 @router.post("/", response_model=JobResponse)
 async def create_job(
     job_data: JobCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Create new job (admin only)"""
     try:
         job = Job(**job_data.dict())
-        await db.jobs.insert_one(job.dict())
+        job_doc = job.dict()
+        job_doc.update(normalize_job_metrics(job_doc))
+        job_doc["skillIds"] = await skill_taxonomy.normalize(db, job.skills)
+        await db.jobs.insert_one(job_doc)
+        await adjust_sector_job_count(job.sector, 1)
+        job_search_index.add(job_doc)
+        suggestion_index.add_job(job_doc)
+        job_similarity_index.add(job_doc)
+        await index_sync.changed(db, "jobs")
+        await refresh_job_cards(db, {"id": job.id})
+        await response_cache.invalidate("jobs")
         
         # Update statistics
-        from database import update_platform_statistics
-        await update_platform_statistics()
+        statistics_engine.request_refresh()
         
-        job_response = await build_job_response(job.dict(), db)
+        job_response = await build_job_response(job_doc, db)
         logger.info(f"Job created: {job.id}")
         
         return job_response
@@ -129,27 +360,39 @@ async def create_job(
 async def update_job(
     job_id: str,
     job_update: JobUpdate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Update job (admin only)"""
     try:
         update_data = {k: v for k, v in job_update.dict().items() if v is not None}
+        update_data.update(normalize_job_metrics(update_data))
+        if "skills" in update_data:
+            update_data["skillIds"] = await skill_taxonomy.normalize(db, update_data["skills"])
         update_data["updatedAt"] = datetime.utcnow()
         
-        result = await db.jobs.update_one(
+        previous = await db.jobs.find_one_and_update(
             {"id": job_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
             )
         
-        # Get updated job
-        job_doc = await db.jobs.find_one({"id": job_id})
+        # Updated job: $set replaces whole top-level fields
+        job_doc = {**previous, **update_data}
+        await update_sector_job_counts(previous, job_doc)
+        job_search_index.add(job_doc)
+        suggestion_index.add_job(job_doc)
+        job_similarity_index.add(job_doc)
+        await index_sync.changed(db, "jobs")
+        await refresh_job_cards(db, {"id": job_id})
+        await response_cache.invalidate("jobs", f"jobs:{job_id}")
+        statistics_engine.request_refresh()
         job_response = await build_job_response(job_doc, db)
         
         logger.info(f"Job updated: {job_id}")
@@ -167,22 +410,32 @@ async def update_job(
 @router.delete("/{job_id}")
 async def delete_job(
     job_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Delete job (admin only)"""
     try:
-        result = await db.jobs.update_one(
+        previous = await db.jobs.find_one_and_update(
             {"id": job_id},
-            {"$set": {"isActive": False}}
+            {"$set": {"isActive": False}},
+            projection={"sector": 1, "isActive": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
             )
         
+        await update_sector_job_counts(previous, {**previous, "isActive": False})
+        job_search_index.remove(job_id)
+        suggestion_index.remove_job(job_id)
+        job_similarity_index.remove(job_id)
+        await index_sync.changed(db, "jobs")
+        await refresh_job_cards(db, {"id": job_id})
+        await response_cache.invalidate("jobs", f"jobs:{job_id}")
+        statistics_engine.request_refresh()
         logger.info(f"Job deleted: {job_id}")
         return {"status": "success", "message": "Job deleted successfully"}
         
@@ -195,31 +448,164 @@ async def delete_job(
             detail="Failed to delete job"
         )
 
-async def build_job_response(job_doc: dict, db) -> JobResponse:
-    """Build complete job response with associated data"""
-    # Get companies
-    companies = []
-    if job_doc.get("companies"):
-        async for company in db.companies.find({"id": {"$in": job_doc["companies"]}}):
-            companies.append(company)
-    
-    # Get training
-    training = []
-    if job_doc.get("training"):
-        async for t in db.training.find({"id": {"$in": job_doc["training"]}}):
-            training.append(t)
+async def update_sector_job_counts(previous: dict, current: dict):
+    """Apply the sector job count changes caused by a job update"""
+    before = previous["sector"] if previous.get("isActive") else None
+    after = current["sector"] if current.get("isActive") else None
+    if before != after:
+        await adjust_sector_job_count(before, -1)
+        await adjust_sector_job_count(after, 1)
+
+async def build_search_query(filters: JobSearchFilters, db) -> dict:
+    """Translate search filters into a jobs query"""
+    query = {"isActive": True}
+    if filters.sector:
+        query["sector"] = filters.sector
+    if filters.skills:
+        query["skillIds"] = {"$all": skill_taxonomy.resolve_all(filters.skills)}
+    if filters.education:
+        query["education"] = filters.education
+    # Salary ranges overlapping the requested range; a missing bound is open
+    # ("jusqu'à 3000€" has no salaryMin) as long as the other one is set
+    salary_clauses = []
+    if filters.salaryMin is not None:
+        salary_clauses.append({"$or": [
+            {"salaryMax": {"$gte": filters.salaryMin}},
+            {"salaryMax": None, "salaryMin": {"$ne": None}}
+        ]})
+    if filters.salaryMax is not None:
+        salary_clauses.append({"$or": [
+            {"salaryMin": {"$lte": filters.salaryMax}},
+            {"salaryMin": None, "salaryMax": {"$ne": None}}
+        ]})
+    if salary_clauses:
+        query["$and"] = salary_clauses
     
-    # Get testimonials
-    testimonials = []
-    if job_doc.get("testimonials"):
-        async for testimonial in db.testimonials.find({
-            "id": {"$in": job_doc["testimonials"]},
-            "isApproved": True
-        }):
-            testimonials.append(testimonial)
+    company_ids = None
+    if filters.company:
+        company_ids = [filters.company]
+    if filters.location:
+        located = await db.companies.distinct("id", {
+            "location": {"$regex": f"^{re.escape(filters.location)}", "$options": "i"},
+            "isActive": True
+        })
+        company_ids = [i for i in company_ids if i in located] if company_ids else located
+    if company_ids is not None:
+        query["companies"] = {"$in": company_ids}
     
-    job_doc["companies"] = companies
-    job_doc["training"] = training
-    job_doc["testimonials"] = testimonials
+    return query
+
+def facet_counts(groups: List[dict]) -> List[dict]:
+    return [{"value": str(group["_id"]), "count": group["count"]} for group in groups if group["_id"] is not None]
+
+def salary_bucket_label(lower) -> str:
+    if lower == "unknown":
+        return lower
+    index = SALARY_BUCKETS.index(lower)
+    if index + 1 < len(SALARY_BUCKETS):
+        return f"{lower}-{SALARY_BUCKETS[index + 1]}"
+    return f"{lower}+"
+
+async def find_jobs_by_ids(db, job_ids: List[str], projection: Optional[dict] = None) -> List[dict]:
+    """Fetch active jobs by ID, preserving the order of `job_ids`"""
+    if not job_ids:
+        return []
+    job_docs = {}
+    async for job_doc in db.jobs.find({"id": {"$in": job_ids}, "isActive": True}, projection):
+        job_docs[job_doc["id"]] = job_doc
+    return [job_docs[job_id] for job_id in job_ids if job_id in job_docs]
+
+async def search_jobs_by_text(
+    db,
+    query: dict,
+    search: str,
+    language: Language,
+    skip: int,
+    limit: int,
+    projection: Optional[dict] = None
+) -> List[dict]:
+    """Search jobs on the text index, most relevant first"""
+    text_query = {**query, "$text": {"$search": search, "$language": JOB_TEXT_LANGUAGE}}
+    score = {"$meta": "textScore"}
+    try:
+        return await db.jobs.find(text_query, {**(projection or {}), "score": score}).sort(
+            [("score", score), ("id", ASCENDING)]
+        ).skip(skip).limit(limit).to_list(None)
+    except OperationFailure as e:
+        # Text index missing (e.g. still building): fall back to a pattern match
+        logger.warning(f"Text search unavailable, falling back to pattern match: {e}")
     
-    return JobResponse(**job_doc)
\ No newline at end of file
+    pattern = {"$regex": re.escape(search), "$options": "i"}
+    regex_query = {
+        **query,
+        "$or": [
+            {f"title.{language.value}": pattern},
+            {f"description.{language.value}": pattern},
+            {"skills": pattern}
+        ]
+    }
+    return await db.jobs.find(regex_query, projection).sort(DEFAULT_SORT).skip(skip).limit(limit).to_list(None)
+
+async def build_job_response(job_doc: dict, db) -> JobResponse:
+    """Build complete job response with associated data"""
+    job_responses = await build_job_responses([job_doc], db)
+    return job_responses[0]
+
+async def build_job_responses(job_docs: List[dict], db) -> List[JobResponse]:
+    """Build job responses for a page of jobs with one query per related collection"""
+    await hydrate_job_relations(job_docs, db)
+    return [JobResponse(**job_doc) for job_doc in job_docs]
+
+def sparse_projection(
+    view: JobView,
+    fields: Optional[List[str]],
+    lang: Optional[Language],
+    extra: List[str] = ()
+) -> Optional[dict]:
+    """Database projection for a card or sparse view, None for full responses"""
+    if view == JobView.CARD:
+        return job_projection(CARD_FIELDS, lang or Language.FRENCH, extra)
+    if fields or lang:
+        return job_projection(fields or JOB_RESPONSE_FIELDS, lang, extra)
+    return None
+
+async def build_sparse_jobs(
+    job_docs: List[dict],
+    db,
+    view: JobView,
+    fields: Optional[List[str]],
+    lang: Optional[Language]
+) -> Optional[list]:
+    """Card or sparse representations of jobs, None when the full response is wanted"""
+    if view == JobView.CARD:
+        await hydrate_job_relations(job_docs, db, {"companies"}, CARD_COMPANY_PROJECTION)
+        return [job_card(job_doc, lang or Language.FRENCH) for job_doc in job_docs]
+    if fields or lang:
+        relations = RELATION_FIELDS.intersection(fields or RELATION_FIELDS)
+        await hydrate_job_relations(job_docs, db, relations, RELATION_PROJECTION)
+        return [sparse_job(job_doc, fields or JOB_RESPONSE_FIELDS, lang) for job_doc in job_docs]
+    return None
+
+def card_page_response(
+    cards: List[dict],
+    response: Response,
+    view: JobView,
+    fields: Optional[List[str]],
+    lang: Optional[Language]
+):
+    """Response for a page of job cards, relations already embedded"""
+    if view == JobView.CARD:
+        payload = [job_card(card, lang or Language.FRENCH) for card in cards]
+    elif fields or lang:
+        payload = [sparse_job(card, fields or JOB_RESPONSE_FIELDS, lang) for card in cards]
+    else:
+        return [JobResponse(**card) for card in cards]
+    return JSONResponse(jsonable_encoder(payload), headers=cursor_headers(response))
+
+def card_response(card: dict, view: JobView, fields: Optional[List[str]], lang: Optional[Language]):
+    """Response for a job read from its job card, relations already embedded"""
+    if view == JobView.CARD:
+        return JSONResponse(jsonable_encoder(job_card(card, lang or Language.FRENCH)))
+    if fields or lang:
+        return JSONResponse(jsonable_encoder(sparse_job(card, fields or JOB_RESPONSE_FIELDS, lang)))
+    return JobResponse(**card)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
+from models import Language
+from suggest_index import suggestion_index
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/suggest")
+async def suggest(
+    q: str,
+    language: Language = Language.FRENCH,
+    types: Optional[List[str]] = Query(None),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Autocomplete job titles, skills, companies and trainings (typo tolerant)"""
+    try:
+        if not suggestion_index.ready:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Suggestions are not available yet"
+            )
+        
+        suggestions = suggestion_index.suggest(q, language=language.value, types=types, limit=limit)
+        return {"query": q, "suggestions": suggestions}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Suggest error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get suggestions"
+        )
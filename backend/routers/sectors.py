@@ -1,25 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from models import Sector, SectorCreate, Language
-from auth import get_current_admin_user
-from database import get_database
+from auth import get_current_admin_principal
+from database import get_database, count_active_jobs
+from cache import cached, response_cache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sectors", tags=["sectors"])
 
 @router.get("/", response_model=List[Sector])
+@cached("sectors", "jobs")
 async def get_all_sectors(db = Depends(get_database)):
     """Get all active sectors"""
     try:
         sectors = []
         async for sector_doc in db.sectors.find({"isActive": True}):
-            # Update job count
-            job_count = await db.jobs.count_documents({
-                "sector": sector_doc["name"]["fr"],
-                "isActive": True
-            })
-            sector_doc["jobCount"] = job_count
             sectors.append(Sector(**sector_doc))
         
         return sectors
@@ -32,6 +28,7 @@ async def get_all_sectors(db = Depends(get_database)):
         )
 
 @router.get("/{sector_id}", response_model=Sector)
+@cached("sectors:{sector_id}", "jobs")
 async def get_sector_by_id(sector_id: str, db = Depends(get_database)):
     """Get sector by ID"""
     try:
@@ -42,13 +39,6 @@ async def get_sector_by_id(sector_id: str, db = Depends(get_database)):
                 detail="Sector not found"
             )
         
-        # Update job count
-        job_count = await db.jobs.count_documents({
-            "sector": sector_doc["name"]["fr"],
-            "isActive": True
-        })
-        sector_doc["jobCount"] = job_count
-        
         return Sector(**sector_doc)
         
     except HTTPException:
@@ -64,13 +54,15 @@ async def get_sector_by_id(sector_id: str, db = Depends(get_database)):
 @router.post("/", response_model=Sector)
 async def create_sector(
     sector_data: SectorCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Create new sector (admin only)"""
     try:
         sector = Sector(**sector_data.dict())
+        sector.jobCount = await count_active_jobs(sector.name.fr)
         await db.sectors.insert_one(sector.dict())
+        await response_cache.invalidate("sectors")
         
         logger.info(f"Sector created: {sector.id}")
         return sector
@@ -86,12 +78,13 @@ async def create_sector(
 async def update_sector(
     sector_id: str,
     sector_update: SectorCreate,  # Using SectorCreate as update model
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Update sector (admin only)"""
     try:
         update_data = sector_update.dict()
+        update_data["jobCount"] = await count_active_jobs(sector_update.name.fr)
         
         result = await db.sectors.update_one(
             {"id": sector_id},
@@ -106,6 +99,7 @@ async def update_sector(
         
         # Get updated sector
         sector_doc = await db.sectors.find_one({"id": sector_id})
+        await response_cache.invalidate("sectors", f"sectors:{sector_id}")
         
         logger.info(f"Sector updated: {sector_id}")
         return Sector(**sector_doc)
@@ -122,7 +116,7 @@ async def update_sector(
 @router.delete("/{sector_id}")
 async def delete_sector(
     sector_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Delete sector (admin only)"""
@@ -138,6 +132,7 @@ async def delete_sector(
                 detail="Sector not found"
             )
         
+        await response_cache.invalidate("sectors", f"sectors:{sector_id}")
         logger.info(f"Sector deleted: {sector_id}")
         return {"status": "success", "message": "Sector deleted successfully"}
         
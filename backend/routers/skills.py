@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status
+from typing import List
+from models import Skill, Language
+from skill_taxonomy import skill_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/skills", tags=["skills"])
+
+@router.get("/", response_model=List[Skill])
+async def get_all_skills():
+    """Get every skill in the taxonomy with its translations and synonyms"""
+    return sorted(skill_taxonomy.skills.values(), key=lambda skill: skill.id)
+
+@router.get("/resolve")
+async def resolve_skill(name: str, language: Language = Language.FRENCH):
+    """Resolve a skill name, translation or synonym to its canonical ID"""
+    skill_id = skill_taxonomy.resolve(name)
+    if skill_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill not found"
+        )
+    return {"name": name, "skillId": skill_id, "label": skill_taxonomy.label(skill_id, language)}
+
+@router.get("/{skill_id}", response_model=Skill)
+async def get_skill(skill_id: str):
+    """Get a skill by canonical ID"""
+    skill = skill_taxonomy.skills.get(skill_id)
+    if skill is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill not found"
+        )
+    return skill
@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from typing import List, Optional
 from models import Testimonial, TestimonialCreate
-from auth import get_current_admin_user, get_current_active_user
+from auth import get_current_admin_principal, get_current_principal
 from database import get_database
+from cache import cached, response_cache
+from stats_engine import statistics_engine
+from pagination import DEFAULT_SORT, find_page
+from job_cards import refresh_job_cards
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/testimonials", tags=["testimonials"])
 
 @router.get("/", response_model=List[Testimonial])
+@cached("testimonials")
 async def get_approved_testimonials(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     job_id: Optional[str] = None,
     db = Depends(get_database)
 ):
@@ -22,11 +29,17 @@ async def get_approved_testimonials(
             query["jobId"] = job_id
         
         testimonials = []
-        async for testimonial_doc in db.testimonials.find(query).skip(skip).limit(limit):
+        docs = await find_page(
+            db.testimonials, query, DEFAULT_SORT, limit,
+            skip=skip, cursor=cursor, response=response
+        )
+        for testimonial_doc in docs:
             testimonials.append(Testimonial(**testimonial_doc))
         
         return testimonials
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get testimonials error: {e}")
         raise HTTPException(
@@ -35,6 +48,7 @@ async def get_approved_testimonials(
         )
 
 @router.get("/job/{job_id}", response_model=List[Testimonial])
+@cached("testimonials")
 async def get_testimonials_by_job(job_id: str, db = Depends(get_database)):
     """Get approved testimonials for a specific job"""
     try:
@@ -57,7 +71,7 @@ async def get_testimonials_by_job(job_id: str, db = Depends(get_database)):
 @router.post("/", response_model=Testimonial)
 async def create_testimonial(
     testimonial_data: TestimonialCreate,
-    current_user = Depends(get_current_active_user),
+    current_user = Depends(get_current_principal),
     db = Depends(get_database)
 ):
     """Create new testimonial (requires approval)"""
@@ -88,7 +102,7 @@ async def create_testimonial(
 # Admin endpoints
 @router.get("/pending", response_model=List[Testimonial])
 async def get_pending_testimonials(
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Get testimonials pending approval (admin only)"""
@@ -109,7 +123,7 @@ async def get_pending_testimonials(
 @router.put("/{testimonial_id}/approve")
 async def approve_testimonial(
     testimonial_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Approve testimonial (admin only)"""
@@ -125,6 +139,9 @@ async def approve_testimonial(
                 detail="Testimonial not found"
             )
         
+        await refresh_job_cards(db, {"testimonials": testimonial_id})
+        await response_cache.invalidate("testimonials")
+        statistics_engine.request_refresh()
         logger.info(f"Testimonial approved: {testimonial_id}")
         return {"status": "success", "message": "Testimonial approved"}
         
@@ -140,7 +157,7 @@ async def approve_testimonial(
 @router.put("/{testimonial_id}/verify")
 async def verify_testimonial(
     testimonial_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Verify testimonial as authentic (admin only)"""
@@ -156,6 +173,8 @@ async def verify_testimonial(
                 detail="Testimonial not found"
             )
         
+        await refresh_job_cards(db, {"testimonials": testimonial_id})
+        await response_cache.invalidate("testimonials")
         logger.info(f"Testimonial verified: {testimonial_id}")
         return {"status": "success", "message": "Testimonial verified"}
         
@@ -171,7 +190,7 @@ async def verify_testimonial(
 @router.delete("/{testimonial_id}")
 async def delete_testimonial(
     testimonial_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Delete testimonial (admin only)"""
@@ -184,6 +203,9 @@ async def delete_testimonial(
                 detail="Testimonial not found"
             )
         
+        await refresh_job_cards(db, {"testimonials": testimonial_id})
+        await response_cache.invalidate("testimonials")
+        statistics_engine.request_refresh()
         logger.info(f"Testimonial deleted: {testimonial_id}")
         return {"status": "success", "message": "Testimonial deleted"}
         
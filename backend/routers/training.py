@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from typing import List, Optional
 from models import Training, TrainingCreate
-from auth import get_current_admin_user
+from auth import get_current_admin_principal
 from database import get_database
+from cache import cached, response_cache
+from suggest_index import suggestion_index
+from index_sync import index_sync
+from pagination import DEFAULT_SORT, find_page
+from job_cards import refresh_job_cards
+from skill_taxonomy import skill_taxonomy, skill_slug
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/training", tags=["training"])
 
 @router.get("/", response_model=List[Training])
+@cached("training")
 async def get_all_training(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     level: Optional[str] = None,
     provider: Optional[str] = None,
     db = Depends(get_database)
@@ -25,11 +34,17 @@ async def get_all_training(
             query["provider"] = {"$regex": provider, "$options": "i"}
         
         training_list = []
-        async for training_doc in db.training.find(query).skip(skip).limit(limit):
+        docs = await find_page(
+            db.training, query, DEFAULT_SORT, limit,
+            skip=skip, cursor=cursor, response=response
+        )
+        for training_doc in docs:
             training_list.append(Training(**training_doc))
         
         return training_list
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get training error: {e}")
         raise HTTPException(
@@ -38,6 +53,7 @@ async def get_all_training(
         )
 
 @router.get("/{training_id}", response_model=Training)
+@cached("training:{training_id}")
 async def get_training_by_id(training_id: str, db = Depends(get_database)):
     """Get training by ID"""
     try:
@@ -60,17 +76,17 @@ async def get_training_by_id(training_id: str, db = Depends(get_database)):
         )
 
 @router.get("/skills/{skill}")
+@cached("training")
 async def get_training_by_skill(skill: str, db = Depends(get_database)):
     """Get training programs that teach a specific skill"""
     try:
+        # Names, translations and synonyms resolve in memory to one indexed ID
+        skill_id = skill_taxonomy.resolve(skill) or skill_slug(skill)
         training_list = []
-        async for training_doc in db.training.find({
-            "skills": {"$regex": skill, "$options": "i"},
-            "isActive": True
-        }):
+        async for training_doc in db.training.find({"skillIds": skill_id, "isActive": True}):
             training_list.append(Training(**training_doc))
         
-        return {"skill": skill, "training": training_list}
+        return {"skill": skill, "skillId": skill_id, "training": training_list}
         
     except Exception as e:
         logger.error(f"Get training by skill error: {e}")
@@ -83,13 +99,17 @@ async def get_training_by_skill(skill: str, db = Depends(get_database)):
 @router.post("/", response_model=Training)
 async def create_training(
     training_data: TrainingCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Create new training program (admin only)"""
     try:
         training = Training(**training_data.dict())
+        training.skillIds = await skill_taxonomy.normalize(db, training.skills)
         await db.training.insert_one(training.dict())
+        suggestion_index.add_training(training.dict())
+        await index_sync.changed(db, "training")
+        await response_cache.invalidate("training")
         
         logger.info(f"Training created: {training.id}")
         return training
@@ -105,12 +125,13 @@ async def create_training(
 async def update_training(
     training_id: str,
     training_update: TrainingCreate,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Update training program (admin only)"""
     try:
         update_data = training_update.dict()
+        update_data["skillIds"] = await skill_taxonomy.normalize(db, update_data["skills"])
         
         result = await db.training.update_one(
             {"id": training_id},
@@ -125,6 +146,10 @@ async def update_training(
         
         # Get updated training
         training_doc = await db.training.find_one({"id": training_id})
+        suggestion_index.add_training(training_doc)
+        await index_sync.changed(db, "training")
+        await refresh_job_cards(db, {"training": training_id})
+        await response_cache.invalidate("training", f"training:{training_id}")
         
         logger.info(f"Training updated: {training_id}")
         return Training(**training_doc)
@@ -141,7 +166,7 @@ async def update_training(
 @router.delete("/{training_id}")
 async def delete_training(
     training_id: str,
-    admin_user = Depends(get_current_admin_user),
+    admin_user = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Delete training program (admin only)"""
@@ -157,6 +182,10 @@ async def delete_training(
                 detail="Training not found"
             )
         
+        suggestion_index.remove_training(training_id)
+        await index_sync.changed(db, "training")
+        await refresh_job_cards(db, {"training": training_id})
+        await response_cache.invalidate("training", f"training:{training_id}")
         logger.info(f"Training deleted: {training_id}")
         return {"status": "success", "message": "Training deleted successfully"}
         
@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from models import User, UserResponse, UserUpdate, UserProgress
-from auth import get_current_active_user, get_current_admin_user
-from database import get_database
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
+from pymongo.errors import DuplicateKeyError
+from models import User, UserResponse, UserUpdate, UserProgress, Principal, Favorite, RecommendedJob, JobView, Language
+from auth import get_current_active_user, get_current_principal, get_current_admin_principal, user_cache
+from database import get_database, get_favorite_job_ids
+from pagination import DEFAULT_SORT, NEXT_CURSOR_HEADER, find_page, cursor_headers
+from routers.jobs import find_jobs_by_ids, build_job_responses, sparse_projection
+from projections import job_card
+from job_cards import find_job_cards
+from recommendations import job_recommender, RECOMMENDATIONS_LIMIT
+from cache import response_cache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["users"])
 
+FAVORITE_SORT = [("createdAt", -1), ("jobId", -1)]
+
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_profile(
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_database)
+):
     """Get current user profile"""
-    return UserResponse(**current_user.dict())
+    favorite_jobs = await get_favorite_job_ids(db, current_user.id)
+    return UserResponse(**{**current_user.dict(), "favoriteJobs": favorite_jobs})
 
 @router.put("/me", response_model=UserResponse)
 async def update_current_user(
@@ -28,11 +41,15 @@ async def update_current_user(
                 {"id": current_user.id},
                 {"$set": update_data}
             )
+            await user_cache.invalidate(current_user.id)
+            if "field" in update_data:
+                await job_recommender.invalidate(db, current_user.id)
         
         # Get updated user
         updated_user = await db.users.find_one({"id": current_user.id})
         logger.info(f"User profile updated: {current_user.email}")
         
+        updated_user["favoriteJobs"] = await get_favorite_job_ids(db, current_user.id)
         return UserResponse(**updated_user)
         
     except Exception as e:
@@ -42,31 +59,70 @@ async def update_current_user(
             detail="Profile update failed"
         )
 
+@router.get("/me/recommendations", response_model=List[RecommendedJob])
+async def get_my_recommendations(
+    limit: int = Query(10, ge=1, le=RECOMMENDATIONS_LIMIT),
+    lang: Optional[Language] = None,
+    current_user: User = Depends(get_current_active_user),
+    db = Depends(get_database)
+):
+    """Get jobs recommended from the user's favorites and field of study"""
+    try:
+        recommendations = await job_recommender.get(db, current_user.id, current_user.field)
+        scores = {job["jobId"]: job["score"] for job in recommendations["jobs"][:limit]}
+        
+        # Job cards embed their companies, so the jobs take a single read
+        cards = await find_job_cards(db, list(scores), sparse_projection(JobView.CARD, None, lang))
+        return [
+            RecommendedJob(**job_card(card, lang or Language.FRENCH).dict(), score=scores[card["id"]])
+            for card in cards
+        ]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get recommendations error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get recommendations"
+        )
+
 @router.post("/favorites/{job_id}")
 async def toggle_favorite_job(
     job_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
     db = Depends(get_database)
 ):
     """Toggle job in user favorites"""
     try:
-        user_doc = await db.users.find_one({"id": current_user.id})
-        favorites = user_doc.get("favoriteJobs", [])
+        if not await db.jobs.find_one({"id": job_id, "isActive": True}, {"_id": 1}):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
         
-        if job_id in favorites:
-            favorites.remove(job_id)
-            action = "removed"
-        else:
-            favorites.append(job_id)
+        # The unique (userId, jobId) index makes the insert the atomic "add";
+        # a duplicate means the job is already a favorite and is removed instead
+        try:
+            await db.favorites.insert_one(Favorite(userId=current_user.id, jobId=job_id).dict())
             action = "added"
+            delta = 1
+        except DuplicateKeyError:
+            result = await db.favorites.delete_one({"userId": current_user.id, "jobId": job_id})
+            action = "removed"
+            delta = -result.deleted_count
         
-        await db.users.update_one(
-            {"id": current_user.id},
-            {"$set": {"favoriteJobs": favorites}}
-        )
+        if delta:
+            await db.jobs.update_one({"id": job_id}, {"$inc": {"favoriteCount": delta}})
+            await db.job_cards.update_one({"id": job_id}, {"$inc": {"favoriteCount": delta}})
+            await job_recommender.invalidate(db, current_user.id)
+            # Cached job lists and details carry favoriteCount
+            await response_cache.invalidate("jobs", f"jobs:{job_id}")
         
         return {"status": "success", "action": action, "job_id": job_id}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Toggle favorite error: {e}")
         raise HTTPException(
@@ -76,55 +132,27 @@ async def toggle_favorite_job(
 
 @router.get("/favorites")
 async def get_user_favorites(
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
     db = Depends(get_database)
 ):
-    """Get user's favorite jobs"""
+    """Get user's favorite jobs, most recently saved first"""
     try:
-        user_doc = await db.users.find_one({"id": current_user.id})
-        favorite_job_ids = user_doc.get("favoriteJobs", [])
-        
-        if not favorite_job_ids:
-            return {"favorites": []}
-        
-        # Get favorite jobs details
-        favorite_jobs = []
-        async for job in db.jobs.find({"id": {"$in": favorite_job_ids}, "isActive": True}):
-            # Get associated data
-            companies = []
-            if job.get("companies"):
-                async for company in db.companies.find({"id": {"$in": job["companies"]}}):
-                    # Convert ObjectId to string for serialization
-                    if "_id" in company:
-                        company["_id"] = str(company["_id"])
-                    companies.append(company)
-            
-            training = []
-            if job.get("training"):
-                async for t in db.training.find({"id": {"$in": job["training"]}}):
-                    # Convert ObjectId to string for serialization
-                    if "_id" in t:
-                        t["_id"] = str(t["_id"])
-                    training.append(t)
-            
-            testimonials = []
-            if job.get("testimonials"):
-                async for testimonial in db.testimonials.find({"id": {"$in": job["testimonials"]}}):
-                    # Convert ObjectId to string for serialization
-                    if "_id" in testimonial:
-                        testimonial["_id"] = str(testimonial["_id"])
-                    testimonials.append(testimonial)
-            
-            # Convert ObjectId to string for serialization
-            if "_id" in job:
-                job["_id"] = str(job["_id"])
-            job["companies"] = companies
-            job["training"] = training
-            job["testimonials"] = testimonials
-            favorite_jobs.append(job)
-        
-        return {"favorites": favorite_jobs}
+        favorites = await find_page(
+            db.favorites, {"userId": current_user.id}, FAVORITE_SORT, limit,
+            cursor=cursor, response=response, projection={"_id": 0, "jobId": 1, "createdAt": 1}
+        )
         
+        # One query for the jobs, one per related collection for the whole page
+        job_docs = await find_jobs_by_ids(db, [favorite["jobId"] for favorite in favorites])
+        favorite_jobs = await build_job_responses(job_docs, db)
+        
+        return {"favorites": favorite_jobs, "nextCursor": cursor_headers(response).get(NEXT_CURSOR_HEADER)}
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get favorites error: {e}")
         raise HTTPException(
@@ -132,10 +160,18 @@ async def get_user_favorites(
             detail="Failed to get favorites"
         )
 
+@router.get("/favorites/ids", response_model=List[str])
+async def get_user_favorite_ids(
+    current_user: Principal = Depends(get_current_principal),
+    db = Depends(get_database)
+):
+    """Get the IDs of all the user's favorite jobs"""
+    return await get_favorite_job_ids(db, current_user.id)
+
 @router.put("/progress")
 async def update_user_progress(
     progress: UserProgress,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
     db = Depends(get_database)
 ):
     """Update user progress"""
@@ -144,6 +180,7 @@ async def update_user_progress(
             {"id": current_user.id},
             {"$set": {"progress": progress.dict()}}
         )
+        await user_cache.invalidate(current_user.id)
         
         return {"status": "success", "progress": progress}
         
@@ -157,19 +194,27 @@ async def update_user_progress(
 # Admin endpoints
 @router.get("/", response_model=List[UserResponse])
 async def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    admin_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = None,
+    admin_user: Principal = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Get all users (admin only)"""
     try:
         users = []
-        async for user in db.users.find({}).skip(skip).limit(limit):
+        docs = await find_page(
+            db.users, {}, DEFAULT_SORT, limit,
+            skip=skip, cursor=cursor, response=response
+        )
+        for user in docs:
             users.append(UserResponse(**user))
         
         return users
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get users error: {e}")
         raise HTTPException(
@@ -179,7 +224,7 @@ async def get_all_users(
 
 @router.get("/stats")
 async def get_user_statistics(
-    admin_user: User = Depends(get_current_admin_user),
+    admin_user: Principal = Depends(get_current_admin_principal),
     db = Depends(get_database)
 ):
     """Get user statistics (admin only)"""
@@ -0,0 +1,269 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter
+import logging
+import math
+import re
+import unicodedata
+from models import Language
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = [lang.value for lang in Language]
+
+# Indexed job fields with their weight (how many times a token is counted)
+MULTILINGUAL_FIELDS = {
+    "title": 3,
+    "description": 1,
+    "requirements": 1,
+    "careerPath": 1,
+}
+SKILLS_WEIGHT = 2
+
+# Common function words per language; they carry no ranking signal
+STOP_WORDS = {
+    "fr": {"le", "la", "les", "de", "des", "du", "un", "une", "et", "ou", "en", "au", "aux",
+           "pour", "par", "sur", "dans", "avec", "sans", "ce", "ces", "son", "sa", "ses", "est"},
+    "en": {"the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "by", "at",
+           "is", "are", "as", "from", "its"},
+    "sw": {"na", "ya", "wa", "za", "kwa", "katika", "ni", "la", "cha", "vya"},
+    "ln": {"na", "ya", "mpo", "ba", "ezali", "oyo", "te"},
+    "kg": {"ye", "ya", "mu", "ba", "na", "kuna"},
+}
+ALL_STOP_WORDS = set().union(*STOP_WORDS.values())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so "Ingénieur" and "ingenieur" match"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into folded tokens, dropping stop words and single letters"""
+    if not text:
+        return []
+    return [
+        token for token in _TOKEN_RE.findall(fold(text))
+        if len(token) > 1 and token not in ALL_STOP_WORDS
+    ]
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Levenshtein distance, returning max_distance + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of a word, with a start marker so prefixes can be matched"""
+    padded = "$" + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """Trigram index over a vocabulary of folded words.
+
+    Expands a (possibly mistyped or partial) token into the vocabulary words
+    it most likely refers to, with a similarity in (0, 1].
+    """
+
+    def __init__(self):
+        self.grams: Dict[str, Set[str]] = {}
+        self.words: Set[str] = set()
+
+    def add(self, word: str):
+        if word in self.words:
+            return
+        self.words.add(word)
+        for gram in trigrams(word):
+            self.grams.setdefault(gram, set()).add(word)
+
+    def remove(self, word: str):
+        if word not in self.words:
+            return
+        self.words.discard(word)
+        for gram in trigrams(word):
+            words = self.grams.get(gram)
+            if words is None:
+                continue
+            words.discard(word)
+            if not words:
+                del self.grams[gram]
+
+    def expand(self, token: str, prefix: bool = False, limit: int = 5) -> List[Tuple[str, float]]:
+        """Vocabulary words matching `token` exactly, by prefix or within a few typos"""
+        if len(token) < 2:
+            return [(token, 1.0)] if token in self.words else []
+        token_grams = trigrams(token)
+        shared = Counter()
+        for gram in token_grams:
+            for word in self.grams.get(gram, ()):
+                shared[word] += 1
+
+        # One typo allowed for short words, two for longer ones
+        max_distance = 1 if len(token) <= 5 else 2
+        matches = []
+        for word, count in shared.items():
+            if word == token:
+                matches.append((word, 1.0))
+            elif prefix and count == len(token_grams) and word.startswith(token):
+                matches.append((word, 0.9 * len(token) / len(word) + 0.1))
+            elif count >= len(token_grams) - 3 * max_distance:
+                distance = edit_distance(token, word, max_distance)
+                if distance <= max_distance:
+                    matches.append((word, 1 - distance / max(len(token), len(word))))
+        matches.sort(key=lambda item: (-item[1], item[0]))
+        return matches[:limit]
+
+class JobSearchIndex:
+    """In-memory inverted index over active jobs ranked with BM25.
+
+    Candidate retrieval and ranking happen entirely in memory; callers only
+    go to MongoDB to hydrate the returned job IDs.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ready = False
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Counter] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_length = 0
+        self.sectors: Dict[str, str] = {}
+        self.skills: Dict[str, Set[str]] = {}
+        self.vocabulary = TrigramIndex()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def _analyze(self, job_doc: dict) -> Counter:
+        terms = Counter()
+        for field, weight in MULTILINGUAL_FIELDS.items():
+            texts = job_doc.get(field) or {}
+            for lang in LANGUAGES:
+                for token in tokenize(texts.get(lang)):
+                    terms[token] += weight
+        for skill in job_doc.get("skills") or []:
+            for token in tokenize(skill):
+                terms[token] += SKILLS_WEIGHT
+        return terms
+
+    def build(self, job_docs: Iterable[dict]):
+        """Rebuild the whole index from job documents"""
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.sectors = {}
+        self.skills = {}
+        self.vocabulary = TrigramIndex()
+        for job_doc in job_docs:
+            self.add(job_doc)
+        self.ready = True
+
+    def add(self, job_doc: dict):
+        """Index or re-index a job; inactive jobs are removed"""
+        job_id = job_doc["id"]
+        self.remove(job_id)
+        if not job_doc.get("isActive", True):
+            return
+
+        terms = self._analyze(job_doc)
+        for term, tf in terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                self.vocabulary.add(term)
+            self.postings[term][job_id] = tf
+        length = sum(terms.values())
+        self.doc_terms[job_id] = terms
+        self.doc_lengths[job_id] = length
+        self.total_length += length
+        self.sectors[job_id] = job_doc.get("sector")
+        self.skills[job_id] = set(job_doc.get("skillIds") or [])
+
+    def remove(self, job_id: str):
+        """Drop a job from the index"""
+        terms = self.doc_terms.pop(job_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(job_id, None)
+            if not posting:
+                del self.postings[term]
+                self.vocabulary.remove(term)
+        self.total_length -= self.doc_lengths.pop(job_id)
+        self.sectors.pop(job_id, None)
+        self.skills.pop(job_id, None)
+
+    def _matches(self, job_id: str, sector: Optional[str], skills: Optional[Set[str]]) -> bool:
+        if sector and self.sectors.get(job_id) != sector:
+            return False
+        if skills and not skills <= self.skills.get(job_id, set()):
+            return False
+        return True
+
+    def search(
+        self,
+        text: str,
+        sector: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fuzzy: bool = False
+    ) -> List[Tuple[str, float]]:
+        """Rank jobs matching any query term, returning (job_id, score) pairs.
+
+        `skills` are canonical skill IDs the job must all have. With `fuzzy`,
+        each query token is expanded to the indexed terms it could be a typo
+        or prefix of, weighted by similarity.
+        """
+        doc_count = len(self.doc_lengths)
+        if not doc_count:
+            return []
+        average_length = self.total_length / doc_count
+        required_skills = set(skills) if skills else None
+
+        query_terms: Dict[str, float] = {}
+        for token in set(tokenize(text)):
+            expansions = self.vocabulary.expand(token, prefix=True) if fuzzy else [(token, 1.0)]
+            for term, similarity in expansions:
+                query_terms[term] = max(query_terms.get(term, 0.0), similarity)
+
+        scores: Dict[str, float] = {}
+        for term, similarity in query_terms.items():
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = similarity * math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for job_id, tf in posting.items():
+                if not self._matches(job_id, sector, required_skills):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[job_id] / average_length)
+                scores[job_id] = scores.get(job_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[skip:skip + limit]
+
+    async def load(self, db):
+        """Build the index from every active job in the database"""
+        projection = {"_id": 0, "id": 1, "sector": 1, "skills": 1, "skillIds": 1, "isActive": 1}
+        projection.update({field: 1 for field in MULTILINGUAL_FIELDS})
+        job_docs = await db.jobs.find({"isActive": True}, projection).to_list(None)
+        self.build(job_docs)
+        logger.info(f"Job search index built with {len(self)} jobs")
+
+job_search_index = JobSearchIndex()
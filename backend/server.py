@@ -3,14 +3,33 @@ from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import os
 import logging
+import asyncio
 from pathlib import Path
 from contextlib import asynccontextmanager
 
+from pagination import NEXT_CURSOR_HEADER
+
 # Import database
-from database import connect_to_mongo, close_mongo_connection, init_sample_data
+from database import (
+    connect_to_mongo, close_mongo_connection, init_sample_data, get_database,
+    backfill_job_metrics, reconcile_sector_job_counts, reconcile_job_favorite_counts,
+    migrate_user_favorites
+)
+from background import PeriodicTask, background_tasks
+from index_sync import index_sync, INDEX_SYNC_INTERVAL
+from search_index import job_search_index
+from suggest_index import suggestion_index
+from stats_engine import statistics_engine
+from analytics_export import analytics_exporter
+from auth import password_hasher
+from activity import activity_tracker
+from job_cards import rebuild_job_cards
+from job_similarity import job_similarity_index
+from recommendations import job_recommender
+from skill_taxonomy import skill_taxonomy, backfill_skill_ids
 
 # Import routers
-from routers import auth, users, jobs, sectors, companies, training, testimonials, admin
+from routers import auth, users, jobs, sectors, companies, training, testimonials, admin, search, skills
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -22,14 +41,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SECTOR_RECONCILE_INTERVAL = int(os.getenv("SECTOR_RECONCILE_INTERVAL_SECONDS", "600"))
+FAVORITE_RECONCILE_INTERVAL = int(os.getenv("FAVORITE_RECONCILE_INTERVAL_SECONDS", "3600"))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", "10"))
+JOB_CARDS_REBUILD_INTERVAL = int(os.getenv("JOB_CARDS_REBUILD_INTERVAL_SECONDS", "3600"))
+RECOMMENDATIONS_REFRESH_INTERVAL = int(os.getenv("RECOMMENDATIONS_REFRESH_INTERVAL_SECONDS", "3600"))
+
+background_tasks.add(PeriodicTask("sector-job-counts", SECTOR_RECONCILE_INTERVAL, reconcile_sector_job_counts))
+background_tasks.add(PeriodicTask(
+    "job-favorite-counts", FAVORITE_RECONCILE_INTERVAL, reconcile_job_favorite_counts, run_at_start=True
+))
+background_tasks.add(PeriodicTask("user-activity", ACTIVITY_FLUSH_INTERVAL, activity_tracker.flush))
+# Builds the job cards at startup, then repairs any a concurrent write missed
+background_tasks.add(PeriodicTask("job-cards", JOB_CARDS_REBUILD_INTERVAL, rebuild_job_cards, run_at_start=True))
+# In-memory indexes rebuilt in every worker when another worker writes
+index_sync.register("job-search", ["jobs"], job_search_index.load)
+index_sync.register("suggestions", ["jobs", "companies", "training"], suggestion_index.load)
+index_sync.register("similar-jobs", ["jobs"], job_similarity_index.load)
+background_tasks.add(PeriodicTask("index-sync", INDEX_SYNC_INTERVAL, index_sync.sync))
+background_tasks.add(PeriodicTask(
+    "recommendations", RECOMMENDATIONS_REFRESH_INTERVAL, job_recommender.precompute_active_users, run_at_start=True
+))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
     await init_sample_data()
+    db = await get_database()
+    # Skill IDs must be in place before the in-memory indexes are built
+    await skill_taxonomy.load(db)
+    await backfill_skill_ids()
+    backfill = asyncio.create_task(backfill_job_metrics())
+    favorites_migration = asyncio.create_task(migrate_user_favorites())
+    await index_sync.load(db)
+    background_tasks.start()
+    statistics_engine.start()
     logger.info("Application started")
     yield
     # Shutdown
+    await statistics_engine.stop()
+    await analytics_exporter.stop()
+    await job_similarity_index.stop()
+    password_hasher.shutdown()
+    await background_tasks.stop()
+    # Write out activity recorded since the last periodic flush
+    await activity_tracker.flush()
+    backfill.cancel()
+    favorites_migration.cancel()
     await close_mongo_connection()
     logger.info("Application shutdown")
 
@@ -62,6 +121,8 @@ api_router.include_router(companies.router)
 api_router.include_router(training.router)
 api_router.include_router(testimonials.router)
 api_router.include_router(admin.router)
+api_router.include_router(search.router)
+api_router.include_router(skills.router)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -72,4 +133,5 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
@@ -0,0 +1,225 @@
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import logging
+import re
+import unicodedata
+from pymongo import UpdateOne
+from database import get_database
+from index_sync import index_sync
+from job_cards import refresh_job_cards
+from cache import response_cache
+from models import Skill, MultilingualText, Language
+from search_index import fold
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 500
+
+# Canonical ID -> (French, English, Swahili, Lingala, Kikongo names, synonyms)
+SKILL_SEED = {
+    "javascript": ("JavaScript", "JavaScript", "JavaScript", "JavaScript", "JavaScript", ["js", "ecmascript"]),
+    "python": ("Python", "Python", "Python", "Python", "Python", ["python3"]),
+    "react": ("React", "React", "React", "React", "React", ["reactjs", "react.js"]),
+    "nodejs": ("Node.js", "Node.js", "Node.js", "Node.js", "Node.js", ["node", "nodejs"]),
+    "mongodb": ("MongoDB", "MongoDB", "MongoDB", "MongoDB", "MongoDB", ["mongo"]),
+    "mobile-development": (
+        "Développement mobile", "Mobile development", "Uundaji wa programu za simu",
+        "Kosala ba application ya telefone", "Kusala ba application ya telefone",
+        ["développement d'applications mobiles", "mobile app development"]
+    ),
+    "database-management": (
+        "Gestion de base de données", "Database management", "Usimamizi wa hifadhidata",
+        "Kobatela ba base de données", "Kuyala ba base de données",
+        ["gestion des bases de données", "bases de données", "databases"]
+    ),
+    "tropical-diagnosis": (
+        "Diagnostic tropical", "Tropical diagnosis", "Utambuzi wa magonjwa ya kitropiki",
+        "Koyeba bokono ya tropique", "Kuzaba maladi ya tropique", []
+    ),
+    "epidemiology": (
+        "Épidémiologie", "Epidemiology", "Epidemiolojia",
+        "Boyekoli ya bokono oyo ezali kopalangana", "Dilongi ya maladi yina ke panzana", []
+    ),
+    "public-health": (
+        "Santé publique", "Public health", "Afya ya umma",
+        "Bokolongono ya bato nyonso", "Mavimpi ya bantu yonso", []
+    ),
+    "planning": ("Planification", "Planning", "Mipango", "Kobongisa misala", "Kuyidika bisalu", []),
+    "leadership": ("Leadership", "Leadership", "Uongozi", "Bokambi", "Kutwadisa bantu", []),
+    "risk-management": (
+        "Gestion des risques", "Risk management", "Usimamizi wa hatari",
+        "Bokambi ya makama", "Kuyala bigonsa", []
+    ),
+    "pedagogy": (
+        "Pédagogie", "Pedagogy", "Ualimu",
+        "Mayele ya koteya", "Mayele ya kulonga", ["enseignement", "teaching"]
+    ),
+    "linguistics": ("Linguistique", "Linguistics", "Isimu", "Boyekoli ya minoko", "Dilongi ya bandinga", []),
+    "didactics": ("Didactique", "Didactics", "Didaktiki", "Lolenge ya koteya", "Mutindu ya kulonga", []),
+    "clinical-diagnosis": (
+        "Diagnostic clinique", "Clinical diagnosis", "Utambuzi wa kliniki",
+        "Koyeba bokono na lopitalo", "Kuzaba maladi na lopitalo", []
+    ),
+    "emergency-medicine": (
+        "Médecine d'urgence", "Emergency medicine", "Tiba ya dharura",
+        "Minganga ya mbalakaka", "Munganga ya nsualu", ["urgences"]
+    ),
+    "tropical-medicine": (
+        "Médecine tropicale", "Tropical medicine", "Tiba ya kitropiki",
+        "Minganga ya bokono ya tropique", "Munganga ya maladi ya tropique", []
+    ),
+    "surgery": ("Chirurgie", "Surgery", "Upasuaji", "Kokata nzoto", "Kuzenga nitu", []),
+    "patient-care": (
+        "Soins aux patients", "Patient care", "Huduma kwa wagonjwa",
+        "Kobatela babeli", "Kusansa bambefo", ["soins infirmiers"]
+    ),
+}
+
+# Symbols that tell skills apart ("C++", "C#", ".NET") are spelled out
+# before the remaining punctuation turns into separators
+_SYMBOL_WORDS = [
+    (re.compile(r"\+"), " plus "),
+    (re.compile(r"#"), " sharp "),
+    (re.compile(r"\.(?=[a-z0-9])"), " dot "),
+]
+_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+def skill_key(name: str) -> str:
+    """Lookup key of a skill name: "Node.js" and "node.JS" share one, "C++" and "C#" do not.
+
+    Names with nothing left after folding (e.g. in a non-Latin script) get a
+    short hash of the name instead, so they stay distinct.
+    """
+    key = fold(name)
+    for pattern, word in _SYMBOL_WORDS:
+        key = pattern.sub(word, key)
+    key = _SEPARATOR_RE.sub(" ", key).strip()
+    if not key and name.strip():
+        digest = hashlib.sha1(unicodedata.normalize("NFKC", name).strip().casefold().encode()).hexdigest()
+        key = f"skill {digest[:10]}"
+    return key
+
+def skill_slug(name: str) -> str:
+    """Canonical ID for a skill that is not in the taxonomy yet"""
+    return skill_key(name).replace(" ", "-")
+
+class SkillTaxonomy:
+    """Canonical skill IDs with their translations and synonyms.
+
+    The skills collection is the source of truth; every worker keeps an
+    in-memory map from each known name, translation and synonym to its ID,
+    so resolving a free-text skill never queries the database.
+    """
+
+    def __init__(self):
+        self.skills: Dict[str, Skill] = {}
+        self.aliases: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _register(self, skill: Skill):
+        self.skills[skill.id] = skill
+        names = [skill.id] + [name for name in skill.name.dict().values() if name] + skill.synonyms
+        for name in names:
+            self.aliases.setdefault(skill_key(name), skill.id)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical ID of a skill name, translation or synonym"""
+        return self.aliases.get(skill_key(name))
+
+    def resolve_all(self, names: Iterable[str]) -> List[str]:
+        """Canonical IDs for skill filters; unknown names keep the ID they would get"""
+        skill_ids = []
+        for name in names:
+            skill_id = self.resolve(name) or skill_slug(name)
+            if skill_id and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        return skill_ids
+
+    async def normalize(self, db, names: Iterable[str]) -> List[str]:
+        """Canonical IDs of a document's skills, adding unknown skills to the taxonomy"""
+        skill_ids = []
+        for name in names or []:
+            skill_id = self.resolve(name)
+            if skill_id is None and skill_slug(name):
+                skill = Skill(id=skill_slug(name), name=MultilingualText(fr=name))
+                await db.skills.update_one({"id": skill.id}, {"$setOnInsert": skill.dict()}, upsert=True)
+                self._register(skill)
+                skill_id = skill.id
+            if skill_id and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        return skill_ids
+
+    def names(self, skill_id: str) -> List[str]:
+        """Every translation and synonym of a skill"""
+        skill = self.skills.get(skill_id)
+        if skill is None:
+            return [skill_id]
+        return [name for name in skill.name.dict().values() if name] + skill.synonyms
+
+    def label(self, skill_id: str, lang: Language = Language.FRENCH) -> str:
+        """Name of a skill in `lang`, falling back to French"""
+        skill = self.skills.get(skill_id)
+        if skill is None:
+            return skill_id
+        return getattr(skill.name, lang.value) or skill.name.fr
+
+    async def load(self, db):
+        """Seed the skills collection and load every skill into memory"""
+        operations = []
+        for skill_id, (fr, en, sw, ln, kg, synonyms) in SKILL_SEED.items():
+            skill_doc = Skill(
+                id=skill_id,
+                name=MultilingualText(fr=fr, en=en, sw=sw, ln=ln, kg=kg),
+                synonyms=synonyms
+            ).dict()
+            # Seeded names are refreshed so existing databases pick up new translations
+            name = skill_doc.pop("name")
+            operations.append(UpdateOne({"id": skill_id}, {"$set": {"name": name}, "$setOnInsert": skill_doc}, upsert=True))
+        await db.skills.bulk_write(operations, ordered=False)
+
+        self.skills = {}
+        self.aliases = {}
+        async for skill_doc in db.skills.find({}, {"_id": 0}):
+            self._register(Skill(**skill_doc))
+        logger.info(f"Skill taxonomy loaded with {len(self)} skills")
+
+skill_taxonomy = SkillTaxonomy()
+
+async def _write_skill_ids(db, collection, operations: List[UpdateOne], ids: List[str]):
+    await collection.bulk_write(operations, ordered=False)
+    # Job cards carry skillIds too; training has no read model
+    if collection.name == "jobs":
+        await refresh_job_cards(db, {"id": {"$in": ids}})
+
+async def backfill_skill_ids() -> int:
+    """Set skillIds on jobs and training written before skills were normalized"""
+    db = await get_database()
+    updated = 0
+    for collection in (db.jobs, db.training):
+        updated_before = updated
+        operations = []
+        ids = []
+        unnormalized = {"$or": [
+            {"skillIds": {"$exists": False}},
+            {"skillIds": [], "skills.0": {"$exists": True}}
+        ]}
+        async for doc in collection.find(unnormalized, {"_id": 1, "id": 1, "skills": 1}):
+            skill_ids = await skill_taxonomy.normalize(db, doc.get("skills") or [])
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"skillIds": skill_ids}}))
+            ids.append(doc["id"])
+            if len(operations) >= BACKFILL_BATCH_SIZE:
+                await _write_skill_ids(db, collection, operations, ids)
+                updated += len(operations)
+                operations = []
+                ids = []
+        if operations:
+            await _write_skill_ids(db, collection, operations, ids)
+            updated += len(operations)
+        if updated > updated_before:
+            await index_sync.changed(db, collection.name)
+            await response_cache.invalidate(collection.name)
+    if updated:
+        logger.info(f"Normalized skills of {updated} jobs and training programs")
+    return updated
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Optional
+import asyncio
+import logging
+import os
+from database import get_database, update_platform_statistics
+from stats_history import record_statistics_snapshot
+
+logger = logging.getLogger(__name__)
+
+class StatisticsEngine:
+    """Refresh the platform statistics snapshot in the background.
+
+    Writers call `request_refresh()`, which only flags the snapshot as stale.
+    The worker waits until requests have been quiet for `debounce` seconds
+    (but never longer than `max_delay` after the first one), so a burst of
+    writes costs a single recount. The snapshot is also refreshed every
+    `max_age` seconds so time-based figures like active users stay current.
+    """
+
+    def __init__(self, debounce: float = 2.0, max_delay: float = 30.0, max_age: float = 900.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_age = max_age
+        self.pending = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+        self.requests = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+
+    def request_refresh(self):
+        """Mark the snapshot stale; cheap enough to call from any write path"""
+        self.requests += 1
+        self.pending.set()
+
+    async def refresh(self) -> Optional[dict]:
+        """Recompute the snapshot now, sharing a refresh already in flight"""
+        if self.lock.locked():
+            async with self.lock:
+                return await self.read()
+        async with self.lock:
+            self.pending.clear()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            stats = await update_platform_statistics()
+            if stats is None:
+                self.failures += 1
+                return None
+            self.refreshes += 1
+            self.last_refresh = stats["lastUpdated"]
+            self.last_duration = round(loop.time() - started, 4)
+            try:
+                await record_statistics_snapshot(await get_database(), stats)
+            except Exception as e:
+                logger.error(f"Recording statistics history failed: {e}")
+            return stats
+
+    async def read(self) -> Optional[dict]:
+        """Stored snapshot, computing it if none exists yet"""
+        db = await get_database()
+        stats_doc = await db.statistics.find_one({"_id": "platform_stats"}, {"_id": 0})
+        if stats_doc is None:
+            stats_doc = await self.refresh()
+        return stats_doc
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self.pending.wait(), timeout=self.max_age)
+            except asyncio.TimeoutError:
+                pass
+            first_request = loop.time()
+            while self.pending.is_set() and loop.time() - first_request < self.max_delay:
+                self.pending.clear()
+                await asyncio.sleep(self.debounce)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Statistics refresh failed: {e}")
+
+    def start(self):
+        if self.task is None:
+            # Bind the primitives to the running loop
+            self.pending = asyncio.Event()
+            self.lock = asyncio.Lock()
+            self.task = asyncio.create_task(self._run(), name="platform-statistics")
+            logger.info("Started statistics engine")
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "pending": self.pending.is_set(),
+            "lastRefresh": self.last_refresh,
+            "lastDurationSeconds": self.last_duration,
+        }
+
+statistics_engine = StatisticsEngine(
+    debounce=float(os.getenv("STATISTICS_DEBOUNCE_SECONDS", "2")),
+    max_delay=float(os.getenv("STATISTICS_MAX_DELAY_SECONDS", "30")),
+    max_age=float(os.getenv("STATISTICS_MAX_AGE_SECONDS", "900")),
+)
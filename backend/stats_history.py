@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+import logging
+import os
+from models import StatisticsGranularity
+
+logger = logging.getLogger(__name__)
+
+HOUR = StatisticsGranularity.HOUR.value
+DAY = StatisticsGranularity.DAY.value
+MONTH = StatisticsGranularity.MONTH.value
+
+HOURLY_RETENTION = timedelta(days=int(os.getenv("STATISTICS_HOURLY_RETENTION_DAYS", "90")))
+MAX_HISTORY_POINTS = 1000
+
+# Point-in-time figures: a rollup keeps the latest value of its period
+GAUGES = ["totalJobs", "totalStudents", "totalCompanies", "successStories", "jobsBySector"]
+
+def naive_utc(moment: datetime) -> datetime:
+    """Naive UTC datetime, as stored in buckets; aware datetimes are converted"""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+def hour_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def day_start(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def month_start(moment: datetime) -> datetime:
+    return day_start(moment).replace(day=1)
+
+def next_month(moment: datetime) -> datetime:
+    return (month_start(moment) + timedelta(days=32)).replace(day=1)
+
+def bucket_start(granularity: StatisticsGranularity, moment: datetime) -> datetime:
+    return {HOUR: hour_start, DAY: day_start, MONTH: month_start}[granularity.value](moment)
+
+async def sector_job_counts(db) -> dict:
+    """Job count per active sector, as maintained on the sector documents"""
+    counts = {}
+    async for sector in db.sectors.find({"isActive": True}, {"_id": 0, "name.fr": 1, "jobCount": 1}):
+        counts[sector["name"]["fr"]] = sector.get("jobCount", 0)
+    return counts
+
+async def rollup(db, granularity: str, start: datetime, end: datetime, source: str):
+    """Aggregate the `source` buckets inside [start, end) into one `granularity` bucket"""
+    buckets = await db.statistics_history.find(
+        {"granularity": source, "bucket": {"$gte": start, "$lt": end}},
+        {"_id": 0}
+    ).sort("bucket", 1).to_list(None)
+    if not buckets:
+        return
+
+    latest = buckets[-1]
+    summary = {field: latest.get(field) for field in GAUGES}
+    summary.update({
+        "registrations": sum(bucket.get("registrations", 0) for bucket in buckets),
+        "activeUsers": max(bucket.get("activeUsers", 0) for bucket in buckets),
+        "samples": sum(bucket.get("samples", 0) for bucket in buckets),
+        "updatedAt": latest["updatedAt"],
+    })
+    await db.statistics_history.update_one(
+        {"granularity": granularity, "bucket": start},
+        {"$set": summary},
+        upsert=True
+    )
+
+async def record_statistics_snapshot(db, stats: dict):
+    """Store a statistics snapshot in its hourly bucket and refresh the day and month rollups.
+
+    Every snapshot touches at most two hours, two days and two months, so the
+    cost does not depend on how much history or how many users exist.
+    """
+    now = stats["lastUpdated"]
+    current_hour = hour_start(now)
+    previous_hour = current_hour - timedelta(hours=1)
+
+    await db.statistics_history.update_one(
+        {"granularity": HOUR, "bucket": current_hour},
+        {
+            "$set": {
+                "totalJobs": stats.get("totalJobs", 0),
+                "totalStudents": stats.get("totalStudents", 0),
+                "totalCompanies": stats.get("totalCompanies", 0),
+                "successStories": stats.get("successStories", 0),
+                "activeUsers": stats.get("activeUsers", 0),
+                "jobsBySector": await sector_job_counts(db),
+                "updatedAt": now,
+                "expireAt": current_hour + HOURLY_RETENTION,
+            },
+            "$inc": {"samples": 1},
+        },
+        upsert=True
+    )
+
+    # Registrations are recounted for the previous hour too, so sign-ups made
+    # after its last snapshot are not lost
+    for hour in (previous_hour, current_hour):
+        registrations = await db.users.count_documents({
+            "createdAt": {"$gte": hour, "$lt": hour + timedelta(hours=1)}
+        })
+        await db.statistics_history.update_one(
+            {"granularity": HOUR, "bucket": hour},
+            {"$set": {"registrations": registrations}}
+        )
+
+    for day in sorted({day_start(previous_hour), day_start(current_hour)}):
+        await rollup(db, DAY, day, day + timedelta(days=1), HOUR)
+    for month in sorted({month_start(previous_hour), month_start(current_hour)}):
+        await rollup(db, MONTH, month, next_month(month), DAY)
+
+async def get_statistics_history(
+    db,
+    granularity: StatisticsGranularity,
+    start: datetime,
+    end: datetime
+) -> List[dict]:
+    """Buckets of `granularity` starting within [start, end], oldest first"""
+    query = {
+        "granularity": granularity.value,
+        "bucket": {"$gte": bucket_start(granularity, start), "$lte": end}
+    }
+    projection = {"_id": 0, "expireAt": 0}
+    return await db.statistics_history.find(query, projection).sort("bucket", 1).to_list(MAX_HISTORY_POINTS)
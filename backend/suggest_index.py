@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+from search_index import TrigramIndex, fold, tokenize, LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+JOB = "job"
+SKILL = "skill"
+COMPANY = "company"
+TRAINING = "training"
+
+Key = Tuple[str, str]
+
+class SuggestionIndex:
+    """In-memory autocomplete over job titles, skills, company and training names.
+
+    Every label is split into folded words; words are looked up through a
+    trigram index so prefixes and typos ("comptabe", "ingenier") still match.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.labels: Dict[Key, Dict[str, str]] = {}
+        self.entry_words: Dict[Key, Set[str]] = {}
+        self.word_entries: Dict[str, Set[Key]] = {}
+        self.words = TrigramIndex()
+        # Skills are shared between jobs and trainings: track who references them
+        self.skill_refs: Dict[str, Set[Key]] = {}
+        self.owner_skills: Dict[Key, Set[str]] = {}
+
+    def _put(self, key: Key, labels: Dict[str, str]):
+        self._drop(key)
+        words = set()
+        for label in labels.values():
+            words.update(tokenize(label))
+        if not words:
+            return
+        self.labels[key] = labels
+        self.entry_words[key] = words
+        for word in words:
+            if word not in self.word_entries:
+                self.word_entries[word] = set()
+                self.words.add(word)
+            self.word_entries[word].add(key)
+
+    def _drop(self, key: Key):
+        self.labels.pop(key, None)
+        for word in self.entry_words.pop(key, ()):
+            entries = self.word_entries.get(word)
+            if entries is None:
+                continue
+            entries.discard(key)
+            if not entries:
+                del self.word_entries[word]
+                self.words.remove(word)
+
+    def _set_skills(self, owner: Key, skills: List[str]):
+        folded = {fold(skill): skill for skill in skills or []}
+        previous = self.owner_skills.pop(owner, set())
+        for skill in previous - folded.keys():
+            refs = self.skill_refs.get(skill)
+            if refs is None:
+                continue
+            refs.discard(owner)
+            if not refs:
+                del self.skill_refs[skill]
+                self._drop((SKILL, skill))
+        for skill, label in folded.items():
+            if skill not in self.skill_refs:
+                self.skill_refs[skill] = set()
+                self._put((SKILL, skill), {"fr": label})
+            self.skill_refs[skill].add(owner)
+        if folded:
+            self.owner_skills[owner] = set(folded)
+
+    def add_job(self, job_doc: dict):
+        key = (JOB, job_doc["id"])
+        if not job_doc.get("isActive", True):
+            self.remove_job(job_doc["id"])
+            return
+        title = job_doc.get("title") or {}
+        self._put(key, {lang: title[lang] for lang in LANGUAGES if title.get(lang)})
+        self._set_skills(key, job_doc.get("skills"))
+
+    def remove_job(self, job_id: str):
+        self._drop((JOB, job_id))
+        self._set_skills((JOB, job_id), [])
+
+    def add_company(self, company_doc: dict):
+        if not company_doc.get("isActive", True):
+            self.remove_company(company_doc["id"])
+            return
+        self._put((COMPANY, company_doc["id"]), {"fr": company_doc["name"]})
+
+    def remove_company(self, company_id: str):
+        self._drop((COMPANY, company_id))
+
+    def add_training(self, training_doc: dict):
+        key = (TRAINING, training_doc["id"])
+        if not training_doc.get("isActive", True):
+            self.remove_training(training_doc["id"])
+            return
+        name = training_doc.get("name") or {}
+        self._put(key, {lang: name[lang] for lang in LANGUAGES if name.get(lang)})
+        self._set_skills(key, training_doc.get("skills"))
+
+    def remove_training(self, training_id: str):
+        self._drop((TRAINING, training_id))
+        self._set_skills((TRAINING, training_id), [])
+
+    def suggest(
+        self,
+        text: str,
+        language: str = "fr",
+        types: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> List[dict]:
+        """Entries whose labels match every word typed so far, best first.
+
+        The last word is matched as a prefix since the user is still typing it.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+
+        scores: Optional[Dict[Key, float]] = None
+        for position, token in enumerate(tokens):
+            is_last = position == len(tokens) - 1
+            token_scores: Dict[Key, float] = {}
+            for word, similarity in self.words.expand(token, prefix=is_last, limit=20):
+                for key in self.word_entries.get(word, ()):
+                    if similarity > token_scores.get(key, 0.0):
+                        token_scores[key] = similarity
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {key: score + token_scores[key] for key, score in scores.items() if key in token_scores}
+            if not scores:
+                return []
+
+        results = []
+        for (kind, entry_id), score in scores.items():
+            if types and kind not in types:
+                continue
+            labels = self.labels[(kind, entry_id)]
+            label = labels.get(language) or labels.get("fr") or next(iter(labels.values()))
+            results.append({"type": kind, "id": entry_id, "label": label, "score": round(score, 4)})
+        results.sort(key=lambda item: (-item["score"], len(item["label"]), item["label"]))
+        return results[:limit]
+
+    async def load(self, db):
+        """Build the index from active jobs, companies and trainings"""
+        # Build into a fresh index so lookups keep working while loading
+        fresh = SuggestionIndex()
+        async for job_doc in db.jobs.find({"isActive": True}, {"_id": 0, "id": 1, "title": 1, "skills": 1}):
+            fresh.add_job(job_doc)
+        async for company_doc in db.companies.find({"isActive": True}, {"_id": 0, "id": 1, "name": 1}):
+            fresh.add_company(company_doc)
+        async for training_doc in db.training.find({"isActive": True}, {"_id": 0, "id": 1, "name": 1, "skills": 1}):
+            fresh.add_training(training_doc)
+        fresh.ready = True
+        self.__dict__.update(fresh.__dict__)
+        logger.info(f"Suggestion index built with {len(self.labels)} entries")
+
+suggestion_index = SuggestionIndex()
@@ -29,8 +29,8 @@ export const AuthProvider = ({ children }) => {
           
           // Load user's favorites
           try {
-            const favoritesData = await usersAPI.getFavorites();
-            setFavorites(favoritesData.favorites.map(job => job.id));
+            const favoriteIds = await usersAPI.getFavoriteIds();
+            setFavorites(favoriteIds);
           } catch (error) {
             console.error('Failed to load favorites:', error);
           }
@@ -59,8 +59,8 @@ export const AuthProvider = ({ children }) => {
         
         // Load user's favorites
         try {
-          const favoritesData = await usersAPI.getFavorites();
-          setFavorites(favoritesData.favorites.map(job => job.id));
+          const favoriteIds = await usersAPI.getFavoriteIds();
+          setFavorites(favoriteIds);
         } catch (error) {
           console.error('Failed to load favorites:', error);
         }
@@ -177,8 +177,8 @@ export const AuthProvider = ({ children }) => {
       localStorage.setItem('kongenga_user', JSON.stringify(userData));
       
       // Refresh favorites
-      const favoritesData = await usersAPI.getFavorites();
-      setFavorites(favoritesData.favorites.map(job => job.id));
+      const favoriteIds = await usersAPI.getFavoriteIds();
+      setFavorites(favoriteIds);
       
       return userData;
     } catch (error) {
@@ -69,8 +69,18 @@ export const usersAPI = {
     return response.data;
   },
   
-  getFavorites: async () => {
-    const response = await api.get('/users/favorites');
+  getFavorites: async (params = {}) => {
+    const response = await api.get('/users/favorites', { params });
+    return response.data;
+  },
+  
+  getFavoriteIds: async () => {
+    const response = await api.get('/users/favorites/ids');
+    return response.data;
+  },
+  
+  getRecommendations: async (params = {}) => {
+    const response = await api.get('/users/me/recommendations', { params });
     return response.data;
   },
   
@@ -293,13 +303,19 @@ export const adminAPI = {
     return response.data;
   },
   
-  exportUsers: async () => {
-    const response = await api.get('/admin/export/users');
+  exportUsers: async (format = 'csv') => {
+    const response = await api.get('/admin/export/users', {
+      params: { format },
+      responseType: 'blob'
+    });
     return response.data;
   },
   
-  exportJobs: async () => {
-    const response = await api.get('/admin/export/jobs');
+  exportJobs: async (format = 'csv') => {
+    const response = await api.get('/admin/export/jobs', {
+      params: { format },
+      responseType: 'blob'
+    });
     return response.data;
   },
 };
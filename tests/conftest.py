@@ -0,0 +1,290 @@
+import copy
+import os
+import re
+import sys
+from types import SimpleNamespace
+import pytest
+
+# Backend modules import each other by top-level name (e.g. "from models import ...")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
+
+def _get(doc: dict, path: str):
+    for part in path.split("."):
+        if isinstance(doc, list) and part.isdigit():
+            doc = doc[int(part)] if int(part) < len(doc) else None
+        elif isinstance(doc, dict):
+            doc = doc.get(part)
+        else:
+            return None
+    return doc
+
+def _compare(value, operator: str, operand, options: str = "") -> bool:
+    values = value if isinstance(value, list) else [value]
+    if operator == "$regex":
+        flags = re.IGNORECASE if "i" in options else 0
+        return any(isinstance(v, str) and re.search(operand, v, flags) for v in values)
+    if operator == "$exists":
+        return (value is not None) == operand
+    if operator == "$ne":
+        return value != operand and operand not in values
+    if operator == "$in":
+        return any(v in operand for v in values)
+    if operator == "$nin":
+        return not any(v in operand for v in values)
+    if operator == "$all":
+        return all(item in values for item in operand)
+    checks = {"$gt": lambda v: v > operand, "$gte": lambda v: v >= operand,
+              "$lt": lambda v: v < operand, "$lte": lambda v: v <= operand}
+    return any(v is not None and checks[operator](v) for v in values)
+
+def matches(doc: dict, query: dict) -> bool:
+    """Evaluate the subset of MongoDB query operators the backend uses"""
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif field == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+            value = _get(doc, field)
+            options = condition.get("$options", "")
+            if not all(
+                _compare(value, operator, operand, options)
+                for operator, operand in condition.items() if operator != "$options"
+            ):
+                return False
+        else:
+            value = _get(doc, field)
+            if value != condition and not (isinstance(value, list) and condition in value):
+                return False
+    return True
+
+def _set(doc: dict, path: str, value):
+    *parents, field = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[field] = value
+
+def _project(doc: dict, projection):
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    # Dotted fields keep their whole top-level field, which is enough for tests
+    included = {field.split(".")[0] for field, flag in projection.items() if flag and field != "_id"}
+    if included:
+        if projection.get("_id", 1):
+            included.add("_id")
+        return {field: value for field, value in doc.items() if field in included}
+    return {field: value for field, value in doc.items() if projection.get(field, 1)}
+
+def _sort_key(value):
+    # None sorts before everything, as in MongoDB
+    return (value is not None, value)
+
+class FakeCursor:
+    def __init__(self, docs, projection=None):
+        self.docs = docs
+        # Applied last: MongoDB sorts on fields the projection leaves out
+        self.projection = projection
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction or 1)] if isinstance(key, str) else list(key.items() if isinstance(key, dict) else key)
+        for field, order in reversed(keys):
+            self.docs.sort(key=lambda doc: _sort_key(_get(doc, field)), reverse=order == -1)
+        return self
+
+    def skip(self, count):
+        self.docs = self.docs[count:]
+        return self
+
+    def batch_size(self, count):
+        return self
+
+    def limit(self, count):
+        if count:
+            self.docs = self.docs[:count]
+        return self
+
+    def results(self) -> list:
+        return [_project(doc, self.projection) for doc in self.docs]
+
+    async def to_list(self, length=None):
+        results = self.results()
+        return results if length is None else results[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.results():
+            yield doc
+
+class FakeCollection:
+    """In-memory stand-in for a Motor collection, recording what is asked of it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.docs = []
+        self.unique = None
+        self.queries = []
+        self.pipelines = []
+        self.aggregate_result = []
+        self.operations = []
+
+    def find(self, query=None, projection=None):
+        query = query or {}
+        self.queries.append(query)
+        return FakeCursor([doc for doc in self.docs if matches(doc, query)], projection)
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        cursor = self.find(query, projection)
+        if sort:
+            cursor.sort(sort)
+        results = cursor.limit(1).results()
+        return results[0] if results else None
+
+    async def estimated_document_count(self):
+        return len(self.docs)
+
+    async def count_documents(self, query):
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    async def distinct(self, field, query=None):
+        values = []
+        for doc in self.docs:
+            if matches(doc, query or {}):
+                value = _get(doc, field)
+                for item in value if isinstance(value, list) else [value]:
+                    if item not in values:
+                        values.append(item)
+        return values
+
+    def aggregate(self, pipeline, **options):
+        self.pipelines.append(pipeline)
+        return FakeCursor(copy.deepcopy(self.aggregate_result))
+
+    async def insert_one(self, doc):
+        if self.unique and any(all(_get(doc, f) == _get(other, f) for f in self.unique) for other in self.docs):
+            raise DuplicateKeyError(f"duplicate key in {self.name}")
+        self.docs.append(copy.deepcopy(doc))
+        return SimpleNamespace(inserted_id=doc.get("_id"))
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            await self.insert_one(doc)
+
+    def _apply(self, doc: dict, update: dict, inserted: bool):
+        for field, value in update.get("$set", {}).items():
+            _set(doc, field, copy.deepcopy(value))
+        if inserted:
+            for field, value in update.get("$setOnInsert", {}).items():
+                doc.setdefault(field, copy.deepcopy(value))
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        for field, value in update.get("$max", {}).items():
+            doc[field] = value if doc.get(field) is None else max(doc[field], value)
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((doc for doc in self.docs if matches(doc, query)), None)
+        if doc is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+            doc = {field: value for field, value in query.items() if not field.startswith("$")}
+            self.docs.append(doc)
+            self._apply(doc, update, inserted=True)
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=True)
+        self._apply(doc, update, inserted=False)
+        return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None)
+
+    async def update_many(self, query, update):
+        matched = [doc for doc in self.docs if matches(doc, query)]
+        for doc in matched:
+            self._apply(doc, update, inserted=False)
+        return SimpleNamespace(matched_count=len(matched), modified_count=len(matched))
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False):
+        before = await self.find_one(query)
+        await self.update_one(query, update, upsert=upsert)
+        after = await self.find_one(query, projection)
+        return after if return_document else before
+
+    async def replace_one(self, query, doc, upsert=False):
+        remaining = [other for other in self.docs if not matches(other, query)]
+        if upsert or len(remaining) < len(self.docs):
+            self.docs = remaining + [copy.deepcopy(doc)]
+
+    async def delete_one(self, query):
+        for i, doc in enumerate(self.docs):
+            if matches(doc, query):
+                del self.docs[i]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+        for operation in operations:
+            document = operation._doc
+            if type(operation).__name__ == "ReplaceOne":
+                await self.replace_one(operation._filter, document, upsert=operation._upsert)
+            elif type(operation).__name__ == "UpdateOne":
+                await self.update_one(operation._filter, document, upsert=operation._upsert)
+            elif type(operation).__name__ == "InsertOne":
+                await self.insert_one(document)
+        return SimpleNamespace(modified_count=len(operations))
+
+class FakeDatabase:
+    """Collections are created on first access, like a MongoDB database"""
+
+    def __init__(self):
+        self.collections = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.collections.setdefault(name, FakeCollection(name))
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return getattr(self, name)
+
+@pytest.fixture
+def fake_db() -> FakeDatabase:
+    return FakeDatabase()
+
+@pytest.fixture
+def make_client():
+    """TestClient for one router, with the database and the caller overridden"""
+    from auth import get_current_active_user, get_current_principal, get_current_admin_principal
+    from database import get_database
+    from models import Principal, UserRole
+
+    def make(router, db, user_id: str = "user-1", role: UserRole = UserRole.STUDENT, user=None) -> TestClient:
+        principal = Principal(id=user.id if user else user_id, role=user.role if user else role)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_database] = lambda: db
+        app.dependency_overrides[get_current_principal] = lambda: principal
+        app.dependency_overrides[get_current_admin_principal] = lambda: principal
+        if user is not None:
+            app.dependency_overrides[get_current_active_user] = lambda: user
+        return TestClient(app)
+    return make
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache(monkeypatch):
+    """Cached endpoints must not answer one test with another test's response"""
+    from cache import MemoryCacheBackend, response_cache
+    monkeypatch.setattr(response_cache, "backend", MemoryCacheBackend())
@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime
+import pytest
+import activity
+from activity import ActivityTracker
+
+@pytest.fixture
+def tracker(fake_db, monkeypatch):
+    async def get_database():
+        return fake_db
+    monkeypatch.setattr(activity, "get_database", get_database)
+    return ActivityTracker()
+
+def test_flush_writes_the_latest_time_per_user_in_one_bulk_write(fake_db, tracker):
+    fake_db.users.docs = [{"id": "user-1", "lastActive": datetime(2026, 1, 5)}, {"id": "user-2"}]
+    tracker.record("user-1", datetime(2026, 1, 1))
+    tracker.record("user-2", datetime(2026, 1, 2))
+    tracker.record("user-2", datetime(2026, 1, 3))
+
+    asyncio.run(tracker.flush())
+
+    assert len(fake_db.users.operations) == 2
+    # Another worker already stored a later time for user-1: it is kept
+    assert [user["lastActive"] for user in fake_db.users.docs] == [datetime(2026, 1, 5), datetime(2026, 1, 3)]
+    assert tracker.stats() == {"recorded": 3, "pending": 0, "flushes": 1, "written": 2, "errors": 0}
+
+    asyncio.run(tracker.flush())
+    assert tracker.flushes == 1
+
+def test_failed_flush_keeps_the_newest_times_for_the_next_one(fake_db, tracker, monkeypatch):
+    async def bulk_write(operations, ordered=True):
+        # A request records a newer time for user-1 while the write is in flight
+        tracker.record("user-1", datetime(2026, 1, 9))
+        raise ConnectionError("primary stepped down")
+    monkeypatch.setattr(fake_db.users, "bulk_write", bulk_write)
+    tracker.record("user-1", datetime(2026, 1, 1))
+    tracker.record("user-2", datetime(2026, 1, 2))
+
+    asyncio.run(tracker.flush())
+
+    assert tracker.pending == {"user-1": datetime(2026, 1, 9), "user-2": datetime(2026, 1, 2)}
+    assert tracker.errors == 1 and tracker.written == 0
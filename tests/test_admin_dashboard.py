@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+import pytest
+from cache import SnapshotCache
+from models import UserRole
+from routers import admin
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    snapshot = SnapshotCache(ttl=60)
+    monkeypatch.setattr(admin, "dashboard_snapshot", snapshot)
+    return snapshot
+
+def test_dashboard_is_built_once_and_served_from_the_snapshot(fake_db, make_client, snapshot):
+    fake_db.jobs.docs = [
+        {"id": f"job-{i}", "isActive": True, "title": {"fr": f"Poste {i}"}, "sector": "Tech", "createdAt": datetime(2026, 1, i)}
+        for i in range(1, 8)
+    ]
+    fake_db.users.docs = [{"id": "user-1", "name": "Amani", "email": "a@example.com", "role": "student", "createdAt": datetime(2026, 1, 1)}]
+    fake_db.sectors.docs = [{"name": {"fr": "Tech"}, "jobCount": 7, "growth": "+10%", "isActive": True}]
+    client = make_client(admin.router, fake_db, role=UserRole.SITE_MANAGER)
+
+    dashboard = client.get("/admin/dashboard").json()
+    assert dashboard["totals"] == {"jobs": 7, "users": 1, "companies": 0, "pendingTestimonials": 0}
+    assert [job["id"] for job in dashboard["recentJobs"]] == ["job-7", "job-6", "job-5", "job-4", "job-3"]
+    assert dashboard["recentUsers"][0]["university"] == "N/A"
+    assert dashboard["sectorStats"] == [{"name": "Tech", "jobCount": 7, "growth": "+10%"}]
+
+    assert client.get("/admin/dashboard").json() == dashboard
+    assert len(fake_db.jobs.queries) == 1
+    assert snapshot.builds == 1 and snapshot.hits == 1
+
+    snapshot.invalidate()
+    client.get("/admin/dashboard")
+    assert snapshot.builds == 2
+
+def test_concurrent_callers_share_one_build(snapshot):
+    builds = []
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return {"build": len(builds)}
+    async def scenario():
+        return await asyncio.gather(*(snapshot.get(build) for _ in range(5)))
+    assert asyncio.run(scenario()) == [{"build": 1}] * 5
+    assert snapshot.joined == 4
+
+def test_failed_build_is_retried_by_the_next_caller(snapshot):
+    async def fail():
+        raise RuntimeError("database down")
+    async def build():
+        return {"ok": True}
+    with pytest.raises(RuntimeError):
+        asyncio.run(snapshot.get(fail))
+    assert asyncio.run(snapshot.get(build)) == {"ok": True}
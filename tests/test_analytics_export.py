@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime
+import pyarrow.parquet as pq
+import pytest
+import analytics_export
+from analytics_export import AnalyticsExporter, coerce, flat_columns
+from models import User, UserRole
+from routers import admin
+
+def test_columns_flatten_nested_and_multilingual_fields():
+    columns = {name: path for name, path, _ in flat_columns(User, {"password_hash"})}
+    assert "password_hash" not in columns
+    assert columns["progress_profileComplete"] == ("progress", "profileComplete")
+    job_columns = [name for name, _, _ in flat_columns(analytics_export.Job)]
+    assert {"title_fr", "title_en", "title_sw", "title_ln", "title_kg"} <= set(job_columns)
+
+def test_legacy_values_are_coerced_to_the_column_type():
+    assert coerce("42", int) == 42
+    assert coerce("n/a", int) is None
+    assert coerce("2026-01-01", datetime) is None
+    assert coerce(UserRole.STUDENT, str) == "student"
+    assert coerce(["a", 1], list[str]) == ["a", "1"]
+    assert coerce("a", list[str]) is None
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_export, "EXPORT_DIR", tmp_path)
+    monkeypatch.setattr(analytics_export, "CHUNK_SIZE", 2)
+    exporter = AnalyticsExporter()
+    monkeypatch.setattr(admin, "analytics_exporter", exporter)
+    yield exporter
+    asyncio.run(exporter.stop())
+
+def test_export_writes_one_parquet_file_per_collection(fake_db, make_client, exporter):
+    fake_db.users.docs = [
+        {"id": f"user-{i}", "name": f"User {i}", "email": f"u{i}@example.com", "password_hash": "secret",
+         "progress": {"profileComplete": str(10 * i)}, "createdAt": datetime(2026, 1, 1)}
+        for i in range(5)
+    ]
+    fake_db.jobs.docs = [{"id": "job-1", "title": {"fr": "Comptable", "en": "Accountant"}, "skills": ["Excel"]}]
+
+    async def run():
+        export_doc = await exporter.start(fake_db, "admin-1")
+        await asyncio.gather(*exporter.tasks.values())
+        return export_doc
+    export_doc = asyncio.run(run())
+
+    stored = fake_db.analytics_exports.docs[0]
+    assert stored["status"] == "completed"
+    assert stored["collections"]["users"]["rows"] == 5
+    assert stored["collections"]["testimonials"]["status"] == "completed"
+    assert stored["collections"]["testimonials"]["rows"] == 0
+
+    users = pq.read_table(exporter.file_path(export_doc["id"], "users")).to_pydict()
+    assert "password_hash" not in users
+    assert users["progress_profileComplete"] == [0, 10, 20, 30, 40]
+    jobs = pq.read_table(exporter.file_path(export_doc["id"], "jobs")).to_pydict()
+    assert jobs["title_en"] == ["Accountant"] and jobs["title_sw"] == [None]
+
+    client = make_client(admin.router, fake_db, role=UserRole.SITE_MANAGER)
+    response = client.get(f"/admin/analytics-exports/{export_doc['id']}/jobs.parquet")
+    assert response.status_code == 200
+    assert response.content.startswith(b"PAR1")
+    assert client.get(f"/admin/analytics-exports/{export_doc['id']}/sessions.parquet").status_code == 404
+
+def test_only_one_export_runs_at_a_time(fake_db, make_client, exporter):
+    async def run():
+        await exporter.start(fake_db, "admin-1")
+        with pytest.raises(Exception) as error:
+            await exporter.start(fake_db, "admin-1")
+        await asyncio.gather(*exporter.tasks.values())
+        return error.value
+    assert asyncio.run(run()).status_code == 409
+
+def test_old_export_files_are_expired(fake_db, exporter, monkeypatch):
+    monkeypatch.setattr(analytics_export, "KEEP_EXPORTS", 1)
+    async def run():
+        for _ in range(2):
+            await exporter.start(fake_db, "admin-1")
+            await asyncio.gather(*exporter.tasks.values())
+    asyncio.run(run())
+    first, second = fake_db.analytics_exports.docs
+    assert first["status"] == "expired" and second["status"] == "completed"
+    assert not exporter.file_path(first["id"], "users").exists()
+    assert exporter.file_path(second["id"], "users").exists()
@@ -0,0 +1,58 @@
+import asyncio
+from cache import MemoryCacheBackend, response_cache
+from routers import companies
+
+def company(company_id: str, name: str) -> dict:
+    return {"id": company_id, "name": name, "description": {"fr": "-"}, "location": "Kinshasa", "sector": "Tech", "isActive": True}
+
+def test_memory_backend_evicts_least_recently_used_and_expired_entries(monkeypatch):
+    backend = MemoryCacheBackend(max_entries=2)
+    async def scenario():
+        await backend.set("a", 1, ttl=60)
+        await backend.set("b", 2, ttl=60)
+        await backend.get("a")
+        await backend.set("c", 3, ttl=60)
+        assert [await backend.get(key) for key in "abc"] == [1, None, 3]
+        await backend.set("d", 4, ttl=-1)
+        assert await backend.get("d") is None
+    asyncio.run(scenario())
+
+def test_repeated_reads_are_served_from_the_cache(fake_db, make_client):
+    fake_db.companies.docs = [company("acme", "Acme")]
+    client = make_client(companies.router, fake_db)
+
+    first = client.get("/companies/", params={"limit": 10})
+    second = client.get("/companies/", params={"limit": 10})
+    assert first.json() == second.json()
+    assert len(fake_db.companies.queries) == 1
+
+    # Other query parameters are cached separately
+    client.get("/companies/", params={"limit": 5})
+    assert len(fake_db.companies.queries) == 2
+
+def test_invalidating_a_namespace_drops_dependent_responses(fake_db, make_client):
+    fake_db.companies.docs = [company("acme", "Acme"), company("other", "Other")]
+    client = make_client(companies.router, fake_db)
+    client.get("/companies/")
+    client.get("/companies/acme")
+    client.get("/companies/other")
+
+    fake_db.companies.docs[0]["name"] = "Acme SARL"
+    asyncio.run(response_cache.invalidate("companies", "companies:acme"))
+    assert sorted(item["name"] for item in client.get("/companies/").json()) == ["Acme SARL", "Other"]
+    assert client.get("/companies/acme").json()["name"] == "Acme SARL"
+    queries = len(fake_db.companies.queries)
+    client.get("/companies/other")
+    assert len(fake_db.companies.queries) == queries
+
+def test_cache_failures_fall_through_to_the_database(fake_db, make_client, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise ConnectionError("cache down")
+    monkeypatch.setattr(response_cache.backend, "get", broken)
+    monkeypatch.setattr(response_cache.backend, "set", broken)
+    monkeypatch.setattr(response_cache, "errors", 0)
+    fake_db.companies.docs = [company("acme", "Acme")]
+
+    response = make_client(companies.router, fake_db).get("/companies/acme")
+    assert response.status_code == 200
+    assert response_cache.errors == 2
@@ -0,0 +1,61 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+import exports
+from exports import JOB_EXPORT_FIELDS, JOB_EXPORT_PIPELINE, USER_EXPORT_FIELDS, USER_EXPORT_PIPELINE, stream_rows
+from models import ExportFormat, UserRole
+from routers import admin
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+def collect(chunks) -> list:
+    async def run():
+        return [chunk async for chunk in chunks]
+    return asyncio.run(run())
+
+def test_user_export_streams_csv_from_the_aggregation(fake_db, make_client):
+    fake_db.users.aggregate_result = [{
+        "id": "user-1", "name": "Mbala, Jean", "email": "j@example.com", "university": "UNIKIN",
+        "year": "L2", "field": "", "createdAt": datetime(2026, 1, 2, 3, 4), "favoriteJobsCount": 3,
+        "profileComplete": 80,
+    }]
+    response = make_client(admin.router, fake_db, role=UserRole.SITE_MANAGER).get("/admin/export/users")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"].startswith('attachment; filename="users-')
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == USER_EXPORT_FIELDS
+    assert rows[1] == ["user-1", "Mbala, Jean", "j@example.com", "UNIKIN", "L2", "", "2026-01-02T03:04:00", "3", "80"]
+    assert fake_db.users.pipelines == [USER_EXPORT_PIPELINE]
+
+def test_job_export_streams_ndjson(fake_db, make_client):
+    fake_db.jobs.aggregate_result = [{"id": "job-1", "title": "Ingénieur", "skillsCount": 2, "createdAt": datetime(2026, 1, 1)}]
+    response = make_client(admin.router, fake_db, role=UserRole.SITE_MANAGER).get(
+        "/admin/export/jobs", params={"format": "ndjson"}
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "Ingénieur" in response.text
+    row = json.loads(response.text.splitlines()[0])
+    assert list(row) == JOB_EXPORT_FIELDS
+    assert row["title"] == "Ingénieur" and row["sector"] is None and row["createdAt"] == "2026-01-01T00:00:00"
+    assert fake_db.jobs.pipelines == [JOB_EXPORT_PIPELINE]
+
+def test_rows_are_sent_one_batch_per_chunk(monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    docs = [{"id": str(i)} for i in range(5)]
+
+    chunks = collect(stream_rows(Cursor(docs), ["id"], ExportFormat.CSV))
+    # The header goes out before the first row is read
+    assert chunks == ["id\r\n", "0\r\n1\r\n", "2\r\n3\r\n", "4\r\n"]
+
+    chunks = collect(stream_rows(Cursor(docs[:2]), ["id"], ExportFormat.NDJSON))
+    assert chunks == ['{"id": "0"}\n{"id": "1"}\n']
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+import database
+from database import reconcile_job_favorite_counts
+from job_cards import job_card_status
+from routers import jobs
+
+@pytest.fixture
+def invalidated(fake_db, monkeypatch):
+    monkeypatch.setattr(database.database, "database", fake_db)
+    namespaces = []
+    async def invalidate(*names):
+        namespaces.extend(names)
+    monkeypatch.setattr(database.response_cache, "invalidate", invalidate)
+    return namespaces
+
+def test_reconcile_fixes_drifted_counts_on_jobs_and_cards(fake_db, invalidated):
+    fake_db.favorites.aggregate_result = [{"_id": "job-1", "count": 2}, {"_id": "job-3", "count": 1}]
+    fake_db.jobs.docs = [
+        {"_id": 1, "id": "job-1"},
+        {"_id": 2, "id": "job-2", "favoriteCount": 4},
+        {"_id": 3, "id": "job-3", "favoriteCount": 1},
+    ]
+    fake_db.job_cards.docs = [{"id": job["id"], "favoriteCount": job.get("favoriteCount")} for job in fake_db.jobs.docs]
+
+    assert asyncio.run(reconcile_job_favorite_counts()) == 2
+    expected = {"job-1": 2, "job-2": 0, "job-3": 1}
+    assert {job["id"]: job["favoriteCount"] for job in fake_db.jobs.docs} == expected
+    assert {card["id"]: card["favoriteCount"] for card in fake_db.job_cards.docs} == expected
+    assert invalidated == ["jobs"]
+
+    assert asyncio.run(reconcile_job_favorite_counts()) == 0
+    assert invalidated == ["jobs"]
+
+def test_popular_sort_orders_by_favorite_count(fake_db, make_client, monkeypatch):
+    monkeypatch.setattr(job_card_status, "ready", False)
+    fake_db.jobs.docs = [
+        {"id": job_id, "isActive": True, "title": {"fr": job_id}, "favoriteCount": count}
+        for job_id, count in (("job-1", 3), ("job-2", 0), ("job-3", 3), ("job-4", 7))
+    ]
+    response = make_client(jobs.router, fake_db).get("/jobs/", params={"sort": "popular", "fields": "favoriteCount"})
+    # Ties are broken by descending ID so keyset pages are stable
+    assert [job["id"] for job in response.json()] == ["job-4", "job-3", "job-1", "job-2"]
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime
+import database
+from cache import response_cache
+from recommendations import job_recommender
+from routers import users
+
+def test_missing_or_inactive_job_is_not_favorited(fake_db, make_client):
+    fake_db.jobs.docs = [{"id": "closed", "isActive": False, "favoriteCount": 0}]
+    client = make_client(users.router, fake_db)
+    for job_id in ("missing", "closed"):
+        response = client.post(f"/users/favorites/{job_id}")
+        assert response.status_code == 404
+    assert fake_db.favorites.docs == []
+    assert fake_db.jobs.docs[0]["favoriteCount"] == 0
+
+def test_toggle_updates_count_and_invalidates_job_caches(fake_db, make_client, monkeypatch):
+    invalidated = []
+    async def invalidate(*namespaces):
+        invalidated.append(namespaces)
+    monkeypatch.setattr(response_cache, "invalidate", invalidate)
+    monkeypatch.setattr(job_recommender, "invalidated", 0)
+
+    fake_db.favorites.unique = ["userId", "jobId"]
+    fake_db.jobs.docs = [{"id": "job-1", "isActive": True, "favoriteCount": 0}]
+    fake_db.job_cards.docs = [{"id": "job-1", "favoriteCount": 0}]
+    client = make_client(users.router, fake_db)
+
+    assert client.post("/users/favorites/job-1").json()["action"] == "added"
+    assert fake_db.jobs.docs[0]["favoriteCount"] == fake_db.job_cards.docs[0]["favoriteCount"] == 1
+    assert client.post("/users/favorites/job-1").json()["action"] == "removed"
+    assert fake_db.jobs.docs[0]["favoriteCount"] == fake_db.job_cards.docs[0]["favoriteCount"] == 0
+    assert invalidated == [("jobs", "jobs:job-1")] * 2
+
+def test_migration_moves_favorite_arrays_into_the_collection(fake_db, make_client, monkeypatch):
+    monkeypatch.setattr(database.database, "database", fake_db)
+    fake_db.favorites.docs = [{"userId": "user-1", "jobId": "job-1", "createdAt": datetime(2025, 1, 1)}]
+    fake_db.favorites.aggregate_result = [{"_id": "job-1", "count": 2}, {"_id": "job-2", "count": 1}]
+    fake_db.jobs.docs = [{"_id": 1, "id": "job-1"}, {"_id": 2, "id": "job-2"}]
+    fake_db.users.docs = [
+        {"id": "user-1", "favoriteJobs": ["job-1", "job-2"]},
+        {"id": "user-2", "favoriteJobs": ["job-1"]},
+        {"id": "user-3"},
+    ]
+
+    asyncio.run(database.migrate_user_favorites(batch_size=1))
+
+    assert all("favoriteJobs" not in user for user in fake_db.users.docs)
+    # Already migrated favorites keep their original time
+    assert sorted((f["userId"], f["jobId"]) for f in fake_db.favorites.docs) == [
+        ("user-1", "job-1"), ("user-1", "job-2"), ("user-2", "job-1")
+    ]
+    assert fake_db.favorites.docs[0]["createdAt"] == datetime(2025, 1, 1)
+    assert [job["favoriteCount"] for job in fake_db.jobs.docs] == [2, 1]
+
+    fake_db.users.docs = [{"id": "user-4", "favoriteJobs": ["job-1", "job-2"]}]
+    asyncio.run(database.migrate_user_favorites())
+    # The array order survives: the last entry is the most recently saved
+    ids = make_client(users.router, fake_db, user_id="user-4").get("/users/favorites/ids").json()
+    assert ids == ["job-2", "job-1"]
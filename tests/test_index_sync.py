@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+import index_sync as index_sync_module
+from index_sync import IndexSync
+
+def make_worker(loads: list) -> IndexSync:
+    worker = IndexSync()
+
+    async def load_jobs(db):
+        loads.append((worker, "job-search"))
+
+    async def load_suggestions(db):
+        loads.append((worker, "suggestions"))
+
+    worker.register("job-search", ["jobs"], load_jobs)
+    worker.register("suggestions", ["jobs", "companies"], load_suggestions)
+    return worker
+
+@pytest.fixture
+def workers(fake_db, monkeypatch):
+    async def get_database():
+        return fake_db
+    monkeypatch.setattr(index_sync_module, "get_database", get_database)
+    loads = []
+    first, second = make_worker(loads), make_worker(loads)
+    asyncio.run(first.load(fake_db))
+    asyncio.run(second.load(fake_db))
+    loads.clear()
+    return first, second, loads
+
+def test_other_workers_reload_after_a_write(fake_db, workers):
+    first, second, loads = workers
+    asyncio.run(first.changed(fake_db, "jobs"))
+
+    asyncio.run(first.sync())
+    asyncio.run(second.sync())
+    # The writer patched its own indexes; only the other worker reloads
+    assert loads == [(second, "job-search"), (second, "suggestions")]
+
+    loads.clear()
+    asyncio.run(second.sync())
+    assert loads == []
+
+def test_only_indexes_built_from_the_written_collection_reload(fake_db, workers):
+    first, second, loads = workers
+    asyncio.run(first.changed(fake_db, "companies"))
+    asyncio.run(second.sync())
+    assert loads == [(second, "suggestions")]
+
+def test_interleaved_writes_reload_the_writer_too(fake_db, workers):
+    first, second, loads = workers
+    asyncio.run(second.changed(fake_db, "jobs"))
+    asyncio.run(first.changed(fake_db, "jobs"))
+    asyncio.run(first.sync())
+    assert (first, "job-search") in loads
+
+def test_company_writes_bump_the_companies_version(fake_db, make_client):
+    from models import UserRole
+    from routers import companies
+    client = make_client(companies.router, fake_db, role=UserRole.SITE_MANAGER)
+    response = client.post("/companies/", json={
+        "name": "Acme", "description": {"fr": "Entreprise"}, "location": "Kinshasa", "sector": "Tech"
+    })
+    assert response.status_code == 200
+    company_id = response.json()["id"]
+    assert client.delete(f"/companies/{company_id}").status_code == 200
+    assert fake_db.index_versions.docs == [{"_id": "companies", "version": 2}]
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+import pytest
+import job_cards
+from job_cards import hydrate_job_relations, job_card_status, refresh_job_cards
+from models import UserRole
+from routers import companies, jobs
+
+def job_doc(job_id: str, **fields) -> dict:
+    doc = {
+        "id": job_id, "title": {"fr": f"Poste {job_id}", "en": f"Job {job_id}"}, "sector": "Tech",
+        "description": {"fr": "Description"}, "education": [], "salaryRange": "800$ - 2,500$/mois",
+        "hiringRate": "85%", "growthProjection": "+25%", "companies": ["acme"], "skills": ["Python"],
+        "skillIds": ["python"], "training": [], "testimonials": [], "requirements": {"fr": "-"},
+        "benefits": {"fr": "-"}, "workEnvironment": {"fr": "-"}, "careerPath": {"fr": "-"},
+        "isActive": True, "createdAt": datetime(2026, 1, int(job_id[-1])),
+    }
+    doc.update(fields)
+    return doc
+
+@pytest.fixture
+def cards_ready(monkeypatch):
+    monkeypatch.setattr(job_card_status, "ready", True)
+
+def test_job_list_pages_over_cards_in_one_read(fake_db, make_client, cards_ready):
+    company = {"id": "acme", "name": "Acme", "logo": None, "description": {"fr": "-"}, "location": "Kinshasa", "sector": "Tech"}
+    fake_db.job_cards.docs = [
+        {**job_doc("job-1"), "companies": [company]},
+        {**job_doc("job-2"), "companies": [company]},
+        {**job_doc("job-3", isActive=False), "companies": [company]},
+    ]
+    client = make_client(jobs.router, fake_db)
+
+    response = client.get("/jobs/", params={"view": "card", "lang": "en", "limit": 1, "sort": "newest"})
+    assert response.status_code == 200
+    assert [card["title"] for card in response.json()] == ["Job job-2"]
+    assert response.json()[0]["companies"] == [{"id": "acme", "name": "Acme", "logo": None}]
+    assert "x-next-cursor" in response.headers
+    assert fake_db.jobs.queries == [] and fake_db.companies.queries == []
+    assert len(fake_db.job_cards.queries) == 1
+
+    response = client.get("/jobs/", params={"cursor": response.headers["x-next-cursor"], "limit": 1})
+    assert [job["id"] for job in response.json()] == ["job-1"]
+    assert response.json()[0]["companies"][0]["name"] == "Acme"
+
+def test_job_list_reads_jobs_until_cards_are_built(fake_db, make_client, monkeypatch):
+    monkeypatch.setattr(job_card_status, "ready", False)
+    fake_db.jobs.docs = [job_doc("job-1")]
+    fake_db.companies.docs = [{"id": "acme", "name": "Acme", "description": {"fr": "-"}, "location": "Kinshasa", "sector": "Tech"}]
+    response = make_client(jobs.router, fake_db).get("/jobs/", params={"view": "card"})
+    assert [card["id"] for card in response.json()] == ["job-1"]
+    assert response.json()[0]["companies"][0]["name"] == "Acme"
+
+def test_cards_embed_relations_and_are_written_in_batches(fake_db, monkeypatch):
+    monkeypatch.setattr(job_cards, "CARD_BATCH_SIZE", 2)
+    fake_db.jobs.docs = [job_doc(f"job-{i}", testimonials=["t-1", "t-2"]) for i in range(1, 4)]
+    fake_db.companies.docs = [{"id": "acme", "name": "Acme"}]
+    fake_db.testimonials.docs = [{"id": "t-1", "isApproved": True}, {"id": "t-2", "isApproved": False}]
+
+    assert asyncio.run(refresh_job_cards(fake_db, {"isActive": True})) == 3
+
+    assert len(fake_db.job_cards.operations) == 3 and len(fake_db.companies.queries) == 2
+    card = fake_db.job_cards.docs[0]
+    assert card["companies"] == [{"id": "acme", "name": "Acme"}]
+    assert card["testimonials"] == [{"id": "t-1", "isApproved": True}]
+    # The jobs themselves keep their IDs
+    assert fake_db.jobs.docs[0]["companies"] == ["acme"]
+
+    assert asyncio.run(refresh_job_cards(fake_db, {"id": "job-1"})) == 1
+    assert len(fake_db.job_cards.docs) == 3
+
+def test_company_update_rewrites_the_cards_embedding_it(fake_db, make_client):
+    company = {"id": "acme", "name": "Acme", "description": {"fr": "-"}, "location": "Kinshasa", "sector": "Tech", "isActive": True}
+    fake_db.companies.docs = [company]
+    fake_db.jobs.docs = [job_doc("job-1"), job_doc("job-2", companies=[])]
+    asyncio.run(refresh_job_cards(fake_db, {}))
+
+    response = make_client(companies.router, fake_db, role=UserRole.SITE_MANAGER).put(
+        "/companies/acme", json={**company, "name": "Acme SARL"}
+    )
+    assert response.status_code == 200
+    cards = {card["id"]: card for card in fake_db.job_cards.docs}
+    assert cards["job-1"]["companies"][0]["name"] == "Acme SARL"
+    assert cards["job-2"]["companies"] == []
+
+def test_hydration_reads_cards_and_joins_jobs_without_one(fake_db):
+    fake_db.job_cards.docs = [{"id": "job-1", "companies": [{"id": "acme", "name": "Acme"}]}]
+    fake_db.companies.docs = [{"id": "acme", "name": "Acme"}]
+    job_docs = [job_doc("job-1"), job_doc("job-2")]
+
+    asyncio.run(hydrate_job_relations(job_docs, fake_db, {"companies"}))
+
+    assert [job["companies"] for job in job_docs] == [[{"id": "acme", "name": "Acme"}]] * 2
+    assert fake_db.companies.queries == [{"id": {"$in": ["acme"]}}]
+    assert job_docs[0]["training"] == []
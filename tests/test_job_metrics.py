@@ -0,0 +1,42 @@
+from job_metrics import parse_salary_range, USD_RATES
+
+def test_usd_salary_is_kept_as_is():
+    salary = parse_salary_range("800$ - 2,500$/mois")
+    assert salary["salaryCurrency"] == "USD"
+    assert (salary["salaryMin"], salary["salaryMax"]) == (800, 2500)
+    assert (salary["salaryMinOriginal"], salary["salaryMaxOriginal"]) == (800, 2500)
+
+def test_cdf_salary_is_converted_to_usd():
+    salary = parse_salary_range("1 500 000 - 3 000 000 FC/mois")
+    assert salary["salaryCurrency"] == "CDF"
+    assert salary["salaryMinOriginal"] == 1500000
+    assert salary["salaryMin"] == round(1500000 * USD_RATES["CDF"])
+    # Comparable with USD salaries rather than above all of them
+    assert salary["salaryMax"] < parse_salary_range("5000$/mois")["salaryMax"]
+
+def test_yearly_salary_is_converted_to_monthly():
+    salary = parse_salary_range("12 000 €/an")
+    assert salary["salaryMinOriginal"] == 1000
+    assert salary["salaryMin"] == round(1000 * USD_RATES["EUR"])
+
+def test_head_count_is_not_a_salary():
+    salary = parse_salary_range("800$ - 2,500$/mois (2 postes)")
+    assert (salary["salaryMin"], salary["salaryMax"]) == (800, 2500)
+
+def test_up_to_leaves_the_minimum_open():
+    salary = parse_salary_range("Jusqu'à 3000€")
+    assert salary["salaryMin"] is None
+    assert salary["salaryMax"] == round(3000 * USD_RATES["EUR"])
+    assert parse_salary_range("Up to 5k USD")["salaryMax"] == 5000
+
+def test_from_leaves_the_maximum_open():
+    salary = parse_salary_range("À partir de 800$/mois")
+    assert (salary["salaryMin"], salary["salaryMax"]) == (800, None)
+    assert (salary["salaryMinOriginal"], salary["salaryMaxOriginal"]) == (800, None)
+
+def test_range_with_one_currency_marker():
+    salary = parse_salary_range("entre 800 et 2500$ (3 postes)")
+    assert (salary["salaryMin"], salary["salaryMax"]) == (800, 2500)
+
+def test_numbers_without_currency_or_range_are_ignored():
+    assert parse_salary_range("Négociable, 2 postes")["salaryMin"] is None
@@ -0,0 +1,41 @@
+import asyncio
+from models import JobSearchFilters, MultilingualText, Skill
+from routers import jobs
+from routers.jobs import build_search_query
+from skill_taxonomy import skill_taxonomy
+
+def salary_query(**filters) -> dict:
+    return asyncio.run(build_search_query(JobSearchFilters(**filters), None))
+
+def test_salary_filters_treat_missing_bounds_as_open(fake_db):
+    fake_db.jobs.docs = [
+        {"id": "up-to", "isActive": True, "salaryMin": None, "salaryMax": 3240},
+        {"id": "from", "isActive": True, "salaryMin": 800, "salaryMax": None},
+        {"id": "unknown", "isActive": True, "salaryMin": None, "salaryMax": None},
+    ]
+
+    def found(**filters):
+        return {job["id"] for job in fake_db.jobs.find(salary_query(**filters)).docs}
+
+    assert found(salaryMax=1000) == {"up-to", "from"}
+    assert found(salaryMax=500) == {"up-to"}
+    assert found(salaryMin=4000) == {"from"}
+    assert found(salaryMin=0, salaryMax=10000) == {"up-to", "from"}
+
+def test_skill_facet_groups_canonical_ids_with_labels(fake_db, make_client, monkeypatch):
+    fake_db.jobs.aggregate_result = [{
+        "jobs": [], "total": [{"count": 2}], "sectors": [], "education": [], "salary": [],
+        "skills": [{"_id": "public-health", "count": 2}, {"_id": "python", "count": 1}],
+    }]
+    monkeypatch.setattr(skill_taxonomy, "skills", {})
+    monkeypatch.setattr(skill_taxonomy, "aliases", {})
+    skill_taxonomy._register(Skill(id="public-health", name=MultilingualText(fr="Santé publique", en="Public health")))
+
+    response = make_client(jobs.router, fake_db).get("/jobs/search", params={"language": "en", "sector": "Santé"})
+    assert response.status_code == 200
+    facet = fake_db.jobs.pipelines[0][1]["$facet"]["skills"]
+    assert facet[:2] == [{"$unwind": "$skillIds"}, {"$group": {"_id": "$skillIds", "count": {"$sum": 1}}}]
+    assert response.json()["facets"]["skills"] == [
+        {"value": "public-health", "count": 2, "label": "Public health"},
+        {"value": "python", "count": 1, "label": "python"},
+    ]
@@ -0,0 +1,71 @@
+import asyncio
+import numpy as np
+import pytest
+import job_similarity
+from job_similarity import dense_rows, top_k_neighbours
+
+def random_csr(rows: int, dimensions: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    indptr = [0]
+    columns = []
+    for row in range(rows):
+        # Some rows have no features at all
+        count = 0 if row % 7 == 3 else rng.integers(1, 6)
+        columns.extend(sorted(rng.choice(dimensions, size=count, replace=False)))
+        indptr.append(len(columns))
+    values = rng.uniform(0.5, 2.0, size=len(columns)).astype(np.float32)
+    return np.array(indptr, dtype=np.int64), np.array(columns, dtype=np.int64), values
+
+def test_dense_rows_expands_only_the_requested_rows():
+    indptr, columns, values = random_csr(10, 8)
+    block = dense_rows(indptr, columns, values, 4, 7, 8)
+    assert block.shape == (3, 8)
+    for i, row in enumerate(range(4, 7)):
+        expected = np.zeros(8, dtype=np.float32)
+        expected[columns[indptr[row]:indptr[row + 1]]] = values[indptr[row]:indptr[row + 1]]
+        assert np.array_equal(block[i], expected)
+
+@pytest.mark.parametrize("block_rows", [4, 7, 512])
+def test_blocked_similarities_match_dense_cosine(monkeypatch, block_rows):
+    monkeypatch.setattr(job_similarity, "BLOCK_ROWS", block_rows)
+    rows, dimensions, k = 30, 12, 5
+    indptr, columns, values = random_csr(rows, dimensions)
+
+    matrix = dense_rows(indptr, columns, values, 0, rows, dimensions)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    expected = (matrix / norms) @ (matrix / norms).T
+    np.fill_diagonal(expected, -1)
+
+    neighbours, scores = top_k_neighbours(indptr, columns, values, dimensions, k)
+    assert neighbours.shape == scores.shape == (rows, k)
+    assert np.allclose(scores, -np.sort(-expected, axis=1)[:, :k], atol=1e-5)
+    assert np.allclose(np.take_along_axis(expected, neighbours.astype(np.int64), axis=1), scores, atol=1e-5)
+    assert not (neighbours == np.arange(rows)[:, None]).any()
+
+def test_single_row_has_no_neighbours():
+    indptr, columns, values = random_csr(1, 8)
+    neighbours, scores = top_k_neighbours(indptr, columns, values, 8, 5)
+    assert neighbours.shape == scores.shape == (1, 0)
+
+def test_reload_picks_up_jobs_written_by_another_worker(fake_db):
+    fake_db.jobs.docs = [
+        {"id": "a", "isActive": True, "skillIds": ["python", "react"], "sector": "Tech"},
+        {"id": "b", "isActive": True, "skillIds": ["python"], "sector": "Tech"},
+    ]
+    index = job_similarity.JobSimilarityIndex(k=5)
+
+    async def scenario():
+        await index.load(fake_db)
+        before = index.similar("a")
+        # Another worker deactivates b and adds c
+        fake_db.jobs.docs[1]["isActive"] = False
+        fake_db.jobs.docs.append({"id": "c", "isActive": True, "skillIds": ["react"], "sector": "Tech"})
+        await index.load(fake_db)
+        after = index.similar("a")
+        await index.stop()
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert [job_id for job_id, _ in before] == ["b"]
+    assert [job_id for job_id, _ in after] == ["c"]
@@ -0,0 +1,38 @@
+from datetime import datetime
+import base64
+import json
+import pytest
+from fastapi import HTTPException
+from pagination import DEFAULT_SORT, encode_cursor, decode_cursor, keyset_filter
+
+def make_cursor(values) -> str:
+    payload = json.dumps({"k": [field for field, _ in DEFAULT_SORT], "v": values})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def test_cursor_round_trip():
+    created = datetime(2026, 1, 2, 3, 4, 5)
+    cursor = encode_cursor({"createdAt": created, "id": "job-1"}, DEFAULT_SORT)
+    assert decode_cursor(cursor, DEFAULT_SORT) == [created, "job-1"]
+
+def test_cursor_continues_after_values():
+    created = datetime(2026, 1, 2)
+    query = keyset_filter(DEFAULT_SORT, [created, "job-1"])
+    tie_break = {"$and": [{"createdAt": created}, {"$or": [{"id": {"$lt": "job-1"}}, {"id": None}]}]}
+    assert tie_break in query["$or"]
+
+@pytest.mark.parametrize("values", [
+    [{"$ne": None}, "job-1"],
+    [{"$date": "2026-01-02T00:00:00"}, {"$gt": ""}],
+    [{"$date": "2026-01-02T00:00:00", "$where": "1"}, "job-1"],
+    [["job-1"], "job-1"],
+    ["job-1"],
+])
+def test_tampered_cursor_is_rejected(values):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(make_cursor(values), DEFAULT_SORT)
+    assert error.value.status_code == 400
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor({"salaryMin": 800, "id": "job-1"}, [("salaryMin", -1), ("id", -1)])
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, DEFAULT_SORT)
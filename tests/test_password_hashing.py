@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+import auth
+from auth import PasswordHasher, authenticate_user
+
+@pytest.fixture
+def fast_bcrypt(monkeypatch):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4, bcrypt__min_rounds=4, bcrypt__max_rounds=4)
+    monkeypatch.setattr(auth, "pwd_context", context)
+    return context
+
+def test_hashing_runs_on_at_most_workers_threads_without_blocking_the_loop():
+    hasher = PasswordHasher(workers=2, max_pending=10)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+    def slow_hash():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return threading.current_thread().name
+
+    async def scenario():
+        ticks = 0
+        hashes = asyncio.gather(*(hasher._run(slow_hash) for _ in range(6)))
+        while not hashes.done():
+            ticks += 1
+            await asyncio.sleep(0.005)
+        return await hashes, ticks
+
+    threads, ticks = asyncio.run(scenario())
+    hasher.shutdown()
+    assert peak[0] == 2
+    assert all(name.startswith("bcrypt") for name in threads)
+    assert ticks > 1
+    assert hasher.stats()["completed"] == 6 and hasher.stats()["peakPending"] == 6
+
+def test_calls_beyond_max_pending_are_rejected():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+
+    async def scenario():
+        results = await asyncio.gather(*(hasher._run(time.sleep, 0.01) for _ in range(3)), return_exceptions=True)
+        return results
+
+    results = asyncio.run(scenario())
+    hasher.shutdown()
+    error = results[2]
+    assert isinstance(error, HTTPException) and error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert hasher.rejected == 1 and hasher.pending == 0
+
+def test_login_rehashes_passwords_stored_with_another_cost(fake_db, fast_bcrypt, monkeypatch):
+    hasher = PasswordHasher(workers=1, max_pending=10)
+    monkeypatch.setattr(auth, "password_hasher", hasher)
+    invalidated = []
+    async def invalidate(user_id):
+        invalidated.append(user_id)
+    monkeypatch.setattr(auth.user_cache, "invalidate", invalidate)
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=5).hash("secret")
+    fake_db.users.docs = [{"id": "user-1", "name": "Amani", "email": "a@example.com", "password_hash": old_hash}]
+
+    assert asyncio.run(authenticate_user("a@example.com", "wrong", fake_db)) is False
+    assert fake_db.users.docs[0]["password_hash"] == old_hash
+
+    user = asyncio.run(authenticate_user("a@example.com", "secret", fake_db))
+    hasher.shutdown()
+    new_hash = fake_db.users.docs[0]["password_hash"]
+    assert user.id == "user-1"
+    assert new_hash.startswith("$2b$04$") and fast_bcrypt.verify("secret", new_hash)
+    assert invalidated == ["user-1"] and hasher.rehashed == 1
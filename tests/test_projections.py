@@ -0,0 +1,59 @@
+import pytest
+from fastapi import HTTPException
+from job_cards import job_card_status
+from models import Language
+from projections import job_projection, parse_fields, resolve_language, sparse_job
+from routers import jobs
+
+def test_parse_fields_prepends_id_and_rejects_unknown_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" title, sector ,") == ["id", "title", "sector"]
+    with pytest.raises(HTTPException) as error:
+        parse_fields("title,password")
+    assert error.value.status_code == 400
+    assert "password" in error.value.detail
+
+def test_projection_reads_only_the_requested_language_and_french():
+    assert job_projection(["id", "title", "sector"], Language.ENGLISH, extra=["createdAt"]) == {
+        "_id": 0, "id": 1, "title.en": 1, "title.fr": 1, "sector": 1, "createdAt": 1,
+    }
+    assert job_projection(["title"]) == {"_id": 0, "title": 1}
+
+def test_language_resolution_falls_back_to_french():
+    job = {
+        "id": "job-1",
+        "title": {"fr": "Comptable", "en": "Accountant"},
+        "careerPath": {"fr": "Chef comptable", "en": ""},
+        "companies": [{"name": "Acme", "description": {"fr": "Banque"}}],
+    }
+    assert sparse_job(job, ["id", "title", "careerPath", "companies"], Language.ENGLISH) == {
+        "id": "job-1",
+        "title": "Accountant",
+        "careerPath": "Chef comptable",
+        "companies": [{"name": "Acme", "description": "Banque"}],
+    }
+    # Plain dicts that are not multilingual text are left alone
+    assert resolve_language({"fr": "x", "count": 1}, Language.ENGLISH) == {"fr": "x", "count": 1}
+
+def test_sparse_job_list_reads_only_the_requested_fields(fake_db, make_client, monkeypatch):
+    monkeypatch.setattr(job_card_status, "ready", False)
+    fake_db.jobs.docs = [{
+        "id": "job-1", "isActive": True, "title": {"fr": "Comptable", "en": "Accountant"},
+        "description": {"fr": "Tenir les comptes"}, "sector": "Finance", "companies": ["acme"],
+    }]
+    projections = []
+    find = fake_db.jobs.find
+    def find_recording_projection(query, projection=None):
+        projections.append(projection)
+        return find(query, projection)
+    monkeypatch.setattr(fake_db.jobs, "find", find_recording_projection)
+    client = make_client(jobs.router, fake_db)
+
+    response = client.get("/jobs/", params={"fields": "title,sector", "lang": "en"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": "job-1", "title": "Accountant", "sector": "Finance"}]
+    # Sort keys are read too, for the cursor
+    assert set(projections[0]) == {"_id", "id", "title.en", "title.fr", "sector", "createdAt"}
+    assert fake_db.companies.queries == []
+
+    assert client.get("/jobs/", params={"fields": "title,salary"}).status_code == 400
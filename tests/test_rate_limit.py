@@ -0,0 +1,29 @@
+import pytest
+from starlette.requests import Request
+from rate_limit import client_address, parse_trusted_proxies
+
+TRUSTED = parse_trusted_proxies("10.0.0.0/8, 127.0.0.1")
+
+def make_request(peer: str, forwarded_for: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "client": (peer, 50000), "headers": headers})
+
+def test_direct_client_uses_peer_address():
+    assert client_address(make_request("203.0.113.7"), TRUSTED) == "203.0.113.7"
+
+def test_untrusted_peer_cannot_forge_forwarded_for():
+    assert client_address(make_request("203.0.113.7", "198.51.100.1"), TRUSTED) == "203.0.113.7"
+
+@pytest.mark.parametrize("forwarded_for, expected", [
+    ("198.51.100.1", "198.51.100.1"),
+    ("1.2.3.4, 198.51.100.1", "198.51.100.1"),
+    ("198.51.100.1, 10.0.0.5", "198.51.100.1"),
+])
+def test_trusted_proxy_forwards_client_address(forwarded_for, expected):
+    assert client_address(make_request("10.0.0.2", forwarded_for), TRUSTED) == expected
+
+def test_trusted_proxy_without_header_keeps_peer():
+    assert client_address(make_request("127.0.0.1"), TRUSTED) == "127.0.0.1"
+
+def test_no_trusted_proxies_by_default():
+    assert client_address(make_request("10.0.0.2", "198.51.100.1"), []) == "10.0.0.2"
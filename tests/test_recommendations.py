@@ -0,0 +1,24 @@
+import asyncio
+from recommendations import JobRecommender, RECOMMENDATIONS_LIMIT
+
+def test_cold_start_batch_shares_one_popularity_query(fake_db):
+    job_ids = [f"job-{i:03d}" for i in range(RECOMMENDATIONS_LIMIT + 10)]
+    fake_db.jobs.docs = [{"id": job_id, "isActive": True, "favoriteCount": 0} for job_id in job_ids]
+    fake_db.favorites.docs = [{"userId": "user-2", "jobId": job_id} for job_id in job_ids[-5:]]
+    users = [{"id": f"user-{i}", "field": None} for i in range(4)]
+
+    written = asyncio.run(JobRecommender()._precompute_batch(fake_db, users))
+
+    assert written == 4
+    assert len(fake_db.jobs.queries) == 1
+    documents = {doc["userId"]: doc for doc in fake_db.recommendations.docs}
+    # Most favorited first, ties broken by descending ID
+    popular = sorted(job_ids, reverse=True)
+    assert [job["jobId"] for job in documents["user-0"]["jobs"]] == popular[:RECOMMENDATIONS_LIMIT]
+    assert [job["jobId"] for job in documents["user-2"]["jobs"]] == popular[5:5 + RECOMMENDATIONS_LIMIT]
+
+def test_single_user_queries_popular_jobs_itself(fake_db):
+    fake_db.jobs.docs = [{"id": job_id, "isActive": True, "favoriteCount": 0} for job_id in ("job-1", "job-2", "job-3")]
+    document = asyncio.run(JobRecommender().recommend(fake_db, "user-1", None, ["job-2"]))
+    assert fake_db.jobs.queries == [{"isActive": True, "id": {"$nin": ["job-2"]}}]
+    assert [job["jobId"] for job in document["jobs"]] == ["job-3", "job-1"]
@@ -0,0 +1,78 @@
+import asyncio
+from search_index import JobSearchIndex, tokenize
+
+def job(job_id: str, title: str, description: str = "", **fields) -> dict:
+    return {
+        "id": job_id,
+        "isActive": True,
+        "title": {"fr": title},
+        "description": {"fr": description},
+        **fields,
+    }
+
+def build(*job_docs) -> JobSearchIndex:
+    index = JobSearchIndex()
+    index.build(job_docs)
+    return index
+
+def ids(ranked) -> list:
+    return [job_id for job_id, _ in ranked]
+
+def test_tokenize_folds_accents_and_drops_stop_words():
+    assert tokenize("Ingénieur de la Santé publique") == ["ingenieur", "sante", "publique"]
+
+def test_title_matches_outrank_description_matches():
+    index = build(
+        job("job-1", "Comptable", "Travail avec un ingénieur"),
+        job("job-2", "Ingénieur civil"),
+        job("job-3", "Infirmier"),
+    )
+    assert index.ready
+    assert ids(index.search("ingenieur")) == ["job-2", "job-1"]
+    assert index.search("plombier") == []
+
+def test_rare_terms_weigh_more_than_common_ones():
+    index = build(
+        job("job-1", "Technicien réseau"),
+        job("job-2", "Technicien solaire"),
+        job("job-3", "Technicien agricole"),
+    )
+    assert ids(index.search("technicien solaire"))[0] == "job-2"
+
+def test_sector_and_skill_filters():
+    index = build(
+        job("job-1", "Analyste", sector="Finance", skillIds=["excel", "sql"]),
+        job("job-2", "Analyste", sector="Technologie", skillIds=["sql"]),
+    )
+    assert ids(index.search("analyste", sector="Finance")) == ["job-1"]
+    assert ids(index.search("analyste", skills=["sql"])) == ["job-1", "job-2"]
+    assert ids(index.search("analyste", skills=["sql", "excel"])) == ["job-1"]
+
+def test_skip_and_limit_page_the_ranking():
+    index = build(*(job(f"job-{i}", "Vendeur") for i in range(5)))
+    assert ids(index.search("vendeur", skip=1, limit=2)) == ["job-1", "job-2"]
+
+def test_add_reindexes_and_remove_forgets():
+    index = build(job("job-1", "Chauffeur"))
+    index.add(job("job-1", "Mécanicien"))
+    assert index.search("chauffeur") == []
+    assert ids(index.search("mecanicien")) == ["job-1"]
+
+    index.add(job("job-2", "Mécanicien auto"))
+    index.remove("job-1")
+    assert ids(index.search("mecanicien")) == ["job-2"]
+    assert len(index) == 1
+    assert index.total_length == sum(index.doc_lengths.values())
+    assert "chauffeur" not in index.postings
+
+def test_inactive_job_is_removed_on_add():
+    index = build(job("job-1", "Chauffeur"))
+    index.add(job("job-1", "Chauffeur", isActive=False))
+    assert len(index) == 0
+    assert index.search("chauffeur") == []
+
+def test_load_indexes_active_jobs(fake_db):
+    fake_db.jobs.docs = [job("job-1", "Chauffeur"), job("job-2", "Chauffeur", isActive=False)]
+    index = JobSearchIndex()
+    asyncio.run(index.load(fake_db))
+    assert ids(index.search("chauffeur")) == ["job-1"]
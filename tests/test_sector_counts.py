@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+import database
+from database import adjust_sector_job_count, reconcile_sector_job_counts
+from models import UserRole
+from routers import jobs
+from routers.jobs import update_sector_job_counts
+
+@pytest.fixture
+def sectors(fake_db, monkeypatch):
+    monkeypatch.setattr(database.database, "database", fake_db)
+    fake_db.sectors.docs = [
+        {"_id": 1, "id": "tech", "name": {"fr": "Technologie"}, "jobCount": 2},
+        {"_id": 2, "id": "finance", "name": {"fr": "Finance"}, "jobCount": 0},
+    ]
+    return fake_db.sectors
+
+def job_counts(sectors) -> dict:
+    return {sector["id"]: sector["jobCount"] for sector in sectors.docs}
+
+def test_adjust_increments_the_named_sector(sectors):
+    asyncio.run(adjust_sector_job_count("Finance", 1))
+    asyncio.run(adjust_sector_job_count("Technologie", -1))
+    asyncio.run(adjust_sector_job_count(None, 1))
+    asyncio.run(adjust_sector_job_count("Finance", 0))
+    assert job_counts(sectors) == {"tech": 1, "finance": 1}
+
+@pytest.mark.parametrize("previous, current, expected", [
+    ({"sector": "Technologie", "isActive": True}, {"sector": "Finance", "isActive": True}, {"tech": 1, "finance": 1}),
+    ({"sector": "Technologie", "isActive": True}, {"sector": "Technologie", "isActive": False}, {"tech": 1, "finance": 0}),
+    ({"sector": "Technologie", "isActive": False}, {"sector": "Finance", "isActive": True}, {"tech": 2, "finance": 1}),
+    ({"sector": "Technologie", "isActive": True}, {"sector": "Technologie", "isActive": True}, {"tech": 2, "finance": 0}),
+])
+def test_job_updates_move_counts_between_sectors(sectors, previous, current, expected):
+    asyncio.run(update_sector_job_counts(previous, current))
+    assert job_counts(sectors) == expected
+
+def test_reconcile_corrects_only_drifted_sectors(fake_db, sectors, monkeypatch):
+    invalidated = []
+    async def invalidate(*namespaces):
+        invalidated.extend(namespaces)
+    monkeypatch.setattr(database.response_cache, "invalidate", invalidate)
+    fake_db.jobs.aggregate_result = [{"_id": "Technologie", "count": 2}, {"_id": "Finance", "count": 3}]
+
+    assert asyncio.run(reconcile_sector_job_counts()) == 1
+    assert fake_db.jobs.pipelines[0][0] == {"$match": {"isActive": True}}
+    assert job_counts(sectors) == {"tech": 2, "finance": 3}
+    assert len(sectors.operations) == 1
+    assert invalidated == ["sectors"]
+
+    assert asyncio.run(reconcile_sector_job_counts()) == 0
+
+def test_deleting_a_job_decrements_its_sector(fake_db, sectors, make_client):
+    fake_db.jobs.docs = [{"id": "job-1", "sector": "Technologie", "isActive": True}]
+    client = make_client(jobs.router, fake_db, role=UserRole.SITE_MANAGER)
+
+    assert client.delete("/jobs/job-1").status_code == 200
+    assert client.delete("/jobs/job-1").status_code == 200
+    assert job_counts(sectors) == {"tech": 1, "finance": 0}
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+import asyncio
+import pytest
+from models import Language, MultilingualText, Skill
+from skill_taxonomy import SKILL_SEED, SkillTaxonomy, skill_key, skill_slug
+
+def seeded_taxonomy() -> SkillTaxonomy:
+    taxonomy = SkillTaxonomy()
+    for skill_id, (fr, en, sw, ln, kg, synonyms) in SKILL_SEED.items():
+        taxonomy._register(Skill(id=skill_id, name=MultilingualText(fr=fr, en=en, sw=sw, ln=ln, kg=kg), synonyms=synonyms))
+    return taxonomy
+
+@pytest.mark.parametrize("skill_id", sorted(SKILL_SEED))
+def test_seed_names_every_language(skill_id):
+    *names, synonyms = SKILL_SEED[skill_id]
+    assert len(names) == len(Language)
+    assert all(name.strip() for name in names)
+
+def test_seed_names_resolve_to_their_own_skill():
+    taxonomy = seeded_taxonomy()
+    for skill_id, (*names, synonyms) in SKILL_SEED.items():
+        for name in names + synonyms:
+            assert taxonomy.resolve(name) == skill_id, skill_key(name)
+
+def test_label_in_lingala_and_kikongo():
+    taxonomy = seeded_taxonomy()
+    assert taxonomy.label("surgery", Language.LINGALA) == "Kokata nzoto"
+    assert taxonomy.label("surgery", Language.KIKONGO) == "Kuzenga nitu"
+    assert taxonomy.resolve("mayele ya koteya") == "pedagogy"
+
+@pytest.mark.parametrize("names", [
+    ["C++", "C#", "C"],
+    [".NET", "NET"],
+    ["F#", "F"],
+])
+def test_symbols_keep_skills_apart(names):
+    assert len({skill_slug(name) for name in names}) == len(names)
+
+def test_symbols_in_sentences_are_separators():
+    assert skill_slug("Node.js") == skill_slug("node.JS") == "node-dot-js"
+    assert skill_slug("Gestion de projet.") == "gestion-de-projet"
+
+def test_non_latin_names_get_a_stable_hash_id():
+    assert skill_slug("日本語").startswith("skill-")
+    assert skill_slug("日本語") == skill_slug(" 日本語 ")
+    assert skill_slug("日本語") != skill_slug("Анализ данных")
+    assert skill_slug("   ") == ""
+
+class FakeSkills:
+    def __init__(self):
+        self.ids = []
+
+    async def update_one(self, query, update, upsert=False):
+        self.ids.append(query["id"])
+
+def test_normalize_keeps_distinct_and_non_latin_skills():
+    db = SimpleNamespace(skills=FakeSkills())
+    taxonomy = seeded_taxonomy()
+    skill_ids = asyncio.run(taxonomy.normalize(db, ["C++", "C#", "日本語", "python3"]))
+    assert skill_ids == ["c-plus-plus", "c-sharp", skill_slug("日本語"), "python"]
+    assert db.skills.ids == skill_ids[:3]
+    assert taxonomy.resolve_all(["C"]) == ["c"]
+
+def test_backfill_refreshes_job_cards(fake_db, monkeypatch):
+    import skill_taxonomy as skill_taxonomy_module
+
+    async def get_database():
+        return fake_db
+    monkeypatch.setattr(skill_taxonomy_module, "get_database", get_database)
+    monkeypatch.setattr(skill_taxonomy_module, "skill_taxonomy", seeded_taxonomy())
+    fake_db.jobs.docs = [{"_id": 1, "id": "job-1", "isActive": True, "skills": ["Python", "C++"]}]
+    fake_db.job_cards.docs = [{"id": "job-1", "isActive": True, "skills": ["Python", "C++"]}]
+    fake_db.training.docs = [{"_id": 2, "id": "training-1", "skills": ["python3"]}]
+
+    assert asyncio.run(skill_taxonomy_module.backfill_skill_ids()) == 2
+    assert fake_db.jobs.docs[0]["skillIds"] == ["python", "c-plus-plus"]
+    assert fake_db.job_cards.docs[0]["skillIds"] == ["python", "c-plus-plus"]
+    assert fake_db.training.docs[0]["skillIds"] == ["python"]
@@ -0,0 +1,32 @@
+from datetime import datetime
+from models import UserRole
+from routers import admin
+
+def history_client(fake_db, make_client):
+    return make_client(admin.router, fake_db, role=UserRole.SITE_MANAGER)
+
+def test_timezone_aware_start_is_converted_to_utc(fake_db, make_client):
+    response = history_client(fake_db, make_client).get(
+        "/admin/statistics/history",
+        params={"start": "2026-01-01T02:00:00+02:00", "end": "2026-01-02T00:00:00Z"}
+    )
+    assert response.status_code == 200
+    assert fake_db.statistics_history.queries[0]["bucket"] == {
+        "$gte": datetime(2026, 1, 1),
+        "$lte": datetime(2026, 1, 2),
+    }
+
+def test_aware_start_with_default_end(fake_db, make_client):
+    response = history_client(fake_db, make_client).get(
+        "/admin/statistics/history", params={"start": "2026-01-01T00:00:00Z"}
+    )
+    assert response.status_code == 200
+    assert fake_db.statistics_history.queries[0]["bucket"]["$gte"] == datetime(2026, 1, 1)
+
+def test_start_after_end_is_rejected(fake_db, make_client):
+    response = history_client(fake_db, make_client).get(
+        "/admin/statistics/history",
+        params={"start": "2026-01-02T00:00:00Z", "end": "2026-01-01T00:00:00"}
+    )
+    assert response.status_code == 400
+    assert fake_db.statistics_history.queries == []
@@ -0,0 +1,66 @@
+import asyncio
+from search_index import JobSearchIndex, TrigramIndex
+from suggest_index import SuggestionIndex, suggestion_index
+from routers import search
+
+def labels(suggestions) -> list:
+    return [(item["type"], item["label"]) for item in suggestions]
+
+def make_index() -> SuggestionIndex:
+    index = SuggestionIndex()
+    index.add_job({"id": "job-1", "title": {"fr": "Comptable", "en": "Accountant"}, "skills": ["Excel"]})
+    index.add_job({"id": "job-2", "title": {"fr": "Ingénieur civil"}, "skills": ["AutoCAD", "Excel"]})
+    index.add_company({"id": "company-1", "name": "Comptoir Kinois"})
+    index.add_training({"id": "training-1", "name": {"fr": "Formation comptable"}, "skills": ["Excel"]})
+    return index
+
+def test_trigram_expansion_tolerates_typos_and_prefixes():
+    words = TrigramIndex()
+    for word in ("comptable", "comptoir", "ingenieur"):
+        words.add(word)
+    assert words.expand("comptabe")[0][0] == "comptable"
+    assert [word for word, _ in words.expand("compt", prefix=True)] == ["comptoir", "comptable"]
+    assert words.expand("compt") == []
+
+def test_last_word_is_a_prefix_and_typos_still_match():
+    index = make_index()
+    # Shorter words are closer prefix matches; ties go to the shorter label
+    assert labels(index.suggest("compt")) == [
+        ("company", "Comptoir Kinois"), ("job", "Comptable"), ("training", "Formation comptable")
+    ]
+    assert labels(index.suggest("ingenier civ")) == [("job", "Ingénieur civil")]
+    assert index.suggest("de la") == []
+
+def test_types_and_language_select_labels():
+    index = make_index()
+    assert labels(index.suggest("accountant", language="en")) == [("job", "Accountant")]
+    assert labels(index.suggest("compt", language="en", types=["job"])) == [("job", "Accountant")]
+
+def test_shared_skill_stays_until_its_last_owner_goes():
+    index = make_index()
+    index.remove_job("job-1")
+    index.remove_job("job-2")
+    assert labels(index.suggest("excel")) == [("skill", "Excel")]
+    assert index.suggest("autocad") == []
+
+    index.add_training({"id": "training-1", "name": {"fr": "Formation comptable"}, "isActive": False})
+    assert index.suggest("excel") == []
+    assert index.suggest("formation") == []
+
+def test_fuzzy_job_search_expands_mistyped_terms():
+    index = JobSearchIndex()
+    index.build([{"id": "job-1", "isActive": True, "title": {"fr": "Électricien bâtiment"}}])
+    assert index.search("electricen") == []
+    assert [job_id for job_id, _ in index.search("electricen", fuzzy=True)] == ["job-1"]
+
+def test_suggest_endpoint_waits_for_the_index(fake_db, make_client, monkeypatch):
+    monkeypatch.setattr(suggestion_index, "ready", False)
+    client = make_client(search.router, fake_db)
+    assert client.get("/search/suggest", params={"q": "compt"}).status_code == 503
+
+    fake_db.jobs.docs = [{"id": "job-1", "isActive": True, "title": {"fr": "Comptable"}, "skills": []}]
+    monkeypatch.setattr(search, "suggestion_index", SuggestionIndex())
+    asyncio.run(search.suggestion_index.load(fake_db))
+    response = client.get("/search/suggest", params={"q": "compt", "types": "job"})
+    assert response.status_code == 200
+    assert labels(response.json()["suggestions"]) == [("job", "Comptable")]
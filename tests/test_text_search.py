@@ -0,0 +1,45 @@
+import asyncio
+from pymongo.errors import OperationFailure
+from database import JOB_TEXT_LANGUAGE
+from models import Language
+from routers.jobs import search_jobs_by_text
+
+def job(job_id: str, title: str, **fields) -> dict:
+    return {"id": job_id, "isActive": True, "title": {"fr": title}, "description": {"fr": ""}, "skills": [], **fields}
+
+def test_text_query_is_ranked_by_score(fake_db, monkeypatch):
+    fake_db.jobs.docs = [job("job-1", "Développeur")]
+    calls = []
+    find = fake_db.jobs.find
+    def find_with_text_index(query, projection=None):
+        calls.append((query, projection))
+        return find({field: value for field, value in query.items() if field != "$text"})
+    monkeypatch.setattr(fake_db.jobs, "find", find_with_text_index)
+
+    docs = asyncio.run(search_jobs_by_text(fake_db, {"isActive": True}, "développeur", Language.FRENCH, 0, 10, {"id": 1}))
+
+    assert [doc["id"] for doc in docs] == ["job-1"]
+    query, projection = calls[0]
+    assert query == {"isActive": True, "$text": {"$search": "développeur", "$language": JOB_TEXT_LANGUAGE}}
+    assert projection == {"id": 1, "score": {"$meta": "textScore"}}
+
+def test_missing_text_index_falls_back_to_escaped_pattern(fake_db, monkeypatch):
+    fake_db.jobs.docs = [
+        job("job-1", "Développeur C++", sector="Technologie"),
+        job("job-2", "Développeur C", sector="Technologie"),
+        job("job-3", "Comptable", skills=["c++"], sector="Technologie"),
+        job("job-4", "Développeur C++", sector="Finance"),
+    ]
+    find = fake_db.jobs.find
+    def find_without_text_index(query, projection=None):
+        if "$text" in query:
+            raise OperationFailure("text index required for $text query")
+        return find(query, projection)
+    monkeypatch.setattr(fake_db.jobs, "find", find_without_text_index)
+
+    docs = asyncio.run(search_jobs_by_text(
+        fake_db, {"isActive": True, "sector": "Technologie"}, "C++", Language.FRENCH, 0, 10
+    ))
+
+    # "+" is matched literally, case-insensitively, on title, description or skills
+    assert sorted(doc["id"] for doc in docs) == ["job-1", "job-3"]
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import auth
+from auth import UserCache, create_access_token
+from database import get_database
+from models import User
+from routers import users
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = UserCache(ttl=60, max_entries=10)
+    monkeypatch.setattr(auth, "user_cache", cache)
+    monkeypatch.setattr(users, "user_cache", cache)
+    return cache
+
+@pytest.fixture
+def client(fake_db, cache):
+    fake_db.users.docs = [User(id="user-1", name="Amani", email="a@example.com", password_hash="-").dict()]
+    app = FastAPI()
+    app.include_router(users.router)
+    app.dependency_overrides[get_database] = lambda: fake_db
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'user-1'})}"
+    return client
+
+def test_authenticated_requests_reuse_the_cached_user(fake_db, client, cache):
+    assert client.get("/users/me").json()["name"] == "Amani"
+    assert client.get("/users/me").json()["name"] == "Amani"
+    assert len(fake_db.users.queries) == 1
+    assert cache.hits == 1 and cache.misses == 1
+
+def test_profile_update_invalidates_the_cached_user(fake_db, client):
+    client.get("/users/me")
+    assert client.put("/users/me", json={"name": "Amani K."}).status_code == 200
+    assert client.get("/users/me").json()["name"] == "Amani K."
+
+def test_unknown_or_invalid_tokens_are_rejected(fake_db, client, cache):
+    response = client.get("/users/me", headers={"Authorization": f"Bearer {create_access_token({'sub': 'ghost'})}"})
+    assert response.status_code == 401
+    assert client.get("/users/me", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+    # Missing users are not cached: they are looked up again next time
+    asyncio.run(cache.get("ghost", fake_db))
+    assert cache.misses == 2
+
+def test_entries_expire_after_the_ttl(fake_db, cache):
+    fake_db.users.docs = [{"id": "user-1", "name": "Amani", "email": "a@example.com", "password_hash": "-"}]
+    cache.ttl = -1
+    asyncio.run(cache.get("user-1", fake_db))
+    asyncio.run(cache.get("user-1", fake_db))
+    assert cache.misses == 2